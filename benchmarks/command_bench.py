@@ -0,0 +1,288 @@
+# benchmarks/command_bench.py
+"""
+Benchmark ของคำสั่งแบบ offline ด้วย interaction จำลอง
+
+รันเส้นทาง execute ของ ping / roll / help และ GlobalErrorHandler.handle_error
+พร้อมกันหลายงาน แล้ววัด ops/sec, latency percentile และหน่วยความจำต่อการเรียก
+บันทึกผลเป็น JSON เพื่อเทียบก่อน/หลังการแก้ไขได้
+
+วิธีใช้:
+    python benchmarks/command_bench.py --output before.json
+    python benchmarks/command_bench.py --compare before.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fakes import (  # noqa: E402
+    ErrorCounter,
+    FakeGuild,
+    FakeInteraction,
+    FakeUser,
+    create_offline_bot,
+)
+from src.cogs.commands import CommandsCog  # noqa: E402
+from src.utils.exceptions import UserError  # noqa: E402
+
+Call = Callable[[FakeInteraction], Awaitable[Any]]
+
+
+def build_scenarios(bot, cog: CommandsCog) -> Dict[str, Tuple[str, Call]]:
+    """ชื่อ scenario -> (ชื่อคำสั่งใน tree, ฟังก์ชันที่เรียกคำสั่ง)"""
+    stats = bot.stats
+
+    async def error_user(interaction):
+        await bot.error_handler.handle_error(interaction, UserError("bench"))
+
+    async def error_unexpected(interaction):
+        await bot.error_handler.handle_error(interaction, RuntimeError("bench"))
+
+    return {
+        "ping": ("ping", lambda i: cog.ping_cmd.execute(i, cog.start_time, stats)),
+        "roll_dice": ("roll", lambda i: cog.roll_cmd.execute(i, stats, "1d20+5")),
+        "roll_dice_keep": ("roll", lambda i: cog.roll_cmd.execute(i, stats, "4d6kh3")),
+        "roll_dice_100": ("roll", lambda i: cog.roll_cmd.execute(i, stats, "100d20")),
+        "roll_odds": ("roll", lambda i: cog.roll_cmd.odds(i, "3d6", 15)),
+        "roll_leaderboard": ("roll", lambda i: cog.roll_cmd.leaderboard(i, "rolls")),
+        "help": ("help", lambda i: cog.help_cmd.execute(i, stats)),
+        "help_detail": ("help", lambda i: cog.help_cmd.execute(i, stats, command_name="roll")),
+        "error_user": ("roll", error_user),
+        "error_unexpected": ("roll", error_unexpected),
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+class Runner:
+    """สร้าง interaction และเรียก scenario พร้อมกันหลายงาน"""
+
+    def __init__(self, bot, users: int, guilds: int, delay: float, errors: ErrorCounter):
+        self.bot = bot
+        self.error_log = errors
+        self.delay = delay
+        self.users = [FakeUser(name=f"user{i}") for i in range(users)]
+        self.guilds = [FakeGuild(name=f"guild{i}") for i in range(guilds)]
+        self._counter = 0
+
+    def interaction(self, command_name: str) -> FakeInteraction:
+        self._counter += 1
+        return FakeInteraction(
+            self.users[self._counter % len(self.users)],
+            self.guilds[self._counter % len(self.guilds)],
+            command=self.bot.tree.get_command(command_name),
+            delay=self.delay,
+        )
+
+    async def throughput(
+        self, command_name: str, call: Call, iterations: int, concurrency: int
+    ) -> Dict[str, Any]:
+        latencies: List[float] = []
+        unanswered = 0
+        error_responses = 0
+        remaining = iterations
+
+        async def worker():
+            nonlocal remaining, unanswered, error_responses
+            while remaining > 0:
+                remaining -= 1
+                interaction = self.interaction(command_name)
+                started = time.perf_counter()
+                await call(interaction)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if not interaction.sent:
+                    unanswered += 1
+                if interaction.extras.get("error"):
+                    error_responses += 1
+
+        logged_before = self.error_log.count
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "iterations": iterations,
+            "ops_per_sec": round(iterations / elapsed, 1),
+            "mean_ms": round(sum(latencies) / len(latencies), 4),
+            "p50_ms": round(_percentile(latencies, 0.50), 4),
+            "p95_ms": round(_percentile(latencies, 0.95), 4),
+            "p99_ms": round(_percentile(latencies, 0.99), 4),
+            "max_ms": round(latencies[-1], 4),
+            "unanswered": unanswered,
+            "error_responses": error_responses,
+            "error_logs": self.error_log.count - logged_before,
+        }
+
+    async def allocations(self, command_name: str, call: Call, samples: int) -> Dict[str, Any]:
+        """หน่วยความจำสูงสุดระหว่างเรียกและที่ค้างหลังเรียก (เฉลี่ยต่อการเรียก)"""
+        peak_total = 0
+        retained_total = 0
+        tracemalloc.start()
+        try:
+            for _ in range(samples):
+                interaction = self.interaction(command_name)
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                await call(interaction)
+                after, peak = tracemalloc.get_traced_memory()
+                peak_total += peak - before
+                retained_total += after - before
+        finally:
+            tracemalloc.stop()
+        return {
+            "alloc_peak_kib": round(peak_total / samples / 1024, 2),
+            "retained_bytes": round(retained_total / samples),
+        }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args, errors: ErrorCounter) -> Dict[str, Any]:
+    bot = create_offline_bot(latency=args.latency / 1000)
+    cog = CommandsCog(bot)
+    runner = Runner(
+        bot, users=args.users, guilds=args.guilds, delay=args.delay / 1000, errors=errors
+    )
+    scenarios = build_scenarios(bot, cog)
+    selected = args.only or list(scenarios)
+
+    print(
+        f"{'scenario':<20}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'peak KiB':>10}{'no reply':>10}{'err logs':>10}"
+    )
+    results: Dict[str, Any] = {}
+    try:
+        for name in selected:
+            command_name, call = scenarios[name]
+            # warmup ให้ cache/การ import ต่างๆ พร้อมก่อนวัด
+            if args.warmup > 0:
+                await runner.throughput(command_name, call, args.warmup, 1)
+            result = await runner.throughput(
+                command_name, call, args.iterations, args.concurrency
+            )
+            result.update(await runner.allocations(command_name, call, args.alloc_samples))
+            results[name] = result
+            print(
+                f"{name:<20}{result['ops_per_sec']:>10,.0f}{result['p50_ms']:>10.3f}"
+                f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+                f"{result['alloc_peak_kib']:>10.1f}{result['unanswered']:>10}"
+                f"{result['error_logs']:>10}"
+            )
+    finally:
+        await bot.roll_stats.stop()
+        bot.offload.shutdown()
+        shutil.rmtree(bot.data_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "delay_ms": args.delay,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> int:
+    """แสดงผลเทียบกับ baseline คืนจำนวน scenario ที่ ops/sec ลดลงเกิน max_regression"""
+    print(f"\n== เทียบกับ {baseline['meta'].get('revision', '?')} ==")
+    print(f"{'scenario':<20}{'ops/s':>10}{'Δ ops/s':>10}{'p95 ms':>10}{'Δ p95':>10}")
+    regressions = 0
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<20}{result['ops_per_sec']:>10,.0f}{'new':>10}")
+            continue
+        ops_change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        p95_change = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        flag = ""
+        if ops_change < -max_regression:
+            regressions += 1
+            flag = "  ❌"
+        print(
+            f"{name:<20}{result['ops_per_sec']:>10,.0f}{ops_change:>+10.1%}"
+            f"{result['p95_ms']:>10.3f}{p95_change:>+10.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=50, help="0 = ไม่ warmup")
+    parser.add_argument("--alloc-samples", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.0, help="เวลาจำลองของ REST (ms)")
+    parser.add_argument("--latency", type=float, default=50.0, help="heartbeat จำลอง (ms)")
+    parser.add_argument("--only", nargs="+", help="รันเฉพาะ scenario ที่ระบุ")
+    parser.add_argument("--output", help="ไฟล์ JSON สำหรับบันทึกผล")
+    parser.add_argument("--compare", help="ไฟล์ JSON ของผลก่อนหน้าสำหรับเทียบ")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="คืนค่า exit code 1 ถ้า ops/sec ลดลงเกินสัดส่วนนี้ (ใช้กับ --compare)",
+    )
+    parser.add_argument("--log", action="store_true", help="เปิด logging ระหว่างวัด")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations ต้องมากกว่า 0")
+
+    errors = ErrorCounter()
+    errors.install(quiet=not args.log)
+
+    report = asyncio.run(run(args, errors))
+
+    # scenario ปกติที่มี error log วัดเส้นทาง error แทนเส้นทางจริง ตัวเลขจึงใช้ไม่ได้
+    failed = [
+        name
+        for name, result in report["results"].items()
+        if not name.startswith("error_") and result["error_logs"]
+    ]
+    if failed:
+        print(f"\n❌ scenario ที่มี error log (ผลวัดใช้ไม่ได้): {', '.join(failed)}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\n💾 บันทึกผลที่ {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(baseline, report, args.max_regression):
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
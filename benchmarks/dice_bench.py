@@ -0,0 +1,147 @@
+# benchmarks/dice_bench.py
+"""
+Benchmark ของ dice engine (/roll)
+
+วัดเวลา parse (ทั้งแบบ cache และไม่ cache), เวลาทอย และความหน่วงของ event loop
+ระหว่างทอยนิพจน์ขนาดใหญ่ทั้งแบบรันตรงใน loop และแบบส่งไป Offloader
+
+วิธีใช้:
+    python benchmarks/dice_bench.py
+    python benchmarks/dice_bench.py --huge 5000000d6 --check
+    python benchmarks/dice_bench.py --huge-keep 10000000d6kh5000000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import dice  # noqa: E402
+from src.utils.offload import Offloader  # noqa: E402
+
+EXPRESSIONS = ["1d6", "4d6kh3", "100d20+5", "2d10!", "3d8+2d6-1d4+7", "50d6dl10"]
+
+
+def _per_op_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_parse(iterations: int) -> None:
+    print(f"\n== parse ({iterations:,} ครั้งต่อนิพจน์) ==")
+    print(f"{'expression':<18}{'uncached µs':>14}{'cached µs':>12}")
+    uncached = dice._compile.__wrapped__
+    for text in EXPRESSIONS:
+        cold = _per_op_us(lambda: uncached(text), iterations)
+        dice.compile_expression(text)
+        warm = _per_op_us(lambda: dice.compile_expression(text), iterations)
+        print(f"{text:<18}{cold:>14.2f}{warm:>12.2f}")
+
+
+def bench_evaluate(iterations: int, huge: List[str]) -> None:
+    print(f"\n== evaluate ({iterations:,} ครั้งต่อนิพจน์) ==")
+    for text in EXPRESSIONS:
+        expression = dice.compile_expression(text)
+        print(f"{text:<18}{_per_op_us(expression.evaluate, iterations):>14.2f} µs")
+
+    # นิพจน์ใหญ่ทั้งแบบรวมทุกลูกและแบบเก็บ/ทิ้ง (keep/drop ใช้ histogram ข้าม batch)
+    for text in huge:
+        expression = dice.compile_expression(text)
+        start = time.perf_counter()
+        result = expression.evaluate()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{text:<18}{elapsed:>14.1f} ms (total {result.total:,})")
+
+
+async def _measure_lag(work, tick: float = 0.001):
+    """รัน work พร้อม ticker แล้วคืนความหน่วงของแต่ละ tick (ms)"""
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.05)  # ให้ ticker เริ่มก่อน
+    start = time.perf_counter()
+    await work()
+    elapsed = (time.perf_counter() - start) * 1000
+    done = True
+    await task
+    return elapsed, lags
+
+
+async def bench_loop_stall(huge: str, processes: int) -> dict:
+    print(f"\n== event loop lag ระหว่างทอย {huge} ==")
+    expression = dice.compile_expression(huge)
+    offloader = Offloader(threads=2, processes=processes)
+
+    async def inline():
+        # จำลองการรันตรงใน event loop (await เพื่อให้ ticker ได้เริ่ม)
+        await asyncio.sleep(0)
+        expression.evaluate()
+
+    async def thread():
+        await offloader.run(expression.evaluate)
+
+    async def process():
+        await offloader.run(expression.evaluate, process=True)
+
+    modes = [("inline", inline), ("thread", thread)]
+    if processes:
+        # รันหนึ่งครั้งก่อนเพื่อไม่ให้เวลาสร้าง process pool ปนในผล
+        await process()
+        modes.append(("process", process))
+
+    print(f"{'mode':<10}{'work ms':>10}{'max lag ms':>12}{'p99 lag ms':>12}")
+    worst = {}
+    for name, work in modes:
+        elapsed, lags = await _measure_lag(work)
+        lags.sort()
+        p99 = lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else lags[-1]
+        worst[name] = lags[-1]
+        print(f"{name:<10}{elapsed:>10.1f}{lags[-1]:>12.1f}{p99:>12.1f}")
+
+    offloader.shutdown()
+    return worst
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--huge", default="1000000d6")
+    parser.add_argument("--huge-keep", default="1000000d6kh500000")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="คืนค่า exit code 1 ถ้าการทอยแบบ offload ทำให้ loop หน่วงเกิน --max-lag",
+    )
+    parser.add_argument("--max-lag", type=float, default=50.0)
+    args = parser.parse_args()
+
+    bench_parse(args.iterations)
+    bench_evaluate(args.iterations // 10 or 1, [args.huge, args.huge_keep])
+    worst = asyncio.run(bench_loop_stall(args.huge, args.processes))
+    print(f"\ncompile cache: {dice.cache_info()}")
+
+    if args.check:
+        offloaded = [lag for mode, lag in worst.items() if mode != "inline"]
+        if max(offloaded) > args.max_lag:
+            print(f"❌ loop หน่วงสูงสุด {max(offloaded):.1f}ms เกิน {args.max_lag}ms")
+            return 1
+        print(f"✅ loop หน่วงสูงสุด {max(offloaded):.1f}ms (ไม่เกิน {args.max_lag}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# benchmarks/embed_bench.py
+"""
+Benchmark ของ embed template เทียบกับการสร้างด้วย EmbedBuilder ทีละ field
+
+วัดเวลาสร้าง embed รวมกับ to_dict() (ที่ discord.py เรียกก่อนส่ง)
+ของ embed ต้อนรับ, help และ error และตรวจว่า payload ของทั้งสองแบบเหมือนกัน
+
+วิธีใช้:
+    python benchmarks/embed_bench.py
+    python benchmarks/embed_bench.py --iterations 50000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.embed_builder import EmbedBuilder  # noqa: E402
+
+MENTION = "<@123456789012345678>"
+AVATAR = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+
+def builder_welcome() -> dict:
+    return (
+        EmbedBuilder()
+        .set_title("ยินดีต้อนรับสมาชิกใหม่!", emoji="👋")
+        .set_description(f"ยินดีต้อนรับ {MENTION} เข้าสู่เซิร์ฟเวอร์ bench!")
+        .set_color("success")
+        .add_field("สมาชิกคนที่", str(1234), emoji="👥")
+        .set_timestamp()
+        .build()
+    ).to_dict()
+
+
+def template_welcome() -> dict:
+    return EmbedBuilder.create_welcome_embed(MENTION, 1234, guild_name="bench").to_dict()
+
+
+def builder_help() -> dict:
+    return (
+        EmbedBuilder()
+        .set_title("คำสั่งที่ใช้ได้", emoji="❔")
+        .set_color("info")
+        .add_field("Prefix", "!", emoji="⌨️", inline=True)
+        .set_description("ใช้คำสั่ง /help เพื่อดูคำสั่งทั้งหมด")
+        .add_field("จำนวนคำสั่ง", str(12), emoji="📜", inline=True)
+        .set_timestamp()
+        .build()
+    ).to_dict()
+
+
+def template_help() -> dict:
+    return EmbedBuilder.create_help_embed(
+        "!", description="ใช้คำสั่ง /help เพื่อดูคำสั่งทั้งหมด", command_count=12
+    ).to_dict()
+
+
+def builder_error() -> dict:
+    return (
+        EmbedBuilder()
+        .set_title("เกิดข้อผิดพลาด", emoji="❌")
+        .set_description("ไม่พบคำสั่งนี้")
+        .set_color("error")
+        .add_field("รายละเอียด", "KeyError: 'x'", emoji="ℹ️")
+        .set_timestamp()
+        .build()
+    ).to_dict()
+
+
+def template_error() -> dict:
+    return EmbedBuilder.create_error_embed(
+        description="ไม่พบคำสั่งนี้", error_details="KeyError: 'x'"
+    ).to_dict()
+
+
+CASES = [
+    ("welcome", builder_welcome, template_welcome),
+    ("help", builder_help, template_help),
+    ("error", builder_error, template_error),
+]
+
+
+def _per_op_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _without_timestamp(payload: dict) -> dict:
+    return {key: value for key, value in payload.items() if key != "timestamp"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"== สร้าง embed + to_dict() ({args.iterations:,} ครั้ง) ==")
+    print(f"{'embed':<10}{'builder µs':>12}{'template µs':>13}{'speedup':>10}")
+    mismatched = []
+    for name, builder, template in CASES:
+        if _without_timestamp(builder()) != _without_timestamp(template()):
+            mismatched.append(name)
+        old = _per_op_us(builder, args.iterations)
+        new = _per_op_us(template, args.iterations)
+        print(f"{name:<10}{old:>12.2f}{new:>13.2f}{old / new:>9.1f}x")
+
+    if mismatched:
+        print(f"❌ payload ไม่ตรงกัน: {', '.join(mismatched)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,580 @@
+# benchmarks/fake_discord.py
+"""
+Discord จำลองในเครื่อง (gateway websocket + REST) สำหรับทดสอบโหลด
+
+บอทเชื่อมต่อได้ด้วย environment variables:
+    DISCORD_API_BASE=http://127.0.0.1:8765/api/v10
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway
+
+endpoint ควบคุม (ใช้โดย benchmarks/gateway_load.py):
+    POST /_load/run    ส่ง dispatch ตามอัตราที่กำหนด
+                       {"event": "MESSAGE_CREATE", "rate": 200, "count": 1000}
+                       หรือ {"replay": "events.jsonl", "rate": 200}
+    POST /_load/reset  ล้างสถิติ REST
+    GET  /_load/stats  สถิติ REST และ latency ตั้งแต่ reset ล่าสุด
+
+ไฟล์ replay เป็น JSON lines ของ {"t": ชื่อ event, "d": payload}
+
+วิธีใช้:
+    python benchmarks/fake_discord.py --port 8765 --guilds 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+
+API_PREFIX = "/api/v10"
+PERMISSIONS = str((1 << 41) - 1)
+
+OP_DISPATCH = 0
+OP_HEARTBEAT = 1
+OP_IDENTIFY = 2
+OP_RESUME = 6
+OP_REQUEST_MEMBERS = 8
+OP_INVALID_SESSION = 9
+OP_HELLO = 10
+OP_HEARTBEAT_ACK = 11
+
+EVENTS = ("MESSAGE_CREATE", "GUILD_MEMBER_ADD", "INTERACTION_CREATE", "GUILD_CREATE")
+
+# interaction ที่สุ่มส่ง: (น้ำหนัก, ชื่อคำสั่ง, options)
+INTERACTIONS = [
+    (6, "roll", [{"type": 3, "name": "expression", "value": "4d6kh3"}]),
+    (2, "ping", []),
+    (2, "help", []),
+]
+
+_ID_PATTERN = re.compile(r"/(\d{5,}|tok\d+)")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _json(data: Any) -> web.Response:
+    # discord.py แปลง body เป็น JSON เฉพาะเมื่อ Content-Type เป็น application/json พอดี
+    return web.Response(
+        body=json.dumps(data).encode(), headers={"Content-Type": "application/json"}
+    )
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    values = sorted(values)
+
+    def pick(fraction: float) -> float:
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 3)
+
+    return {
+        "count": len(values),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(values[-1], 3),
+    }
+
+
+class FakeDiscord:
+    """
+    สถานะของ Discord จำลอง: guild, สมาชิก, ช่อง และสถิติ REST
+
+    Args:
+        guilds: จำนวน guild ตอนเริ่ม
+        members: จำนวนสมาชิกต่อ guild
+        mention_ratio: สัดส่วนข้อความที่ mention บอท
+        seed: seed ของตัวสุ่ม
+    """
+
+    def __init__(
+        self,
+        guilds: int = 10,
+        members: int = 50,
+        mention_ratio: float = 0.1,
+        seed: int = 0,
+    ):
+        self._ids = itertools.count(100_000_000_000_000_000)
+        self._rng = random.Random(seed)
+        self.members_per_guild = members
+        self.mention_ratio = mention_ratio
+
+        self.app_id = self.next_id()
+        self.bot_user = self._user(self.app_id, "loadbot", bot=True)
+        self.guilds: Dict[int, Dict[str, Any]] = {}
+        for _ in range(guilds):
+            self._new_guild()
+
+        self._ws: Optional[web.WebSocketResponse] = None
+        self._seq = 0
+        self._session_id: Optional[str] = None
+        # session ที่ปิดด้วย code อื่นนอกจาก 1000/1001 (RESUME ได้)
+        self._resumable: set = set()
+        self._connected = asyncio.Event()
+        self.reset()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def reset(self) -> None:
+        """ล้างสถิติของรอบก่อน"""
+        self.rest_calls: Counter = Counter()
+        self.latencies: Dict[str, List[float]] = {"callback_ms": [], "reply_ms": []}
+        # id ของ interaction/ข้อความที่รอการตอบ -> เวลาที่ส่ง dispatch
+        self._pending: Dict[int, float] = {}
+        self.last_rest = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # payload
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _user(user_id: int, name: str, bot: bool = False) -> Dict[str, Any]:
+        return {
+            "id": str(user_id),
+            "username": name,
+            "discriminator": "0",
+            "global_name": None,
+            "avatar": None,
+            "bot": bot,
+        }
+
+    @staticmethod
+    def _member(user: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "user": user,
+            "roles": [],
+            "joined_at": _now(),
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+            "nick": None,
+            "avatar": None,
+            "pending": False,
+        }
+
+    def _channel(self, guild_id: int, name: str, position: int) -> Dict[str, Any]:
+        return {
+            "id": str(self.next_id()),
+            "guild_id": str(guild_id),
+            "type": 0,
+            "name": name,
+            "position": position,
+            "permission_overwrites": [],
+            "nsfw": False,
+            "parent_id": None,
+            "topic": None,
+            "last_message_id": None,
+            "rate_limit_per_user": 0,
+        }
+
+    def _new_guild(self) -> Dict[str, Any]:
+        guild_id = self.next_id()
+        users = [
+            self._user(self.next_id(), f"user{n}") for n in range(self.members_per_guild)
+        ]
+        channels = [self._channel(guild_id, f"channel-{n}", n) for n in range(3)]
+        guild = {
+            "id": str(guild_id),
+            "name": f"guild-{len(self.guilds)}",
+            "icon": None,
+            "splash": None,
+            "discovery_splash": None,
+            "owner_id": users[0]["id"] if users else self.bot_user["id"],
+            "afk_channel_id": None,
+            "afk_timeout": 300,
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "roles": [{
+                "id": str(guild_id),
+                "name": "@everyone",
+                "color": 0,
+                "hoist": False,
+                "position": 0,
+                "permissions": PERMISSIONS,
+                "managed": False,
+                "mentionable": False,
+                "flags": 0,
+            }],
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+            "mfa_level": 0,
+            "application_id": None,
+            "system_channel_id": channels[0]["id"],
+            "system_channel_flags": 0,
+            "rules_channel_id": None,
+            "public_updates_channel_id": None,
+            "vanity_url_code": None,
+            "description": None,
+            "banner": None,
+            "premium_tier": 0,
+            "preferred_locale": "th",
+            "nsfw_level": 0,
+            "premium_progress_bar_enabled": False,
+            "joined_at": _now(),
+            "large": False,
+            "unavailable": False,
+            "member_count": len(users) + 1,
+            "members": [self._member(u) for u in users] + [self._member(self.bot_user)],
+            "channels": channels,
+            "threads": [],
+            "presences": [],
+            "voice_states": [],
+            "stage_instances": [],
+            "guild_scheduled_events": [],
+        }
+        self.guilds[guild_id] = guild
+        return guild
+
+    def _pick(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """สุ่ม (guild, ช่อง, สมาชิก)"""
+        guild = self.guilds[self._rng.choice(list(self.guilds))]
+        channel = self._rng.choice(guild["channels"])
+        member = self._rng.choice(guild["members"][:-1] or guild["members"])
+        return guild, channel, member
+
+    def message_payload(
+        self,
+        channel_id: str,
+        author: Dict[str, Any],
+        content: str = "",
+        embeds: Optional[List[Dict[str, Any]]] = None,
+        guild_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        payload = {
+            "id": str(self.next_id()),
+            "channel_id": channel_id,
+            "author": author,
+            "content": content,
+            "timestamp": _now(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": embeds or [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+            "components": [],
+        }
+        if guild_id is not None:
+            payload["guild_id"] = guild_id
+        return payload
+
+    def make_event(self, event: str) -> Tuple[str, Dict[str, Any]]:
+        """สร้าง dispatch สังเคราะห์หนึ่งรายการ"""
+        if event == "GUILD_CREATE":
+            # guild ที่เพิ่งเชิญบอทไม่มี key unavailable (ต่างจาก guild ตอน READY)
+            guild = dict(self._new_guild())
+            del guild["unavailable"]
+            return event, guild
+
+        guild, channel, member = self._pick()
+        if event == "MESSAGE_CREATE":
+            mention = self._rng.random() < self.mention_ratio
+            payload = self.message_payload(
+                channel["id"],
+                member["user"],
+                f"<@{self.bot_user['id']}> สวัสดี" if mention else "สวัสดีทุกคน",
+                guild_id=guild["id"],
+            )
+            payload["member"] = {k: v for k, v in member.items() if k != "user"}
+            if mention:
+                payload["mentions"] = [self.bot_user]
+                self._pending[int(payload["id"])] = time.perf_counter()
+            return event, payload
+
+        if event == "GUILD_MEMBER_ADD":
+            user = self._user(self.next_id(), "newcomer")
+            new_member = self._member(user)
+            guild["members"].insert(0, new_member)
+            guild["member_count"] += 1
+            return event, {**new_member, "guild_id": guild["id"]}
+
+        if event == "INTERACTION_CREATE":
+            weights = [w for w, _, _ in INTERACTIONS]
+            _, name, options = self._rng.choices(INTERACTIONS, weights)[0]
+            interaction_id = self.next_id()
+            self._pending[interaction_id] = time.perf_counter()
+            return event, {
+                "id": str(interaction_id),
+                "application_id": str(self.app_id),
+                "type": 2,
+                "token": f"tok{interaction_id}",
+                "version": 1,
+                "guild_id": guild["id"],
+                "channel_id": channel["id"],
+                "channel": channel,
+                "member": {**member, "permissions": PERMISSIONS},
+                "app_permissions": PERMISSIONS,
+                "locale": "th",
+                "guild_locale": "th",
+                "entitlements": [],
+                "authorizing_integration_owners": {},
+                "context": 0,
+                "data": {
+                    "id": str(self.next_id()),
+                    "name": name,
+                    "type": 1,
+                    "options": options,
+                },
+            }
+
+        raise ValueError(f"ไม่รองรับ event {event}")
+
+    # ------------------------------------------------------------------
+    # gateway
+    # ------------------------------------------------------------------
+
+    async def dispatch(self, event: str, data: Dict[str, Any]) -> None:
+        if self._ws is None:
+            raise RuntimeError("ยังไม่มีบอทเชื่อมต่อ gateway")
+        self._seq += 1
+        await self._ws.send_str(
+            json.dumps({"op": OP_DISPATCH, "t": event, "s": self._seq, "d": data})
+        )
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._ws = ws
+        await ws.send_json({"op": OP_HELLO, "d": {"heartbeat_interval": 41250}})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            op = payload.get("op")
+            if op == OP_HEARTBEAT:
+                await ws.send_json({"op": OP_HEARTBEAT_ACK})
+            elif op == OP_IDENTIFY:
+                await self._ready(request)
+            elif op == OP_RESUME:
+                session_id = payload["d"].get("session_id")
+                if session_id in self._resumable:
+                    self._resumable.discard(session_id)
+                    self._session_id = session_id
+                    await self.dispatch("RESUMED", {})
+                    self._connected.set()
+                else:
+                    await ws.send_json({"op": OP_INVALID_SESSION, "d": False})
+            elif op == OP_REQUEST_MEMBERS:
+                data = payload["d"]
+                guild = self.guilds.get(int(data["guild_id"]))
+                await self.dispatch("GUILD_MEMBERS_CHUNK", {
+                    "guild_id": data["guild_id"],
+                    "members": guild["members"] if guild else [],
+                    "chunk_index": 0,
+                    "chunk_count": 1,
+                    "nonce": data.get("nonce"),
+                })
+
+        self._ws = None
+        self._connected.clear()
+        if self._session_id and ws.close_code not in (1000, 1001):
+            self._resumable.add(self._session_id)
+        self._session_id = None
+        return ws
+
+    async def _ready(self, request: web.Request) -> None:
+        gateway_url = f"ws://{request.host}/gateway"
+        self._session_id = f"session-{self.next_id()}"
+        await self.dispatch("READY", {
+            "v": 10,
+            "user": self.bot_user,
+            "guilds": [{"id": gid, "unavailable": True} for gid in map(str, self.guilds)],
+            "session_id": self._session_id,
+            "resume_gateway_url": gateway_url,
+            "application": {"id": str(self.app_id), "flags": 0},
+            "private_channels": [],
+        })
+        for guild in list(self.guilds.values()):
+            await self.dispatch("GUILD_CREATE", guild)
+        self._connected.set()
+
+    # ------------------------------------------------------------------
+    # REST
+    # ------------------------------------------------------------------
+
+    def _record(self, request: web.Request) -> None:
+        path = request.path[len(API_PREFIX):] if request.path.startswith(API_PREFIX) else request.path
+        self.rest_calls[f"{request.method} {_ID_PATTERN.sub('/{id}', path)}"] += 1
+        self.last_rest = time.perf_counter()
+
+    def _resolve(self, pending_id: int, series: str) -> None:
+        sent_at = self._pending.pop(pending_id, None)
+        if sent_at is not None:
+            self.latencies[series].append((time.perf_counter() - sent_at) * 1000)
+
+    async def rest(self, request: web.Request) -> web.StreamResponse:
+        self._record(request)
+        path = request.match_info["path"]
+        body: Dict[str, Any] = {}
+        if request.can_read_body and request.content_type == "application/json":
+            body = await request.json()
+
+        if path == "users/@me":
+            return _json(self.bot_user)
+        if path == "oauth2/applications/@me":
+            return _json({
+                "id": str(self.app_id),
+                "name": "loadbot",
+                "icon": None,
+                "description": "",
+                "bot_public": True,
+                "bot_require_code_grant": False,
+                "verify_key": "0" * 64,
+                "flags": 0,
+                "owner": self._user(self.next_id(), "owner"),
+            })
+        if path == "users/@me/guilds":
+            after = int(request.query.get("after", 0))
+            limit = int(request.query.get("limit", 200))
+            ids = sorted(gid for gid in self.guilds if gid > after)[:limit]
+            return _json([
+                {
+                    "id": str(gid),
+                    "name": self.guilds[gid]["name"],
+                    "icon": None,
+                    "owner": False,
+                    "permissions": PERMISSIONS,
+                    "features": [],
+                    "approximate_member_count": self.guilds[gid]["member_count"],
+                }
+                for gid in ids
+            ])
+        if path in ("gateway", "gateway/bot"):
+            return _json({
+                "url": f"ws://{request.host}/gateway",
+                "shards": 1,
+                "session_start_limit": {
+                    "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1,
+                },
+            })
+        if re.fullmatch(r"applications/\d+/(guilds/\d+/)?commands", path):
+            commands = body if isinstance(body, list) else []
+            for command in commands:
+                command.setdefault("id", str(self.next_id()))
+                command.setdefault("application_id", str(self.app_id))
+                command.setdefault("version", "1")
+            return _json(commands)
+
+        match = re.fullmatch(r"interactions/(\d+)/[^/]+/callback", path)
+        if match:
+            self._resolve(int(match.group(1)), "callback_ms")
+            return web.Response(status=204)
+
+        match = re.fullmatch(r"channels/(\d+)/messages", path)
+        if match and request.method == "POST":
+            reference = body.get("message_reference") or {}
+            if reference.get("message_id"):
+                self._resolve(int(reference["message_id"]), "reply_ms")
+            return _json(self.message_payload(
+                match.group(1), self.bot_user, body.get("content") or "", body.get("embeds")
+            ))
+
+        if re.fullmatch(r"webhooks/\d+/[^/]+", path) and request.method == "POST":
+            return _json(self.message_payload(
+                str(self.next_id()), self.bot_user, body.get("content") or "", body.get("embeds")
+            ))
+
+        return _json({})
+
+    # ------------------------------------------------------------------
+    # control
+    # ------------------------------------------------------------------
+
+    def _replay(self, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["t"], entry["d"]
+
+    async def run(self, request: web.Request) -> web.Response:
+        options = await request.json()
+        await asyncio.wait_for(self._connected.wait(), timeout=30)
+
+        rate = float(options.get("rate", 100))
+        if options.get("replay"):
+            events = self._replay(options["replay"])
+            count = options.get("count")
+        else:
+            event = options["event"]
+            count = int(options.get("count", rate))
+            events = (self.make_event(event) for _ in range(count))
+
+        interval = 1.0 / rate
+        started = time.perf_counter()
+        sent = 0
+        for event, data in events:
+            if count is not None and sent >= count:
+                break
+            delay = started + sent * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.dispatch(event, data)
+            sent += 1
+
+        return web.json_response({"sent": sent, "elapsed": time.perf_counter() - started})
+
+    async def reset_handler(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({"ok": True})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "rest": dict(self.rest_calls),
+            "rest_total": sum(self.rest_calls.values()),
+            "idle_seconds": time.perf_counter() - self.last_rest,
+            "pending": len(self._pending),
+            "callback_ms": _percentiles(self.latencies["callback_ms"]),
+            "reply_ms": _percentiles(self.latencies["reply_ms"]),
+            "connected": self._connected.is_set(),
+        })
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"connected": self._connected.is_set()})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.router.add_get("/gateway", self.gateway)
+        app.router.add_post("/_load/run", self.run)
+        app.router.add_post("/_load/reset", self.reset_handler)
+        app.router.add_get("/_load/stats", self.stats)
+        app.router.add_get("/_load/health", self.health)
+        app.router.add_route("*", API_PREFIX + "/{path:.*}", self.rest)
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--mention-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    async def build() -> web.Application:
+        # สร้างใน loop ของ server เพราะ FakeDiscord ใช้ asyncio.Event
+        return FakeDiscord(args.guilds, args.members, args.mention_ratio, args.seed).app()
+
+    web.run_app(build(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# benchmarks/fakes.py
+"""
+วัตถุจำลองของ Discord สำหรับรันคำสั่งแบบ offline (ไม่ต้องเชื่อมต่อ Discord)
+
+FakeInteraction สืบทอดจาก discord.Interaction เพื่อให้โค้ดที่ตรวจ
+isinstance(ctx, discord.Interaction) (เช่น GlobalErrorHandler) ทำงานตามเส้นทางจริง
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import tempfile
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from src.utils.ratelimit_monitor import RateLimitMonitor
+
+_ids = itertools.count(1_000_000_000_000_000)
+
+
+def next_id() -> int:
+    """snowflake ปลอมที่ไม่ซ้ำกัน"""
+    return next(_ids)
+
+
+class FakeUser:
+    """ผู้ใช้จำลอง (มีเฉพาะ attribute ที่คำสั่งใช้)"""
+
+    def __init__(self, user_id: Optional[int] = None, name: str = "bench-user"):
+        self.id = user_id or next_id()
+        self.name = name
+        self.display_name = name
+        self.bot = False
+        self.guild_permissions = discord.Permissions.all()
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeGuild:
+    """guild จำลอง"""
+
+    def __init__(
+        self,
+        guild_id: Optional[int] = None,
+        name: str = "bench-guild",
+        member_count: int = 100,
+        shard_id: int = 0,
+    ):
+        self.id = guild_id or next_id()
+        self.name = name
+        self.member_count = member_count
+        self.shard_id = shard_id
+        self.unavailable = False
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class _Sender:
+    """ส่วนกลางของ response/followup: จำลองเวลา REST และ serialize payload"""
+
+    def __init__(self, interaction: "FakeInteraction", delay: float):
+        self._interaction = interaction
+        self._delay = delay
+
+    async def _deliver(self, kind: str, content: Any = None, **kwargs: Any) -> None:
+        # serialize เหมือนที่ discord.py ทำก่อนส่ง เพื่อให้ต้นทุนสร้าง payload อยู่ในผลวัด
+        embed = kwargs.get("embed")
+        payload: Dict[str, Any] = {"kind": kind, "content": content}
+        if embed is not None:
+            payload["embed"] = embed.to_dict()
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        self._interaction.sent.append(payload)
+
+
+class FakeInteractionResponse(_Sender):
+    """จำลอง discord.InteractionResponse"""
+
+    def __init__(self, interaction: "FakeInteraction", delay: float = 0.0):
+        super().__init__(interaction, delay)
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _mark_done(self) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+
+    async def send_message(self, content: Any = None, **kwargs: Any) -> None:
+        self._mark_done()
+        await self._deliver("message", content, **kwargs)
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        self._mark_done()
+        await self._deliver("defer")
+
+
+class FakeFollowup(_Sender):
+    """จำลอง Webhook ของ interaction.followup"""
+
+    async def send(self, content: Any = None, **kwargs: Any) -> None:
+        await self._deliver("followup", content, **kwargs)
+
+
+class FakeInteraction(discord.Interaction):
+    """
+    interaction จำลองที่ไม่ต้องมี ConnectionState
+
+    Args:
+        user: ผู้ใช้ที่เรียกคำสั่ง
+        guild: guild ที่เรียกคำสั่ง (None = DM)
+        command: app command ที่ถูกเรียก (ใช้ในข้อความ log ของ error handler)
+        delay: เวลาจำลองของการตอบกลับแต่ละครั้ง (วินาที)
+    """
+
+    def __init__(
+        self,
+        user: FakeUser,
+        guild: Optional[FakeGuild] = None,
+        command: Optional[discord.app_commands.Command] = None,
+        delay: float = 0.0,
+    ):
+        self.id = next_id()
+        self.type = discord.InteractionType.application_command
+        self.token = "bench"
+        self.application_id = 0
+        self.data = {}
+        self.user = user
+        self.guild_id = guild.id if guild else None
+        self.channel = None
+        self.message = None
+        self.extras: Dict[Any, Any] = {}
+        self.command_failed = False
+        self._fake_guild = guild
+        self._cs_response = FakeInteractionResponse(self, delay)
+        self._cs_followup = FakeFollowup(self, delay)
+        self._cs_command = command
+        self.sent: List[Dict[str, Any]] = []
+
+    @property
+    def guild(self) -> Optional[FakeGuild]:
+        return self._fake_guild
+
+    @property
+    def channel_id(self) -> Optional[int]:
+        return None
+
+
+class ErrorCounter(logging.Handler):
+    """
+    นับ log ระดับ ERROR ขึ้นไป (คำสั่งที่จับ exception เองจะไม่ส่ง error embed เสมอไป)
+
+    by_source แยกจำนวนตามคำสั่งหรือ event ที่ทำให้เกิด log (เช่น "/help", "on_message")
+    โดยใช้ชื่อ code path เดียวกับ RateLimitMonitor
+    """
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+        self.by_source: Counter = Counter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+        self.by_source[RateLimitMonitor.current_tag()] += 1
+
+    def install(self, quiet: bool = True) -> None:
+        """
+        ติดตั้งที่ root logger
+
+        Args:
+            quiet: ไม่พิมพ์ log อื่นระหว่างวัด (log จะท่วมหน้าจอ)
+                ถ้า False และยังไม่มี handler จะพิมพ์ log ระดับ INFO ขึ้นไปลง stderr
+        """
+        root = logging.getLogger()
+        if quiet:
+            root.handlers.clear()
+            root.setLevel(logging.ERROR)
+        elif not root.handlers:
+            logging.basicConfig(
+                level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+            )
+        root.addHandler(self)
+
+
+def create_offline_bot(latency: float = 0.05, data_dir: Optional[str] = None):
+    """
+    สร้าง MyBot ที่ใช้งานได้โดยไม่ login (ไฟล์ข้อมูลเขียนลงโฟลเดอร์ชั่วคราว)
+
+    Args:
+        latency: ค่า heartbeat latency จำลอง (วินาที)
+        data_dir: โฟลเดอร์ข้อมูล (ค่าเริ่มต้นคือโฟลเดอร์ชั่วคราวใหม่)
+
+    Returns:
+        MyBot: บอทที่ยังไม่เชื่อมต่อ
+    """
+    from src.bot import MyBot
+
+    data_dir = data_dir or tempfile.mkdtemp(prefix="bot-bench-")
+    os.environ["AUDIT_LOG_DIR"] = os.path.join(data_dir, "audit")
+    os.environ["ROLL_STATS_DIR"] = os.path.join(data_dir, "roll_stats")
+
+    class OfflineBot(MyBot):
+        @property
+        def latency(self) -> float:
+            return latency
+
+    bot = OfflineBot()
+    bot.data_dir = data_dir
+    return bot
@@ -0,0 +1,323 @@
+# benchmarks/gateway_load.py
+"""
+ทดสอบโหลดของบอทด้วย Discord จำลอง (benchmarks/fake_discord.py)
+
+เปิด fake server ใน process แยก แล้วรัน MyBot ตัวจริงที่เชื่อมต่อผ่าน
+DISCORD_API_BASE / DISCORD_GATEWAY_URL จากนั้นส่ง dispatch แต่ละชนิดที่หลายอัตรา
+และวัด throughput ที่บอทรับมือได้, จำนวน REST call ต่อ event, latency ตั้งแต่ส่ง
+dispatch จนได้รับคำตอบ (interaction callback / reply) และความหน่วงของ event loop
+
+วิธีใช้:
+    python benchmarks/gateway_load.py --rates 100 500 1000 --output curve.json
+    python benchmarks/gateway_load.py --events INTERACTION_CREATE --rates 50 100 200
+    python benchmarks/gateway_load.py --replay recorded.jsonl --rates 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_discord import EVENTS  # noqa: E402
+from benchmarks.fakes import ErrorCounter  # noqa: E402
+
+# listener ที่นับว่าบอทรับ event แต่ละชนิดแล้ว
+# (interaction นับเมื่อคำสั่งทำงานจบ ไม่ใช่ตอนได้รับ)
+HANDLED_EVENTS = {
+    "MESSAGE_CREATE": "on_message",
+    "GUILD_MEMBER_ADD": "on_member_join",
+    "INTERACTION_CREATE": "on_app_command_completion",
+    "GUILD_CREATE": "on_guild_join",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LagProbe:
+    """วัดความหน่วงของ event loop ด้วย ticker ทุก tick วินาที"""
+
+    def __init__(self, tick: float = 0.005):
+        self.tick = tick
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.tick
+            await asyncio.sleep(self.tick)
+            self.lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    def start(self) -> None:
+        self.lags = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "p50": round(lags[len(lags) // 2], 2),
+            "p99": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 2),
+            "max": round(lags[-1], 2),
+        }
+
+
+class HandledCounter:
+    """นับ event ที่บอทรับแล้วและเวลาของครั้งล่าสุด"""
+
+    def __init__(self, bot):
+        self.counts: Dict[str, int] = {event: 0 for event in HANDLED_EVENTS}
+        self.last: Dict[str, float] = {event: 0.0 for event in HANDLED_EVENTS}
+        for event, listener in HANDLED_EVENTS.items():
+            bot.add_listener(self._make_listener(event), listener)
+
+    def _make_listener(self, event: str):
+        async def listener(*args: Any) -> None:
+            self.counts[event] += 1
+            self.last[event] = time.perf_counter()
+
+        return listener
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        for event in self.counts:
+            self.counts[event] = 0
+            self.last[event] = 0.0
+
+
+class LoadTest:
+    def __init__(self, args, errors: ErrorCounter):
+        self.args = args
+        self.errors = errors
+        self.port = args.port or _free_port()
+        self.base = f"http://127.0.0.1:{self.port}"
+        self.data_dir = tempfile.mkdtemp(prefix="bot-load-")
+        self.server: Optional[asyncio.subprocess.Process] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.bot = None
+
+    async def start_server(self) -> None:
+        self.server = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(ROOT / "benchmarks" / "fake_discord.py"),
+            "--port", str(self.port),
+            "--guilds", str(self.args.guilds),
+            "--members", str(self.args.members),
+            "--mention-ratio", str(self.args.mention_ratio),
+        )
+        self.session = aiohttp.ClientSession()
+        for _ in range(100):
+            try:
+                async with self.session.get(f"{self.base}/_load/health"):
+                    return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError("fake server ไม่ตอบสนอง")
+
+    async def start_bot(self) -> None:
+        os.environ.update({
+            "DISCORD_API_BASE": f"{self.base}/api/v10",
+            "DISCORD_GATEWAY_URL": f"ws://127.0.0.1:{self.port}/gateway",
+            "DEV_MODE": "false",
+            "AUDIT_LOG_DIR": os.path.join(self.data_dir, "audit"),
+            "ROLL_STATS_DIR": os.path.join(self.data_dir, "roll_stats"),
+        })
+        os.environ.pop("APPLICATION_ID", None)
+
+        from src.bot import MyBot
+
+        self.bot = MyBot()
+        self.counter = HandledCounter(self.bot)
+        self._bot_task = asyncio.create_task(self.bot.start("fake-token"))
+        ready = asyncio.create_task(self.bot.wait_until_ready())
+        await asyncio.wait([ready, self._bot_task], timeout=60, return_when=asyncio.FIRST_COMPLETED)
+        if self._bot_task.done():
+            ready.cancel()
+            # บอทหยุดก่อนพร้อม: แสดงสาเหตุ
+            self._bot_task.result()
+            raise RuntimeError("บอทหยุดทำงานก่อนเชื่อมต่อสำเร็จ")
+        if not ready.done():
+            ready.cancel()
+            raise RuntimeError("บอทเชื่อมต่อ fake gateway ไม่สำเร็จภายในเวลาที่กำหนด")
+        # รอให้ on_ready (tree.sync ฯลฯ) ทำงานเสร็จก่อนเริ่มวัด
+        await self._wait_rest_idle(0.5, timeout=10)
+
+    async def _stats(self) -> Dict[str, Any]:
+        async with self.session.get(f"{self.base}/_load/stats") as resp:
+            return await resp.json()
+
+    async def _wait_rest_idle(self, idle: float, timeout: float) -> None:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if (await self._stats())["idle_seconds"] >= idle:
+                return
+            await asyncio.sleep(0.05)
+
+    async def step(self, event: Optional[str], rate: float) -> Dict[str, Any]:
+        """ส่ง event หนึ่งชนิดที่อัตราหนึ่ง รอให้บอทจัดการหมดแล้วสรุปผล"""
+        count = max(1, int(rate * self.args.duration))
+        await self.session.post(f"{self.base}/_load/reset")
+        self.counter.reset()
+        probe = LagProbe()
+        probe.start()
+
+        options: Dict[str, Any] = {"rate": rate, "count": count}
+        if event is None:
+            options["replay"] = str(Path(self.args.replay).resolve())
+        else:
+            options["event"] = event
+
+        errors_before = self.errors.count
+        sources_before = self.errors.by_source.copy()
+        started = time.perf_counter()
+        async with self.session.post(f"{self.base}/_load/run", json=options) as resp:
+            sent = await resp.json()
+
+        # รอจนบอทรับครบ (replay นับรวมทุกชนิด) แล้วรอ REST ที่ตามมาให้เงียบ
+        def handled() -> int:
+            return self.counter.total() if event is None else self.counter.counts[event]
+
+        deadline = time.perf_counter() + self.args.drain_timeout
+        while handled() < sent["sent"] and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        last_handled = (
+            max(self.counter.last.values()) if event is None else self.counter.last[event]
+        )
+        await self._wait_rest_idle(0.3, timeout=self.args.drain_timeout)
+        lag = await probe.stop()
+        stats = await self._stats()
+
+        elapsed = max(1e-9, last_handled - started) if last_handled else None
+        return {
+            "event": event or "REPLAY",
+            "offered_rate": rate,
+            "sent": sent["sent"],
+            "send_rate": round(sent["sent"] / max(sent["elapsed"], 1e-9), 1),
+            "handled": handled(),
+            "throughput": round(handled() / elapsed, 1) if elapsed else 0.0,
+            "drained": handled() >= sent["sent"],
+            "rest_calls": stats["rest_total"],
+            "rest_per_event": round(stats["rest_total"] / max(1, sent["sent"]), 3),
+            "rest_routes": stats["rest"],
+            "callback_ms": stats["callback_ms"],
+            "reply_ms": stats["reply_ms"],
+            "loop_lag_ms": lag,
+            "error_logs": self.errors.count - errors_before,
+            # คำสั่ง/event ที่ทำให้เกิด error log ในขั้นนี้
+            "error_sources": dict((self.errors.by_source - sources_before).most_common()),
+        }
+
+    async def close(self) -> None:
+        if self.bot is not None:
+            await self.bot.close()
+            try:
+                await asyncio.wait_for(self._bot_task, timeout=10)
+            except Exception:
+                pass
+        if self.session is not None:
+            await self.session.close()
+        if self.server is not None and self.server.returncode is None:
+            self.server.terminate()
+            await self.server.wait()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+HEADER = (
+    f"{'event':<20}{'rate':>7}{'sent/s':>8}{'handled/s':>11}{'REST/ev':>9}"
+    f"{'e2e p50':>10}{'e2e p99':>10}{'lag p99':>10}{'lag max':>10}{'err logs':>10}"
+)
+
+
+def _print_row(row: Dict[str, Any]) -> None:
+    # e2e วัดจาก interaction callback หรือ reply ของข้อความที่ mention บอท
+    e2e = row["callback_ms"] if row["callback_ms"]["count"] else row["reply_ms"]
+    if e2e["count"]:
+        e2e_text = f"{e2e['p50']:>10,.1f}{e2e['p99']:>10,.1f}"
+    else:
+        e2e_text = f"{'-':>10}{'-':>10}"
+    print(
+        f"{row['event']:<20}{row['offered_rate']:>7,.0f}{row['send_rate']:>8,.0f}"
+        f"{row['throughput']:>11,.0f}{row['rest_per_event']:>9.2f}{e2e_text}"
+        f"{row['loop_lag_ms']['p99']:>10,.1f}{row['loop_lag_ms']['max']:>10,.1f}"
+        f"{row['error_logs']:>10}{'' if row['drained'] else '  ⚠️ ค้าง'}"
+    )
+    for source, count in row["error_sources"].items():
+        print(f"{'':<4}❌ {source}: {count} error log")
+
+
+async def run(args, errors: ErrorCounter) -> Dict[str, Any]:
+    test = LoadTest(args, errors)
+    rows: List[Dict[str, Any]] = []
+    try:
+        await test.start_server()
+        await test.start_bot()
+        print(HEADER)
+        events = [None] if args.replay else args.events
+        for event in events:
+            for rate in args.rates:
+                row = await test.step(event, rate)
+                rows.append(row)
+                _print_row(row)
+    finally:
+        await test.close()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "guilds": args.guilds,
+            "members": args.members,
+            "duration": args.duration,
+            "mention_ratio": args.mention_ratio,
+        },
+        "results": rows,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", nargs="+", choices=EVENTS, default=list(EVENTS))
+    parser.add_argument("--rates", nargs="+", type=float, default=[50, 200, 500, 1000])
+    parser.add_argument("--duration", type=float, default=3.0, help="วินาทีต่อหนึ่งอัตรา")
+    parser.add_argument("--replay", help="ไฟล์ JSON lines ของ dispatch ที่บันทึกไว้")
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--mention-ratio", type=float, default=0.1)
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--output", help="ไฟล์ JSON สำหรับบันทึกผล")
+    parser.add_argument("--log", action="store_true", help="เปิด logging ระหว่างวัด")
+    args = parser.parse_args()
+
+    errors = ErrorCounter()
+    errors.install(quiet=not args.log)
+
+    report = asyncio.run(run(args, errors))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\n💾 บันทึกผลที่ {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
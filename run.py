@@ -1,9 +1,13 @@
+# เริ่มจับเวลา startup ก่อน import อื่นๆ ทั้งหมด
+from src.utils.startup_timeline import timeline
+
 import asyncio
+import logging
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Set, Dict, Optional
-from dotenv import load_dotenv
 import signal
 
 # Add src to Python path
@@ -14,6 +18,9 @@ sys.path.insert(0, str(src_path))
 
 from src.utils.logging_config import setup_logger
 from src.bot import MyBot
+from src.utils.config import load_env_file
+
+timeline.record("imports", timeline.origin, time.perf_counter())
 
 # ตั้งค่า logger
 logger = setup_logger()
@@ -31,6 +38,8 @@ class BotManager:
             "DEV_GUILD_ID",
         }
         self.shutdown_flag = False
+        self._shutdown_task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
 
     def validate_env(self) -> Dict[str, str]:
         """
@@ -42,8 +51,8 @@ class BotManager:
         Raises:
             ValueError: ถ้าไม่พบตัวแปรที่จำเป็น
         """
-        # โหลด .env
-        load_dotenv()
+        # โหลด .env (ค่าใน environment ของ process มาก่อน)
+        load_env_file()
 
         # ตรวจสอบตัวแปรที่จำเป็น
         env_vars = {}
@@ -67,53 +76,70 @@ class BotManager:
         return env_vars
 
     def setup_signal_handlers(self):
-        """ตั้งค่าตัวจัดการสัญญาณระบบ"""
+        """
+        ตั้งค่าตัวจัดการสัญญาณระบบ (ต้องเรียกใน event loop)
+
+        ใช้ loop.add_signal_handler เพื่อให้ handler ทำงานใน event loop
+        แทนการสร้าง task จาก signal handler ที่แทรกเข้ามากลางคัน
+        """
+        loop = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
 
-        def handle_shutdown(signum, frame):
+        def handle_shutdown(signum: int):
             signame = signal.Signals(signum).name
             logger.info(f"🛑 ได้รับสัญญาณ {signame}")
             self.shutdown_flag = True
-            if self.bot:
+            if not self.bot:
+                # ยังไม่ได้สร้างบอท ไม่มีอะไรต้อง drain
+                main_task.cancel()
+                return
+            if self._shutdown_task is None:
                 logger.info("⏳ กำลังปิดบอทอย่างปลอดภัย...")
-                asyncio.create_task(self.shutdown())
+                self._shutdown_task = loop.create_task(self.shutdown(), name="shutdown")
+            else:
+                # สัญญาณซ้ำระหว่าง drain: เลิกรอ handler ที่ค้างอยู่
+                logger.warning("⏩ ได้รับสัญญาณซ้ำ ปิดบอทโดยไม่รอ interaction ที่ค้างอยู่")
+                self.bot.drain.force()
 
         # รองรับทั้ง SIGINT (Ctrl+C) และ SIGTERM
-        signal.signal(signal.SIGINT, handle_shutdown)
-        signal.signal(signal.SIGTERM, handle_shutdown)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, handle_shutdown, sig)
+            except NotImplementedError:
+                # Windows: ไม่มี add_signal_handler จึงส่งต่อเข้า loop เอง
+                signal.signal(
+                    sig, lambda signum, frame: loop.call_soon_threadsafe(handle_shutdown, signum)
+                )
+
+        def handle_reload():
+            logger.info("🛑 ได้รับสัญญาณ SIGHUP")
+            if not self.bot or self._shutdown_task is not None:
+                return
+            if self._reload_task is None or self._reload_task.done():
+                self._reload_task = loop.create_task(self.reload_config(), name="config-reload")
+
+        # SIGHUP: อ่าน .env อีกครั้งโดยไม่ต้องรีสตาร์ท (ไม่มีบน Windows)
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, handle_reload)
+
+    async def reload_config(self):
+        """reload config ของบอท (ถ้าค่าใหม่ไม่ถูกต้องจะใช้ค่าเดิมต่อ)"""
+        try:
+            await self.bot.reload_config()
+        except Exception as e:
+            logger.error(f"❌ reload config ไม่สำเร็จ ยังใช้ค่าเดิมอยู่: {e}")
 
     async def shutdown(self):
-        """ปิดบอทอย่างปลอดภัย"""
+        """ปิดรับ interaction ใหม่ รอ handler ที่ค้างอยู่ แล้วปิดบอท"""
         if self.bot:
             try:
-                await self.bot.close()
+                await self.bot.graceful_shutdown()
                 logger.info("👋 ปิดบอทเรียบร้อยแล้ว")
             except Exception as e:
                 logger.error(f"❌ เกิดข้อผิดพลาดในการปิดบอท: {e}")
-
-    async def startup_checks(self) -> bool:
-        """
-        ตรวจสอบระบบก่อนเริ่มบอท
-
-        Returns:
-            bool: True ถ้าผ่านการตรวจสอบทั้งหมด
-        """
-        try:
-            # ตรวจสอบโฟลเดอร์ที่จำเป็น
-            required_folders = ["cogs", "commands", "utils"]
-            for folder in required_folders:
-                folder_path = src_path / folder
-                if not folder_path.exists():
-                    logger.warning(f"⚠️ ไม่พบโฟลเดอร์ {folder}")
-                    folder_path.mkdir(parents=True)
-                    logger.info(f"✅ สร้างโฟลเดอร์ {folder} แล้ว")
-
-            # ตรวจสอบการเชื่อมต่อเครือข่าย
-
-            return True
-
-        except Exception as e:
-            logger.error(f"❌ เกิดข้อผิดพลาดในการตรวจสอบระบบ: {e}")
-            return False
+            finally:
+                for handler in logging.getLogger().handlers:
+                    handler.flush()
 
     async def run(self):
         """เริ่มการทำงานของบอท"""
@@ -122,11 +148,8 @@ class BotManager:
             self.setup_signal_handlers()
 
             # ตรวจสอบตัวแปรสภาพแวดล้อม
-            env_vars = self.validate_env()
-
-            # ตรวจสอบระบบ
-            if not await self.startup_checks():
-                raise RuntimeError("❌ ไม่ผ่านการตรวจสอบระบบ")
+            with timeline.phase("env_validation"):
+                env_vars = self.validate_env()
 
             logger.info("🚀 เริ่มต้นบอท...")
 
@@ -134,6 +157,10 @@ class BotManager:
             async with MyBot() as self.bot:
                 await self.bot.start(env_vars["DISCORD_TOKEN"])
 
+            # start() คืนค่าทันทีที่ connection ปิด ให้ shutdown ทำงานจนจบก่อนปิด loop
+            if self._shutdown_task is not None:
+                await self._shutdown_task
+
         except Exception as e:
             logger.critical(f"❌ เกิดข้อผิดพลาดในการเริ่มบอท: {str(e)}")
             raise
@@ -144,8 +171,8 @@ def run_bot():
     try:
         manager = BotManager()
         asyncio.run(manager.run())
-    except KeyboardInterrupt:
-        logger.info("👋 ปิดบอทด้วยการกด Ctrl+C")
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("👋 ปิดบอทก่อนเริ่มทำงาน")
     except Exception as e:
         logger.critical(f"❌ เกิดข้อผิดพลาด: {str(e)}")
         sys.exit(1)
@@ -1,44 +1,85 @@
 import discord
 from discord.ext import commands
-import os
+import json
+import logging
 import sys
 from pathlib import Path
 import time
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 from discord import app_commands
+from discord.gateway import DiscordWebSocket
+import yarl
 
 # Add src to Python path
 current_dir = Path(__file__).parent
 src_path = current_dir / "src"
 sys.path.insert(0, str(src_path))
 
-from src.utils.logging_config import setup_logger
 from src.utils.error_handler import GlobalErrorHandler
 from src.utils.dev_mode_mixin import DevModeMixin
+from src.utils.ratelimit_monitor import RateLimitMonitor
+from src.utils.audit_log import AuditLog, Outcome
+from src.utils.async_cache import all_cache_stats
+from src.utils.startup_timeline import timeline
+from src.utils.cog_registry import CogRegistry
+from src.utils.cog_watcher import CogWatcher
+from src.utils.guild_stats import GuildStats
+from src.utils.latency_monitor import LatencyMonitor
+from src.utils.resource_sampler import ResourceSampler
+from src.utils.offload import Offloader
+from src.utils.memory_profiler import MemoryProfiler
+from src.utils.profiler import HandlerProfiler
+from src.utils.stack_sampler import StackSampler
+from src.utils.task_watchdog import TaskWatchdog
+from src.utils.drain import InteractionDrain
+from src.utils.log_sampling import LogSampler
+from src.utils.config import BotConfig
+from src.utils import gateway_session
+from src.utils.gateway_session import GatewaySessions
+from src.utils.roll_stats import RollStatsStore
 
-logger = setup_logger()
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
 
 
 class MyBot(commands.Bot, DevModeMixin):
     def __init__(self):
-        # ตั้งค่า dev_mode จาก environment variable
-        self.dev_mode = os.getenv("DEV_MODE", "false").lower() == "true"
+        init_started = time.perf_counter()
+
+        # ค่าตั้งค่าทั้งหมดอ่านและตรวจสอบครั้งเดียว (สลับทั้งก้อนเมื่อ reload)
+        self.config = BotConfig.from_env()
+        config = self.config
+        self.dev_mode = config.dev_mode
+
+        # ชี้ไปยัง Discord จำลองได้ (เช่นตอนทดสอบโหลด)
+        self._configure_endpoints(config)
+
+        # เก็บ telemetry ของ rate limit จากทุก REST response
+        self.ratelimits = RateLimitMonitor()
 
         intents = discord.Intents.all()
         super().__init__(
             command_prefix="!",
             intents=intents,
-            application_id=os.getenv("APPLICATION_ID"),
+            application_id=config.application_id,
+            http_trace=self.ratelimits.trace_config,
         )
         # เพิ่มการตั้งค่า command tree
         self.tree.on_error = self._handle_tree_error
+        self.tree.interaction_check = self._interaction_check
 
         # กำหนดค่า base_dir
         self.base_dir = Path(__file__).parent 
 
         self.start_time = time.time()
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # pool สำหรับงาน blocking / CPU หนัก (เรียกผ่าน run_blocking)
+        self.offload = Offloader(
+            threads=config.offload_threads,
+            processes=config.offload_processes,
+        )
+        self.executor = self.offload.thread_pool
         self.stats: Dict[str, int] = {
             "commands_used": 0,
             "errors_caught": 0,
@@ -47,39 +88,118 @@ class MyBot(commands.Bot, DevModeMixin):
             "roll": 0,
         }
 
-        # สร้างโครงสร้างไฟล์เมื่อเริ่มต้น
-        self.ensure_directory_structure()
+        # บันทึกการใช้คำสั่งลงไฟล์ (คงอยู่ข้ามการรีสตาร์ทและ reload)
+        self.audit_log = AuditLog(
+            directory=config.audit_log_dir,
+            retention_days=config.audit_retention_days,
+            executor=self.executor,
+        )
 
-        self.error_handler = GlobalErrorHandler(self)
+        # สถิติการทอยต่อ guild (เขียนลงไฟล์แบบ write-behind)
+        self.roll_stats = RollStatsStore(
+            directory=config.roll_stats_dir,
+            executor=self.executor,
+        )
 
-    def ensure_directory_structure(self):
-        """สร้างและตรวจสอบโครงสร้างโฟลเดอร์"""
-        try:
-            required_folders = [
-                self.base_dir / "cogs",
-                self.base_dir / "commands",
-                self.base_dir / "utils",
-            ]
+        # manifest ของ cogs ที่ใช้ทั้งตอนโหลดและ reload
+        self.cog_registry = CogRegistry()
+        self.cog_watcher: Optional[CogWatcher] = None
 
+        # ยอดรวม guild/สมาชิกที่ปรับตาม events (อ่านได้ O(1))
+        self.guild_stats = GuildStats()
 
-            for folder in required_folders:
-                folder.mkdir(parents=True, exist_ok=True)
-                logger.info(f"✅ ตรวจสอบโฟลเดอร์ {folder.relative_to(self.base_dir)}")
+        # ประวัติ latency ของ heartbeat / REST / การตอบ interaction
+        self.latency_monitor = LatencyMonitor(self)
+        self.ratelimits.add_listener(self.latency_monitor.record_request)
 
-                init_file = folder / "__init__.py"
-                if not init_file.exists():
-                    init_file.touch()
-                    logger.info(f"✅ สร้างไฟล์ {init_file.relative_to(self.base_dir)}")
+        # การใช้ CPU/RAM ของ process (อ่านผ่าน executor)
+        self.resource_sampler = ResourceSampler(executor=self.executor)
 
-        except PermissionError:
-            logger.error("❌ ไม่มีสิทธิ์ในการสร้างโฟลเดอร์")
-            raise
-        except Exception as e:
-            logger.error(f"❌ เกิดข้อผิดพลาดในการสร้างโครงสร้างไฟล์: {str(e)}")
-            raise
+        # tracemalloc ตามคำสั่ง /dev memory (ปิดอยู่จนกว่าจะสั่ง start)
+        self.memory_profiler = MemoryProfiler(
+            executor=self.executor,
+            report_dir=config.memory_report_dir,
+        )
+
+        # cProfile ตามคำสั่ง /dev profile และการสุ่ม profile handler ที่ติด @profiled
+        self.profiler = HandlerProfiler(
+            executor=self.executor,
+            report_dir=config.profile_dir,
+            sample_rate=config.profile_sample_rate,
+        )
+
+        # stack ของ event loop แบบสุ่มตลอดเวลา (0 = ปิด) สำหรับ /dev flamegraph
+        self.stack_sampler = StackSampler(
+            interval=config.stack_sample_interval_ms / 1000,
+            report_dir=config.profile_dir,
+            executor=self.executor,
+        )
+
+        # task ที่ค้างและ loop ที่ถูกบล็อก (เขียน stack ลง log)
+        self.task_watchdog = TaskWatchdog(
+            lag_threshold=config.task_watchdog_lag_ms / 1000,
+            stuck_after=config.task_stuck_seconds,
+        )
+
+        # interaction ที่กำลังทำงาน และการปิดรับ interaction ใหม่ก่อนปิดบอท
+        self.drain = InteractionDrain(
+            deadline=config.shutdown_drain_seconds,
+        )
+
+        # RESUME gateway session เดิมเมื่อรีสตาร์ทเร็ว (0 = IDENTIFY ทุกครั้ง)
+        self.gateway_sessions = GatewaySessions(
+            path=config.gateway_session_file,
+            max_age=config.gateway_resume_seconds,
+            executor=self.executor,
+        )
+        self._connect_started: Optional[float] = None
+
+        # สุ่มเก็บและจำกัดอัตรา log ของ hot path (ปรับได้ด้วย /dev logs)
+        self.log_sampler = LogSampler.from_env(
+            sampling=config.log_sampling,
+            rate_limits=config.log_rate_limits,
+        )
+        self.log_sampler.install()
+
+        self.error_handler = GlobalErrorHandler(self)
+        timeline.record("bot_init", init_started, time.perf_counter())
+
+    @staticmethod
+    def _configure_endpoints(config: BotConfig) -> None:
+        """ใช้ REST/gateway URL จาก DISCORD_API_BASE / DISCORD_GATEWAY_URL ถ้ากำหนดไว้"""
+        api_base = config.discord_api_base
+        gateway_url = config.discord_gateway_url
+        if api_base:
+            # interaction callbacks และ webhooks ใช้ Route เดียวกัน
+            discord.http.Route.BASE = api_base.rstrip("/")
+        if gateway_url:
+            DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway_url)
+        if api_base or gateway_url:
+            logger.warning(
+                f"⚠️ ใช้ Discord endpoint ที่กำหนดเอง: REST={discord.http.Route.BASE} "
+                f"gateway={DiscordWebSocket.DEFAULT_GATEWAY}"
+            )
+
+    async def login(self, token: str) -> None:
+        """Login ด้วย token พร้อมจับเวลา"""
+        with timeline.phase("login"):
+            await super().login(token)
+
+    async def connect(self, *, reconnect: bool = True) -> None:
+        """เชื่อมต่อ gateway (RESUME session เดิมก่อนถ้ามี)"""
+        if self.gateway_sessions.enabled:
+            gateway_session.install()
+            await self.gateway_sessions.load()
+        self._connect_started = time.perf_counter()
+        await super().connect(reconnect=reconnect)
 
     async def setup_hook(self):
         """ฟังก์ชันที่จะทำงานหลังจาก bot พร้อมทำงาน"""
+        with timeline.phase("setup_hook"):
+            await self._setup()
+
+    async def _setup(self):
+        """เตรียมบริการเบื้องหลังและโหลด cogs"""
         try:
             # ตรวจสอบ Dev Mode
             await self.validate_dev_guild()
@@ -91,14 +211,25 @@ class MyBot(commands.Bot, DevModeMixin):
                     
                 logger.info(f"🔒 Dev Mode: จำกัดการทำงานเฉพาะใน guild {self.dev_guild_id}")
 
-            # โหลด cogs
-            cog_list = ["src.cogs.commands", "src.cogs.event_handler"]
-            if self.dev_mode:
-                cog_list.append("src.cogs.dev_tools")
+            with timeline.phase("audit_log_open"):
+                await self.audit_log.start()
 
-            for cog in cog_list:
-                await self.load_extension(cog)
-                logger.info(f"✅ โหลด {cog} สำเร็จ")
+            # โหลด cogs ตาม manifest (cog ที่ไม่พึ่งพากันโหลดพร้อมกัน)
+            with timeline.phase("load_cogs"):
+                await self.cog_registry.load_all(self, include_dev=self.dev_mode)
+
+            # Dev Mode: reload cog อัตโนมัติเมื่อไฟล์ถูกแก้ไข
+            if self.dev_mode and self.config.dev_auto_reload:
+                self.cog_watcher = CogWatcher(self, self.cog_registry)
+                self.cog_watcher.start()
+
+            self.guild_stats.start(self)
+            self.latency_monitor.start()
+            self.resource_sampler.start()
+            self.roll_stats.start()
+            if self.stack_sampler.base_interval > 0:
+                self.stack_sampler.start()
+            self.task_watchdog.start()
 
         except Exception as e:
             logger.error(f"❌ เกิดข้อผิดพลาดใน setup_hook: {str(e)}")
@@ -106,23 +237,293 @@ class MyBot(commands.Bot, DevModeMixin):
 
     async def on_guild_join(self, guild: discord.Guild):
         """จัดการเมื่อบอทถูกเชิญเข้า guild ใหม่"""
-        if self.dev_mode:
-            dev_guild_id = int(os.getenv("DEV_GUILD_ID", "0"))
-            if guild.id != dev_guild_id:
-                logger.info(f"👋 ปฏิเสธการเข้าร่วม guild {guild.name} (Dev Mode)")
-                await guild.leave()
-                return
+        if await self.handle_dev_mode(guild):
+            return
 
+        self.guild_stats.update_guild(guild)
         logger.info(f"✨ เข้าร่วม guild {guild.name} ({guild.id}) สำเร็จ")
 
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.guild_stats.remove_guild(guild)
+
+    async def on_guild_available(self, guild: discord.Guild):
+        self.guild_stats.update_guild(guild)
+
+    async def on_member_join(self, member: discord.Member):
+        # discord.py ปรับ member_count ของ guild ก่อน dispatch event แล้ว
+        self.guild_stats.update_guild(member.guild)
+
+    async def on_member_remove(self, member: discord.Member):
+        self.guild_stats.update_guild(member.guild)
+
+    async def on_resumed(self):
+        """RESUME สำเร็จ (ทั้งหลังหลุดการเชื่อมต่อและหลังรีสตาร์ท)"""
+        if self.is_ready():
+            return
+        # RESUME session ของ process ก่อน: ไม่มี READY / GUILD_CREATE มาให้
+        try:
+            count = await self.gateway_sessions.warm_cache(self)
+            logger.info(f"🔁 RESUME สำเร็จ เติม {count} guild จาก REST")
+        except discord.HTTPException as e:
+            logger.error(f"❌ เติม guild หลัง RESUME ไม่สำเร็จ: {e}")
+        self.gateway_sessions.resumed = True
+        self._connection.call_handlers("ready")
+        self.dispatch("ready")
+
     async def on_ready(self):
         """เมื่อบอทพร้อมใช้งาน"""
         logger.info(f"✅ Logged in as {self.user} (ID: {self.user.id})")
-        logger.info(f"📊 Connected to {len(self.guilds)} guilds")
+        # READY ทุกครั้ง (รวมถึงหลัง reconnect) cache ถูกสร้างใหม่ จึงคำนวณยอดใหม่
+        self.guild_stats.rebaseline(self.guilds)
+        logger.info(f"📊 Connected to {self.guild_stats.guild_count} guilds")
+
+        if timeline.mark("first_ready"):
+            self._record_gateway_ready()
+            logger.info(timeline.format_report())
+            await self._write_startup_report()
+
+    def _record_gateway_ready(self) -> None:
+        """บันทึกเวลาตั้งแต่เริ่มเชื่อมต่อ gateway จนพร้อม เทียบ RESUME กับ IDENTIFY"""
+        if self._connect_started is None:
+            return
+        now = time.perf_counter()
+        sessions = self.gateway_sessions
+        timeline.record(f"gateway_{sessions.mode}", self._connect_started, now)
+        sessions.ready_ms = round((now - self._connect_started) * 1000, 1)
+        timeline.note("gateway", sessions.mode)
+
+        if sessions.mode == "identify":
+            sessions.identify_ready_ms = sessions.ready_ms
+        elif sessions.mode == "resume" and sessions.identify_ready_ms:
+            saved_ms = round(sessions.identify_ready_ms - sessions.ready_ms, 1)
+            timeline.note("gateway_identify_ready_ms", sessions.identify_ready_ms)
+            timeline.note("gateway_resume_saved_ms", saved_ms)
+            logger.info(
+                f"⚡ RESUME พร้อมใน {sessions.ready_ms:.0f}ms "
+                f"(IDENTIFY ครั้งก่อน {sessions.identify_ready_ms:.0f}ms, เร็วขึ้น {saved_ms:.0f}ms)"
+            )
+
+    async def _write_startup_report(self) -> None:
+        """เขียนรายงาน startup timeline ลงไฟล์นอก event loop"""
+        try:
+            report_file = await self.run_blocking(timeline.write_report, timeout=10)
+            logger.debug(f"⏱️ บันทึก startup timeline ที่ {report_file}")
+        except Exception as e:
+            logger.error(f"❌ บันทึก startup timeline ไม่สำเร็จ: {e}")
+
+    async def run_blocking(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        process: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        """
+        รันงานที่ blocking หรือใช้ CPU หนักนอก event loop
+        เพื่อไม่ให้ heartbeat ของ gateway ถูกบล็อก
+
+        Args:
+            func: ฟังก์ชันที่ต้องการรัน
+            *args: arguments ของ func
+            timeout: เวลาสูงสุดที่รอ (วินาที)
+            process: ใช้ process pool สำหรับงานคำนวณล้วน (func ต้อง pickle ได้)
+            **kwargs: keyword arguments ของ func
+
+        Returns:
+            ผลลัพธ์ของ func
+
+        Raises:
+            asyncio.TimeoutError: ถ้าเกิน timeout
+        """
+        return await self.offload.run(
+            func, *args, timeout=timeout, process=process, **kwargs
+        )
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """
+        รวบรวม metrics ทั้งหมดของบอท ณ ปัจจุบัน
+
+        Returns:
+            Dict[str, Any]: ข้อมูล metrics แยกตามหมวด
+        """
+        return {
+            "timestamp": time.time(),
+            "uptime": time.time() - self.start_time,
+            "guilds": self.guild_stats.snapshot(),
+            "latency_ms": round(self.latency * 1000) if self.is_ready() else None,
+            "latency": self.latency_monitor.snapshot(),
+            "resources": self.resource_sampler.snapshot(),
+            "memory_profiler": self.memory_profiler.snapshot(),
+            "profiler": self.profiler.snapshot(),
+            "stack_sampler": self.stack_sampler.snapshot(),
+            "tasks": self.task_watchdog.snapshot(),
+            "drain": self.drain.snapshot(),
+            "gateway_session": self.gateway_sessions.snapshot(),
+            "log_sampling": self.log_sampler.snapshot(),
+            "offload": self.offload.snapshot(),
+            "roll_stats": self.roll_stats.snapshot(),
+            "stats": dict(self.stats),
+            "ratelimits": self.ratelimits.snapshot(),
+            "caches": all_cache_stats(),
+            "cogs": self.cog_registry.snapshot(),
+        }
+
+    def record_command(self, interaction: discord.Interaction, outcome: Outcome) -> None:
+        """
+        บันทึกการใช้คำสั่งหนึ่งครั้งลง audit log
+
+        Args:
+            interaction: Interaction ของคำสั่ง
+            outcome: ผลลัพธ์ของคำสั่ง
+        """
+        if interaction.command is None or interaction.extras.get("recorded"):
+            return
+        interaction.extras["recorded"] = True
+
+        started_at = interaction.extras.get("started_at")
+        latency_ms = (time.perf_counter() - started_at) * 1000 if started_at else 0.0
+
+        try:
+            record = self.audit_log.append(
+                user_id=interaction.user.id,
+                command=interaction.command.qualified_name,
+                outcome=outcome,
+                latency_ms=latency_ms,
+                guild_id=interaction.guild_id,
+                channel_id=interaction.channel_id,
+            )
+        except Exception as e:
+            logger.error(f"❌ บันทึก audit log ไม่สำเร็จ: {e}")
+            return
+
+        self.dispatch("command_recorded", record)
+
+    async def graceful_shutdown(self) -> None:
+        """
+        ปิดบอทแบบไม่ทิ้ง interaction ที่กำลังทำงาน
+
+        ปิดรับ interaction ใหม่ (ตอบกลับทันทีว่ากำลังรีสตาร์ท) รอ handler ที่ค้างอยู่
+        ไม่เกิน SHUTDOWN_DRAIN_SECONDS แล้วเขียน metrics สุดท้ายก่อน close()
+        ซึ่งเขียน audit log / สถิติการทอยที่ค้างอยู่ลงไฟล์
+        """
+        await self.drain.drain()
+        try:
+            metrics_file = await self.run_blocking(
+                self._write_metrics, self.metrics_snapshot(), timeout=10
+            )
+            logger.info(f"📊 บันทึก metrics สุดท้ายที่ {metrics_file}")
+        except Exception as e:
+            logger.error(f"❌ บันทึก metrics สุดท้ายไม่สำเร็จ: {e}")
+        await self.close()
+
+    async def reload_config(self) -> Dict[str, Tuple[Any, Any]]:
+        """
+        อ่าน .env อีกครั้ง ตรวจสอบ แล้วสลับ bot.config เป็น object ใหม่ทั้งก้อน
+
+        ค่าที่มีผลทันที (live) ถูกส่งต่อให้บริการที่เกี่ยวข้อง ส่วนค่าอื่นต้องรีสตาร์ท
+        ค่าที่ไม่เปลี่ยนจะไม่ถูกแตะ (เช่นกฎ log ที่ตั้งผ่าน /dev logs ยังอยู่)
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: ค่าที่เปลี่ยนในไฟล์ (ชื่อ env -> (เดิม, ใหม่))
+
+        Raises:
+            ConfigError: ถ้าค่าใหม่ไม่ถูกต้อง (config เดิมยังใช้ต่อ)
+        """
+        loaded = await self.run_blocking(BotConfig.reload, timeout=10)
+        changes = self.config.diff(loaded)
+        config = self.config.with_live_values(loaded)
+
+        if "PROFILE_SAMPLE_RATE" in changes:
+            self.profiler.set_sample_rate(config.profile_sample_rate)
+        if "LOG_SAMPLING" in changes or "LOG_RATE_LIMITS" in changes:
+            self.log_sampler.load(config.log_sampling, config.log_rate_limits)
+        self.task_watchdog.lag_threshold = config.task_watchdog_lag_ms / 1000
+        self.task_watchdog.stuck_after = config.task_stuck_seconds
+        self.drain.deadline = config.shutdown_drain_seconds
+        self.gateway_sessions.max_age = config.gateway_resume_seconds
+        self.config = config
+
+        pending = sorted(name for name in changes if not BotConfig.is_live(name))
+        logger.info(
+            f"⚙️ reload config: เปลี่ยน {len(changes)} ค่า"
+            + (f" (ต้องรีสตาร์ท: {', '.join(pending)})" if pending else "")
+        )
+        return changes
+
+    def _write_metrics(self, metrics: Dict[str, Any]) -> Path:
+        """เขียน metrics ลงไฟล์ JSON (blocking, ทำงานใน executor)"""
+        metrics_dir = Path(self.config.metrics_dir)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        path = metrics_dir / f"metrics_{stamp}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2, default=str)
+        return path
+
+    async def close(self) -> None:
+        """ปิดบอทและเขียนข้อมูลที่ค้างอยู่ลงไฟล์"""
+        # ถูกเรียกซ้ำได้ (graceful_shutdown แล้วตามด้วย async with ของ BotManager)
+        if self.is_closed():
+            return
+        if self.gateway_sessions.enabled and self.ws is not None and self.ws.open:
+            self.gateway_sessions.keep_resumable(self.ws)
+        if self.cog_watcher is not None:
+            await self.cog_watcher.stop()
+        await self.guild_stats.stop()
+        await self.latency_monitor.stop()
+        await self.resource_sampler.stop()
+        await self.roll_stats.stop()
+        await self.stack_sampler.stop()
+        await self.task_watchdog.stop()
+        await self.audit_log.close()
+        self.memory_profiler.stop()
+        if self.profiler.session_active:
+            await self.profiler.stop_session()
+        await super().close()
+        await self.gateway_sessions.flush()
+        self.offload.shutdown()
+        self.log_sampler.uninstall()
+
+    async def on_app_command_completion(
+        self,
+        interaction: discord.Interaction,
+        command: app_commands.Command
+    ):
+        """บันทึกเมื่อคำสั่งทำงานจบ"""
+        outcome = Outcome.ERROR if interaction.extras.get("error") else Outcome.SUCCESS
+        self.record_command(interaction, outcome)
+
+        if timeline.mark("first_interaction"):
+            await self._write_startup_report()
+
+    async def _interaction_check(self, interaction: discord.Interaction) -> bool:
+        """ตรวจสอบ interaction ก่อนเรียกคำสั่ง"""
+        # autocomplete ไม่ใช่การเรียกคำสั่ง: ไม่นับเป็นงานค้างและตอบด้วยข้อความไม่ได้
+        if interaction.type is discord.InteractionType.autocomplete:
+            return True
+
+        interaction.extras["started_at"] = time.perf_counter()
+
+        # กำลังปิดบอท: ตอบทันทีแทนการปล่อยให้ interaction หมดเวลา
+        if not self.drain.track():
+            try:
+                await interaction.response.send_message(
+                    "🔄 บอทกำลังรีสตาร์ท กรุณาลองใหม่อีกครั้งในอีกสักครู่", ephemeral=True
+                )
+            except discord.HTTPException:
+                pass
+            return False
+
+        # ระบุคำสั่งให้ REST request ที่ตามมาใน task นี้
+        if interaction.command:
+            self.ratelimits.set_tag(f"/{interaction.command.qualified_name}")
+        return True
 
     async def _handle_tree_error(
         self,
         interaction: discord.Interaction,
         error: app_commands.AppCommandError
     ):
+        self.record_command(interaction, Outcome.ERROR)
         await self.error_handler.handle_error(interaction, error)
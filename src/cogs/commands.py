@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Literal
+from typing import Literal, Optional
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -42,8 +42,40 @@ class CommandsCog(commands.Cog):
         self.help_cmd = HelpCommand(bot)
 
         # Register commands
+        self._registered: list = []
         self._setup_commands()
 
+    def _commands(self) -> dict:
+        """command instances ทั้งหมดของ cog"""
+        return {
+            "ping": self.ping_cmd,
+            "roll": self.roll_cmd,
+            "help": self.help_cmd,
+        }
+
+    def export_state(self) -> dict:
+        """ส่งออก state ก่อน reload"""
+        return {
+            "start_time": self.start_time,
+            "commands": {
+                name: cmd.export_state() for name, cmd in self._commands().items()
+            },
+        }
+
+    def import_state(self, state: dict) -> None:
+        """รับ state จาก cog เดิมหลัง reload"""
+        self.start_time = state.get("start_time", self.start_time)
+        for name, cmd in self._commands().items():
+            cmd_state = state.get("commands", {}).get(name)
+            if cmd_state:
+                cmd.import_state(cmd_state)
+
+    async def cog_unload(self):
+        """ถอดคำสั่งออกจาก CommandTree เพื่อให้ reload ลงทะเบียนใหม่ได้"""
+        for cmd in self._registered:
+            self.bot.tree.remove_command(cmd.name)
+        self._registered.clear()
+
     def _setup_commands(self):
         """ตั้งค่า commands"""
 
@@ -54,8 +86,50 @@ class CommandsCog(commands.Cog):
 
         # Command: roll
         @app_commands.command(name="roll", description="ทอยลูกเต๋า")
-        async def roll(interaction: discord.Interaction):
-            await self.roll_cmd.execute(interaction, self.bot.stats)
+        @app_commands.describe(
+            expression="🎲 นิพจน์ลูกเต๋า เช่น 2d6+3, 4d6kh3, 2d10! (ค่าเริ่มต้น 1d6)"
+        )
+        async def roll(interaction: discord.Interaction, expression: str = "1d6"):
+            await self.roll_cmd.execute(interaction, self.bot.stats, expression)
+
+        # Command group: dice (โอกาส สถิติ และอันดับของ /roll)
+        dice = app_commands.Group(name="dice", description="โอกาส สถิติ และอันดับการทอยลูกเต๋า")
+
+        @dice.command(name="odds", description="คำนวณโอกาสของผลรวมลูกเต๋า")
+        @app_commands.describe(
+            expression="🎲 นิพจน์ลูกเต๋า เช่น 3d6, 4d6kh3, 1d20+5",
+            target="🎯 ค่าเป้าหมาย",
+            comparison="📐 เงื่อนไข (ค่าเริ่มต้น: อย่างน้อย)",
+        )
+        @app_commands.choices(comparison=[
+            app_commands.Choice(name="อย่างน้อย (≥)", value="at_least"),
+            app_commands.Choice(name="ไม่เกิน (≤)", value="at_most"),
+            app_commands.Choice(name="เท่ากับ (=)", value="exactly"),
+        ])
+        async def roll_odds(
+            interaction: discord.Interaction,
+            expression: str,
+            target: int,
+            comparison: str = "at_least",
+        ):
+            await self.roll_cmd.odds(interaction, expression, target, comparison)
+
+        @dice.command(name="stats", description="ดูสถิติการทอยในเซิร์ฟเวอร์นี้")
+        @app_commands.describe(user="👤 ผู้ใช้ที่ต้องการดู (ค่าเริ่มต้น: ตัวคุณเอง)")
+        async def roll_stats(
+            interaction: discord.Interaction, user: Optional[discord.User] = None
+        ):
+            await self.roll_cmd.stats(interaction, user)
+
+        @dice.command(name="leaderboard", description="อันดับการทอยในเซิร์ฟเวอร์นี้")
+        @app_commands.describe(metric="🏆 ประเภทอันดับ (ค่าเริ่มต้น: ทอยบ่อยที่สุด)")
+        @app_commands.choices(metric=[
+            app_commands.Choice(name="ทอยบ่อยที่สุด", value="rolls"),
+            app_commands.Choice(name="ทอยได้ผลสูงสุดบ่อยที่สุด", value="max_rolls"),
+            app_commands.Choice(name="ดวงดีที่สุด", value="luck"),
+        ])
+        async def roll_leaderboard(interaction: discord.Interaction, metric: str = "rolls"):
+            await self.roll_cmd.leaderboard(interaction, metric)
 
         # Command: help
         @app_commands.command(
@@ -89,8 +163,9 @@ class CommandsCog(commands.Cog):
             )
 
         # เพิ่ม commands เข้า CommandTree
-        for cmd in [ping, roll, help]:
+        for cmd in [ping, roll, dice, help]:
             self.bot.tree.add_command(cmd)
+            self._registered.append(cmd)
             logger.debug(f"✅ ลงทะเบียนคำสั่ง: {cmd.name}")
 
         logger.info("✅ ลงทะเบียนคำสั่งทั้งหมดสำเร็จ")
@@ -100,7 +175,8 @@ class CommandsCog(commands.Cog):
         """เรียกเมื่อ Cog พร้อมใช้งาน"""
         try:
             # sync commands กับ Discord
-            await self.bot.tree.sync()
+            with self.bot.ratelimits.tag("tree.sync"):
+                await self.bot.tree.sync()
 
             # ตรวจสอบว่า commands ลงทะเบียนสำเร็จ
             commands = self.bot.tree.get_commands()
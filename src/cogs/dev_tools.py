@@ -1,87 +1,30 @@
 # Standard library imports
 import asyncio
 import logging
-import os
+import time
+from dataclasses import fields
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Any, Dict
 
 # Third-party imports
 import discord 
 from discord import app_commands
 from discord.ext import commands
-import psutil
 
 # Local imports
+from ..utils.async_cache import AsyncTTLCache, all_cache_stats
+from ..utils.audit_log import AuditRecord, Outcome
+from ..utils.config import BotConfig, ConfigError
+from ..utils.command_history import CommandHistory
 from ..utils.decorators import dev_command_error_handler
-from ..utils.exceptions import DevModeError, PermissionError
+from ..utils.exceptions import DevModeError, PermissionError, UserError
 from ..utils.embed_builder import EmbedBuilder
+from ..utils.memory_profiler import MAX_FRAMES, format_bytes
+from ..utils.profiler import MAX_SESSION_SECONDS
+from ..utils.ui_constants import UIConstants
 
 logger = logging.getLogger(__name__)
 
-class DevCache:
-    """จัดการ Cache สำหรับตรวจสอบสิทธิ์ Developer"""
-    def __init__(self, timeout_minutes: int = 5):
-        self._cache: Dict[int, tuple[datetime, bool]] = {}
-        self._timeout = timedelta(minutes=timeout_minutes)
-
-    def get(self, user_id: int) -> Optional[bool]:
-        if user_id in self._cache:
-            timestamp, is_dev = self._cache[user_id]
-            if datetime.utcnow() - timestamp < self._timeout:
-                return is_dev
-        return None
-
-    def set(self, user_id: int, is_dev: bool) -> None:
-        self._cache[user_id] = (datetime.utcnow(), is_dev)
-
-    def clear_expired(self) -> None:
-        current_time = datetime.utcnow()
-        self._cache = {
-            user_id: (timestamp, is_dev)
-            for user_id, (timestamp, is_dev) in self._cache.items()
-            if current_time - timestamp < self._timeout
-        }
-
-    def count_active_devs(self) -> int:
-        current_time = datetime.utcnow()
-        return sum(
-            1
-            for _, (timestamp, is_dev) in self._cache.items()
-            if current_time - timestamp < self._timeout and is_dev
-        )
-
-    def clear(self) -> None:
-        self._cache.clear()
-
-class CommandHistory:
-    """จัดการประวัติการใช้คำสั่ง"""
-    def __init__(self, max_entries: int = 10):
-        self._history: List[Dict[str, Any]] = []
-        self._max_entries = max_entries
-
-    def add(self, user: discord.User, action: str, success: bool) -> None:
-        try:
-            entry = {
-                "user": f"{user.name}#{user.discriminator}",
-                "user_id": user.id,
-                "action": action,
-                "success": success,
-                "timestamp": datetime.utcnow(),
-            }
-            self._history.append(entry)
-
-            if len(self._history) > self._max_entries:
-                self._history.pop(0)
-        except Exception as e:
-            logger.error(f"Error adding command history: {e}")
-
-    def get_recent(self, count: int = 5) -> List[Dict[str, Any]]:
-        return list(reversed(self._history[-count:]))
-
-    def clear(self) -> None:
-        self._history.clear()
-
-
 class DevTools(commands.GroupCog, group_name="dev"):
     """Developer tools for managing the bot"""
 
@@ -90,11 +33,14 @@ class DevTools(commands.GroupCog, group_name="dev"):
         self._last_sync = None
         self._ready = False
         self._startup_commands = {"sync", "status"}  # คำสั่งที่ใช้ได้ระหว่างเริ่มต้น
-        self._dev_cache = DevCache()
-        self._history = CommandHistory()
+        self._dev_cache: AsyncTTLCache[int, bool] = AsyncTTLCache(
+            maxsize=256, ttl=300, name="dev_permissions"
+        )
+        self._history = CommandHistory(
+            capacity=bot.config.command_history_size
+        )
         self.old_commands = set()
-        self.process = psutil.Process()
-        self.available_cogs = []
+        self.ui = UIConstants()
 
         # ตั้งค่าค่าคงที่
         self.COLORS = {
@@ -113,7 +59,6 @@ class DevTools(commands.GroupCog, group_name="dev"):
             "done": "✨",
         }
 
-        self._update_available_cogs()
         super().__init__()
 
     async def _create_base_embed(
@@ -151,17 +96,6 @@ class DevTools(commands.GroupCog, group_name="dev"):
         )
         await self._safe_respond(interaction, embed=embed, ephemeral=True)
 
-    def _update_available_cogs(self):
-        """อัพเดทรายชื่อ cogs ที่มีอยู่"""
-        try:
-            self.available_cogs = [
-                app_commands.Choice(name=f"📦 {name}", value=name)
-                for name in self.bot.cogs.keys()
-            ]
-        except Exception as e:
-            logger.error(f"Error updating available cogs: {e}")
-            self.available_cogs = []
-
     async def handle_error(self, interaction: discord.Interaction, error: Exception) -> None:
         """จัดการข้อผิดพลาด"""
         await self.bot.error_handler.handle_error(interaction, error)
@@ -197,6 +131,49 @@ class DevTools(commands.GroupCog, group_name="dev"):
                     "ล้างคำสั่งเก่า",
                     inline=False
                 )
+                .add_field(
+                    "📜 /dev history [user] [errors_only] [since_hours] [until_hours]",
+                    "ดูประวัติการใช้คำสั่งจาก audit log",
+                    inline=False
+                )
+                .add_field(
+                    "🔬 /dev memory [action] [frames] [group_by] [count]",
+                    "ตรวจหน่วยความจำด้วย tracemalloc\n"
+                    "`start` → `snapshot` → `diff` (ทำซ้ำได้) → `stop`",
+                    inline=False
+                )
+                .add_field(
+                    "⏱️ /dev profile [action] [duration] [rate]",
+                    "`start`/`stop`: cProfile ทั้ง event loop ตามเวลาที่กำหนด\n"
+                    "`sample`: สุ่ม profile คำสั่งและ event handler ตามสัดส่วน `rate`\n"
+                    "`report`: ผลสะสมแยกตาม handler",
+                    inline=False
+                )
+                .add_field(
+                    "🧵 /dev tasks [dump]",
+                    "ดู asyncio task แยกตาม coroutine พร้อมจุดที่รออยู่ และ task ที่ค้าง\n"
+                    "`dump`: เขียน stack ของทุก task ลง log",
+                    inline=False
+                )
+                .add_field(
+                    "🔥 /dev flamegraph [reset]",
+                    "ส่งออก stack ของ event loop ที่สุ่มเก็บไว้ตลอดเวลา (collapsed stack)",
+                    inline=False
+                )
+                .add_field(
+                    "⚙️ /dev config [action]",
+                    "`show`: ค่าตั้งค่าปัจจุบัน\n"
+                    "`reload`: อ่าน .env อีกครั้ง (เหมือนส่ง SIGHUP)",
+                    inline=False
+                )
+                .add_field(
+                    "🪵 /dev logs [action] [pattern] [level] [value]",
+                    "`show`: กฎและจำนวน log ที่ถูกทิ้ง\n"
+                    "`sample`: เก็บ 1 ใน `value` รายการของ logger ที่ตรง `pattern`\n"
+                    "`limit`: ไม่เกิน `value` (เช่น `5/60`) ต่อข้อความต่อช่วงเวลา\n"
+                    "`clear`: ลบกฎของ `pattern` (ไม่ระบุ = ทั้งหมด)",
+                    inline=False
+                )
                 .set_color("info")
                 .set_footer(f"Requested by {interaction.user}")
                 .build()
@@ -238,10 +215,12 @@ class DevTools(commands.GroupCog, group_name="dev"):
     @reload.autocomplete('cog')
     async def reload_autocomplete(self, interaction: discord.Interaction, current: str):
         """Autocomplete for reload command"""
-        self._update_available_cogs()
         choices = [app_commands.Choice(name="📦 All Cogs", value="all")]
-        choices.extend(self.available_cogs)
-        return choices
+        choices.extend(
+            app_commands.Choice(name=display, value=key)
+            for display, key in self.bot.cog_registry.choices(self.bot, current)
+        )
+        return choices[:25]
 
     @app_commands.command(name="status", description="📊 Show bot status")
     async def status(self, interaction: discord.Interaction):
@@ -265,6 +244,176 @@ class DevTools(commands.GroupCog, group_name="dev"):
         except Exception as e:
             await self.handle_error(interaction, e)
 
+    @app_commands.command(name="history", description="📜 Show command history")
+    @app_commands.describe(
+        user="ดูเฉพาะคำสั่งของผู้ใช้นี้",
+        errors_only="แสดงเฉพาะคำสั่งที่เกิดข้อผิดพลาด",
+        since_hours="ย้อนหลังกี่ชั่วโมง (จุดเริ่มต้นของช่วงเวลา)",
+        until_hours="ถึงเมื่อกี่ชั่วโมงก่อน (จุดสิ้นสุดของช่วงเวลา)",
+        count="จำนวนรายการที่แสดง",
+    )
+    async def history(
+        self,
+        interaction: discord.Interaction,
+        user: Optional[discord.User] = None,
+        errors_only: bool = False,
+        since_hours: Optional[app_commands.Range[float, 0]] = None,
+        until_hours: Optional[app_commands.Range[float, 0]] = None,
+        count: app_commands.Range[int, 1, 25] = 10,
+    ):
+        """Show command history"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_history(
+                interaction, user, errors_only, since_hours, until_hours, count
+            )
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="memory", description="🔬 ตรวจการใช้หน่วยความจำด้วย tracemalloc")
+    @app_commands.describe(
+        action="start / snapshot / diff / stop",
+        frames="จำนวน frame ของ traceback ที่เก็บ (ใช้กับ start)",
+        group_by="จัดกลุ่มผลเทียบตาม (ใช้กับ diff)",
+        count="จำนวนตำแหน่งที่โตขึ้นมากที่สุดที่แสดง (ใช้กับ diff)",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="▶️ Start", value="start"),
+            app_commands.Choice(name="📸 Snapshot", value="snapshot"),
+            app_commands.Choice(name="📈 Diff", value="diff"),
+            app_commands.Choice(name="⏹️ Stop", value="stop"),
+        ],
+        group_by=[
+            app_commands.Choice(name="บรรทัด", value="lineno"),
+            app_commands.Choice(name="traceback", value="traceback"),
+            app_commands.Choice(name="ไฟล์", value="filename"),
+        ],
+    )
+    async def memory(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        frames: app_commands.Range[int, 1, MAX_FRAMES] = 1,
+        group_by: str = "lineno",
+        count: app_commands.Range[int, 1, 20] = 10,
+    ):
+        """Inspect memory growth"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_memory(interaction, action, frames, group_by, count)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="profile", description="⏱️ Profile คำสั่งและ event handler")
+    @app_commands.describe(
+        action="start / stop / sample / report",
+        duration="ระยะเวลาสูงสุดของ profile (วินาที ใช้กับ start)",
+        rate="สัดส่วนการเรียก handler ที่สุ่ม profile เช่น 0.01 = 1% (ใช้กับ sample, 0 = ปิด)",
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="▶️ Start", value="start"),
+        app_commands.Choice(name="⏹️ Stop", value="stop"),
+        app_commands.Choice(name="🎯 Sample", value="sample"),
+        app_commands.Choice(name="📊 Report", value="report"),
+    ])
+    async def profile(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        duration: app_commands.Range[int, 1, MAX_SESSION_SECONDS] = 30,
+        rate: app_commands.Range[float, 0, 1] = 0.01,
+    ):
+        """Profile command and event handlers"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_profile(interaction, action, duration, rate)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="flamegraph", description="🔥 Export sampled event loop stacks")
+    @app_commands.describe(reset="ล้าง sample หลังส่งออก")
+    async def flamegraph(self, interaction: discord.Interaction, reset: bool = False):
+        """Export sampled event loop stacks"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_flamegraph(interaction, reset)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="tasks", description="🧵 Inspect asyncio tasks")
+    @app_commands.describe(dump="เขียน stack ของทุก task ลง log ด้วย")
+    async def tasks(self, interaction: discord.Interaction, dump: bool = False):
+        """Inspect asyncio tasks"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_tasks(interaction, dump)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="config", description="⚙️ Show or reload bot config")
+    @app_commands.describe(action="show / reload")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="📋 Show", value="show"),
+        app_commands.Choice(name="🔄 Reload", value="reload"),
+    ])
+    async def config(self, interaction: discord.Interaction, action: str = "show"):
+        """Show or reload bot config"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_config(interaction, action)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
+    @app_commands.command(name="logs", description="🪵 Log sampling and rate limits")
+    @app_commands.describe(
+        action="show / sample / limit / clear",
+        pattern="ชื่อ logger รองรับ wildcard เช่น src.commands.*",
+        level="กฎมีผลกับ log ระดับนี้ลงไป",
+        value="sample: N (เก็บ 1 ใน N, 1 = ลบกฎ) • limit: N/วินาที เช่น 5/60 (0/1 = ลบกฎ)",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="📋 Show", value="show"),
+            app_commands.Choice(name="🎲 Sample", value="sample"),
+            app_commands.Choice(name="🚦 Limit", value="limit"),
+            app_commands.Choice(name="🧹 Clear", value="clear"),
+        ],
+        level=[
+            app_commands.Choice(name="DEBUG", value="DEBUG"),
+            app_commands.Choice(name="INFO", value="INFO"),
+            app_commands.Choice(name="WARNING", value="WARNING"),
+        ],
+    )
+    async def logs(
+        self,
+        interaction: discord.Interaction,
+        action: str = "show",
+        pattern: Optional[str] = None,
+        level: str = "INFO",
+        value: Optional[str] = None,
+    ):
+        """Log sampling and rate limits"""
+        try:
+            if not await self._check_dev_permission(interaction):
+                return
+
+            await self._handle_logs(interaction, action, pattern, level, value)
+        except Exception as e:
+            await self.handle_error(interaction, e)
+
     async def _handle_sync(self, interaction: discord.Interaction, scope: str) -> None:
         """จัดการคำสั่ง sync"""
         if scope not in ["guild", "global"]:
@@ -310,29 +459,12 @@ class DevTools(commands.GroupCog, group_name="dev"):
         try:
             await interaction.response.defer(ephemeral=True)
             
-            # Map of cog display names to actual paths
-            cog_paths = {
-                "all": None,  # Special case for reloading all
-                "commands": "src.cogs.commands",
-                "events": "src.cogs.event_handler",
-                "dev": "src.cogs.dev_tools",
-                # เพิ่ม cogs อื่นๆ ตามต้องการ
-            }
-            
+            registry = self.bot.cog_registry
+
             if cog_name.lower() == "all":
-                # Reload ทุก cog
-                reloaded = []
-                failed = []
-                
-                for cog_display, cog_path in cog_paths.items():
-                    if cog_display == "all":  # ข้าม key "all"
-                        continue
-                    try:
-                        await self.bot.reload_extension(cog_path)
-                        reloaded.append(cog_display)
-                    except Exception as e:
-                        failed.append(f"{cog_display} ({str(e)})")
-                        
+                # Reload ทุก cog ตามลำดับ dependency
+                reloaded, failed = await registry.reload_all(self.bot)
+
                 status = "✅ Reload ทุก cog สำเร็จ" if not failed else "⚠️ Reload บาง cog ไม่สำเร็จ"
                 description = []
                 if reloaded:
@@ -342,13 +474,10 @@ class DevTools(commands.GroupCog, group_name="dev"):
                     
             else:
                 # Reload cog เดียว
-                cog_path = cog_paths.get(cog_name.lower())
-                if not cog_path:
-                    raise ValueError(f"ไม่พบ cog ชื่อ '{cog_name}'\nCogs ที่มี: {', '.join(k for k in cog_paths.keys() if k != 'all')}")
-                
-                await self.bot.reload_extension(cog_path)
-                status = f"✅ Reload {cog_name} สำเร็จ"
-                description = [f"Reload cog: `{cog_path}`"]
+                spec = await registry.reload(self.bot, cog_name)
+                result = registry.results[spec.key]
+                status = f"✅ Reload {spec.key} สำเร็จ"
+                description = [f"Reload cog: `{spec.path}` ({result.duration_ms:.1f}ms)"]
                 
             embed = (
                 EmbedBuilder()
@@ -366,17 +495,423 @@ class DevTools(commands.GroupCog, group_name="dev"):
             logger.error(f"❌ เกิดข้อผิดพลาดใน reload: {str(e)}")
             raise
 
-    @reload.autocomplete('cog')
-    async def reload_autocomplete(self, interaction: discord.Interaction, current: str):
-        """Autocomplete for reload command"""
-        choices = [
-            app_commands.Choice(name="📦 All Cogs", value="all"),
-            app_commands.Choice(name="🎮 Commands", value="commands"),
-            app_commands.Choice(name="🎯 Events", value="events"),
-            app_commands.Choice(name="🛠️ Developer Tools", value="dev"),
-            # เพิ่ม cogs อื่นๆ ตามต้องการ
+    async def _handle_history(
+        self,
+        interaction: discord.Interaction,
+        user: Optional[discord.User],
+        errors_only: bool,
+        since_hours: Optional[float],
+        until_hours: Optional[float],
+        count: int,
+    ) -> None:
+        """จัดการคำสั่ง history"""
+        await interaction.response.defer(ephemeral=True)
+
+        now = time.time()
+        records = await self.bot.audit_log.search(
+            user_id=user.id if user else None,
+            outcome=Outcome.ERROR if errors_only else None,
+            start=now - since_hours * 3600 if since_hours is not None else None,
+            end=now - until_hours * 3600 if until_hours is not None else None,
+            limit=count,
+        )
+
+        outcome_emoji = {
+            Outcome.SUCCESS: self.EMOJI["success"],
+            Outcome.ERROR: self.EMOJI["error"],
+            Outcome.REJECTED: self.EMOJI["warning"],
+        }
+        lines = [
+            f"{outcome_emoji[r.outcome]} <t:{int(r.timestamp)}:f> `/{r.command}` "
+            f"<@{r.user_id}> `{r.latency_ms:.0f}ms`"
+            for r in records
+        ]
+
+        embed = (
+            EmbedBuilder()
+            .set_title("ประวัติการใช้คำสั่ง", emoji="📜")
+            .set_description("\n".join(lines) or "ไม่พบประวัติที่ตรงเงื่อนไข")
+            .set_color("info")
+            .set_footer(
+                f"ใน memory: {len(self._history):,} รายการ • "
+                f"ผู้ใช้ที่ active: {self._history.active_users:,}"
+            )
+            .build()
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    def _memory_context(self) -> Dict[str, Any]:
+        """ขนาดของสิ่งที่มักโตขึ้นเรื่อยๆ (เขียนไว้หัวรายงาน diff)"""
+        loggers = [logging.getLogger()] + [
+            logger_ for logger_ in logging.root.manager.loggerDict.values()
+            if isinstance(logger_, logging.Logger)
         ]
-        return choices
+        context: Dict[str, Any] = {
+            "guilds": len(self.bot.guilds),
+            "cached users": len(self.bot.users),
+            "cached messages": len(self.bot.cached_messages),
+            "log handlers": sum(len(logger_.handlers) for logger_ in loggers),
+            "asyncio tasks": len(asyncio.all_tasks()),
+        }
+        for name, stats in all_cache_stats().items():
+            context[f"cache {name}"] = f"{stats['size']}/{stats['maxsize']}"
+        return context
+
+    async def _handle_memory(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        frames: int,
+        group_by: str,
+        count: int,
+    ) -> None:
+        """จัดการคำสั่ง memory"""
+        profiler = self.bot.memory_profiler
+
+        if action == "start":
+            profiler.start(frames)
+            embed = (
+                EmbedBuilder()
+                .set_title("เริ่ม tracemalloc", emoji="🔬")
+                .set_description(
+                    f"เก็บ traceback {frames} frames ต่อการจอง\n"
+                    "ใช้ `/dev memory snapshot` เพื่อตั้งจุดเทียบ แล้ว `diff` ภายหลัง\n"
+                    "⚠️ การจองหน่วยความจำจะช้าลงจนกว่าจะ `stop`"
+                )
+                .set_color("warning")
+                .build()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if action == "stop":
+            profiler.stop()
+            embed = (
+                EmbedBuilder()
+                .set_title("หยุด tracemalloc", emoji="⏹️")
+                .set_description("ทิ้ง snapshot ทั้งหมดแล้ว")
+                .set_color("success")
+                .build()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        if action == "snapshot":
+            info = await profiler.take_snapshot()
+            embed = (
+                EmbedBuilder()
+                .set_title(f"Snapshot {info.label}", emoji="📸")
+                .set_description(
+                    f"หน่วยความจำที่ถูก trace: **{format_bytes(info.traced_bytes)}**\n"
+                    f"เก็บไว้ {len(profiler.snapshots)} snapshots"
+                )
+                .add_field("สถานะ", f"```\n{profiler.format_summary()}\n```", inline=False)
+                .set_color("info")
+                .build()
+            )
+        elif action == "diff":
+            result = await profiler.diff(group_by, count, self._memory_context())
+            lines = [
+                f"`{format_bytes(site.size_diff, signed=True):>11}` "
+                f"`{site.count_diff:+,}` {discord.utils.escape_markdown(site.location)}"
+                for site in result.top
+            ]
+            embed = (
+                EmbedBuilder()
+                .set_title(f"Memory diff {result.before} → {result.after}", emoji="📈")
+                .set_description(
+                    "\n".join(lines)[:4000] or "ไม่พบตำแหน่งที่หน่วยความจำโตขึ้น"
+                )
+                .add_field(
+                    "รวม",
+                    f"{format_bytes(result.total)} "
+                    f"({format_bytes(result.total_diff, signed=True)} "
+                    f"ใน {result.seconds:.0f}s)",
+                    inline=True,
+                )
+                .add_field("รายงานฉบับเต็ม", f"`{result.report_file}`", inline=True)
+                .set_color("warning" if result.total_diff > 0 else "success")
+                .set_footer(f"คำนวณ {result.compute_ms:.0f}ms ใน executor")
+                .build()
+            )
+        else:
+            raise ValueError("action ต้องเป็น start, snapshot, diff หรือ stop")
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    async def _handle_profile(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        duration: int,
+        rate: float,
+    ) -> None:
+        """จัดการคำสั่ง profile"""
+        profiler = self.bot.profiler
+
+        if action == "start":
+            profiler.start_session(duration)
+            embed = (
+                EmbedBuilder()
+                .set_title("เริ่ม profile", emoji="⏱️")
+                .set_description(
+                    f"profile event loop ทั้งหมดสูงสุด {duration} วินาที\n"
+                    "ใช้ `/dev profile stop` เพื่อหยุดก่อนกำหนดและดูผล"
+                )
+                .set_color("warning")
+                .build()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if action == "sample":
+            profiler.set_sample_rate(rate)
+            embed = (
+                EmbedBuilder()
+                .set_title("สุ่ม profile handler", emoji="🎯")
+                .set_description(
+                    f"profile {rate:.2%} ของการเรียกคำสั่งและ event handler\n"
+                    "ใช้ `/dev profile report` เพื่อดูผลสะสม"
+                    if rate else "ปิดการสุ่ม profile แล้ว"
+                )
+                .set_color("info")
+                .build()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        if action == "stop":
+            report = await profiler.stop_session()
+            lines = [
+                f"`{cost.own_ms:>9.1f}ms` `{cost.total_ms:>9.1f}ms` "
+                f"{discord.utils.escape_markdown(cost.name)}"
+                for cost in report.top
+            ]
+            embed = (
+                EmbedBuilder()
+                .set_title(f"Profile {report.seconds:.1f}s", emoji="⏱️")
+                .set_description(
+                    "**เวลาของฟังก์ชันเอง / รวมที่เรียกต่อ**\n" + "\n".join(lines)
+                )
+                .add_field("pstats", f"`{report.pstats_file}`", inline=False)
+                .add_field("collapsed stack", f"`{report.collapsed_file}`", inline=False)
+                .set_color("success")
+                .build()
+            )
+        elif action == "report":
+            directory, results = await profiler.write_handlers()
+            embed = (
+                EmbedBuilder()
+                .set_title("Profile ของ handler", emoji="📊")
+                .set_description(
+                    f"สุ่ม {profiler.sample_rate:.2%} ของการเรียก "
+                    "เรียงตามเวลาบน event loop โดยประมาณ"
+                )
+                .set_color("info")
+                .set_footer(f"ไฟล์: {directory}")
+            )
+            for handler, top in results[:10]:
+                hottest = (
+                    f"\n🔥 {discord.utils.escape_markdown(top[0].name)}" if top else ""
+                )
+                embed.add_field(
+                    handler.name,
+                    f"~{handler.estimated_loop_ms:,.1f}ms บน loop "
+                    f"({handler.sampled:,}/{handler.calls:,} ครั้ง, "
+                    f"{handler.loop_ms / handler.sampled:.2f}ms/ครั้ง){hottest}",
+                    inline=False,
+                )
+            embed = embed.build()
+        else:
+            raise ValueError("action ต้องเป็น start, stop, sample หรือ report")
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    async def _handle_flamegraph(self, interaction: discord.Interaction, reset: bool) -> None:
+        """จัดการคำสั่ง flamegraph"""
+        sampler = self.bot.stack_sampler
+        if not sampler.samples:
+            raise UserError("ยังไม่มี sample (stack sampler ปิดอยู่หรือเพิ่งเริ่ม)")
+
+        await interaction.response.defer(ephemeral=True)
+        path = await sampler.export()
+        tasks = "\n".join(
+            f"`{count / sampler.samples:>6.1%}` {discord.utils.escape_markdown(task)}"
+            for task, count in sampler.top_tasks()
+        )
+        embed = (
+            EmbedBuilder()
+            .set_title("Flamegraph", emoji="🔥")
+            .set_description(
+                "ใช้ไฟล์แนบกับ `flamegraph.pl` หรือเปิดใน speedscope.app"
+            )
+            .add_field("Sampler", f"```\n{sampler.format_summary()}\n```", inline=False)
+            .add_field("Task ที่พบบ่อยที่สุด", tasks, inline=False)
+            .set_color("info")
+            .set_footer(str(path))
+            .build()
+        )
+        await interaction.followup.send(
+            embed=embed, file=discord.File(path), ephemeral=True
+        )
+        if reset:
+            sampler.reset()
+
+    async def _handle_tasks(self, interaction: discord.Interaction, dump: bool) -> None:
+        """จัดการคำสั่ง tasks"""
+        watchdog = self.bot.task_watchdog
+        infos = watchdog.scan()
+        if dump:
+            watchdog.dump(f"/dev tasks โดย {interaction.user}")
+
+        lines = []
+        for coro, group in watchdog.group(infos)[:15]:
+            oldest = max(group, key=lambda info: info.age)
+            stuck = sum(info.stuck for info in group)
+            flag = f" ⚠️ ค้าง {stuck}" if stuck else ""
+            lines.append(
+                f"**{len(group)}×** `{discord.utils.escape_markdown(coro)}`{flag}\n"
+                f"└ อายุสูงสุด {oldest.age:,.0f}s • "
+                f"{discord.utils.escape_markdown(oldest.await_point)}"
+            )
+
+        embed = (
+            EmbedBuilder()
+            .set_title(f"Asyncio tasks ({len(infos):,})", emoji="🧵")
+            .set_description("\n".join(lines)[:4000])
+            .set_color("warning" if any(info.stuck for info in infos) else "info")
+            .set_footer(
+                f"lag สูงสุด {watchdog.max_lag_ms:,.0f}ms • "
+                f"ค้างเมื่อรอจุดเดิมเกิน {watchdog.stuck_after:,.0f}s"
+                + (" • เขียน stack ลง log แล้ว" if dump else "")
+            )
+        )
+        stuck = [info for info in infos if info.stuck][:5]
+        if stuck:
+            embed.add_field(
+                "Task ที่ค้าง",
+                "\n".join(
+                    f"`{info.waiting:,.0f}s` {discord.utils.escape_markdown(info.name)} "
+                    f"@ {discord.utils.escape_markdown(info.await_point)}"
+                    for info in stuck
+                )[:1024],
+                emoji="⏳",
+                inline=False,
+            )
+        await interaction.response.send_message(embed=embed.build(), ephemeral=True)
+
+    async def _handle_config(self, interaction: discord.Interaction, action: str) -> None:
+        """จัดการคำสั่ง config"""
+        if action == "show":
+            values = "\n".join(
+                f"{f.metadata['env']}={getattr(self.bot.config, f.name)!r}"
+                + ("" if f.metadata["live"] else " *")
+                for f in fields(self.bot.config)
+            )
+            embed = (
+                EmbedBuilder()
+                .set_title("Config", emoji="⚙️")
+                .set_description(f"```\n{values}\n```"[:4000])
+                .set_color("info")
+                .set_footer("* ต้องรีสตาร์ทเมื่อเปลี่ยนค่า")
+                .build()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        if action != "reload":
+            raise ValueError("action ต้องเป็น show หรือ reload")
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            changes = await self.bot.reload_config()
+        except ConfigError as e:
+            raise UserError(f"config ใหม่ไม่ถูกต้อง ยังใช้ค่าเดิมอยู่: {e.message}") from e
+
+        applied = [name for name in changes if BotConfig.is_live(name)]
+        pending = [name for name in changes if not BotConfig.is_live(name)]
+        embed = (
+            EmbedBuilder()
+            .set_title("Reload config", emoji="🔄")
+            .set_description(
+                f"เปลี่ยน {len(changes)} ค่า" if changes else "ไม่มีค่าที่เปลี่ยน"
+            )
+            .set_color("warning" if pending else "success")
+        )
+        if applied:
+            embed.add_field(
+                "มีผลทันที",
+                "\n".join(
+                    f"`{name}`: {changes[name][0]!r} → {changes[name][1]!r}" for name in applied
+                )[:1024],
+                emoji="✅",
+                inline=False,
+            )
+        if pending:
+            embed.add_field(
+                "ต้องรีสตาร์ท", "\n".join(f"`{name}`" for name in pending)[:1024],
+                emoji="⏳", inline=False,
+            )
+        await interaction.followup.send(embed=embed.build(), ephemeral=True)
+
+    async def _handle_logs(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        pattern: Optional[str],
+        level: str,
+        value: Optional[str],
+    ) -> None:
+        """จัดการคำสั่ง logs"""
+        sampler = self.bot.log_sampler
+        levelno = logging.getLevelName(level)
+
+        if action in ("sample", "limit") and (not pattern or not value):
+            raise UserError(f"`{action}` ต้องระบุ pattern และ value")
+        if action == "sample":
+            if not value.isdigit():
+                raise UserError("value ของ sample ต้องเป็นจำนวนเต็ม N (เก็บ 1 ใน N)")
+            sampler.set_sampling(pattern, levelno, int(value))
+            summary = f"เก็บ log 1 ใน {value} รายการของ `{pattern}` ที่ระดับ {level} ลงไป"
+        elif action == "limit":
+            limit, per = sampler.parse_limit(value)
+            sampler.set_rate_limit(pattern, levelno, limit, per)
+            summary = (
+                f"`{pattern}` ที่ระดับ {level} ลงไป: ไม่เกิน {limit} ครั้งต่อข้อความต่อ {per:g}s"
+            )
+        elif action == "clear":
+            removed = sampler.clear(pattern)
+            summary = f"ลบกฎ {removed} รายการ"
+        elif action == "show":
+            summary = None
+        else:
+            raise ValueError("action ต้องเป็น show, sample, limit หรือ clear")
+
+        if summary:
+            logger.info(f"🪵 {interaction.user}: {summary}")
+
+        snapshot = sampler.snapshot()
+        sampling = "\n".join(
+            f"`{rule}` ทิ้ง {counts['dropped']:,}/{counts['seen']:,}"
+            for rule, counts in snapshot["sampling"].items()
+        )
+        limits = "\n".join(
+            f"`{rule}` ทิ้ง {counts['dropped']:,} ({counts['keys']:,} ข้อความ)"
+            for rule, counts in snapshot["rate_limits"].items()
+        )
+        embed = (
+            EmbedBuilder()
+            .set_title("Log sampling", emoji="🪵")
+            .set_description(summary or "กฎที่ใช้อยู่ (กฎที่ pattern ยาวที่สุดมีผล)")
+            .add_field("Sampling", sampling[:1024] or "ไม่มี", emoji="🎲", inline=False)
+            .add_field("Rate limit", limits[:1024] or "ไม่มี", emoji="🚦", inline=False)
+            .set_color("success" if summary else "info")
+            .build()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     async def _handle_status(self, interaction: discord.Interaction) -> None:
         """จัดการคำสั่ง status"""
@@ -417,8 +952,15 @@ class DevTools(commands.GroupCog, group_name="dev"):
     async def _check_dev_permission(self, interaction: discord.Interaction) -> bool:
         """ตรวจสอบสิทธิ์ dev"""
         try:
-            if not await self.bot.is_owner(interaction.user):
-                raise PermissionError("คำสั่งนี้ใช้ได้เฉพาะ developer เท่านั้น")
+            user = interaction.user
+            is_dev = await self._dev_cache.get_or_load(
+                user.id, lambda: self.bot.is_owner(user)
+            )
+            if not is_dev:
+                raise PermissionError(
+                    "คำสั่งนี้ใช้ได้เฉพาะ developer เท่านั้น",
+                    missing_perms=["developer"],
+                )
             return True
         except Exception as e:
             await self.handle_error(interaction, e)
@@ -442,13 +984,37 @@ class DevTools(commands.GroupCog, group_name="dev"):
                     name="ข้อมูลบอท",
                     value=f"```\n"
                     f"โหมด: {'Development' if self.bot.dev_mode else 'Production'}\n"
-                    f"เซิร์ฟเวอร์: {len(self.bot.guilds)}\n"
+                    f"{self.bot.guild_stats.format_summary()}\n"
                     f"คำสั่ง: {len(self.bot.tree.get_commands())}\n"
                     f"เวลาทำงาน: {uptime_text}\n"
                     f"```",
                     emoji=self.ui.EMOJI["dev"],
                     inline=False
                 )
+                .add_field(
+                    name="ทรัพยากร (แนวโน้ม 5 นาที)",
+                    value=f"```\n{self.bot.resource_sampler.format_summary()}\n```",
+                    emoji=self.ui.EMOJI["stats"],
+                    inline=False
+                )
+                .add_field(
+                    name="Offload",
+                    value=f"```\n{self.bot.offload.format_summary()}\n```",
+                    emoji=self.ui.EMOJI["tools"],
+                    inline=False
+                )
+                .add_field(
+                    name="Cache",
+                    value=f"```\n{self._dev_cache.format_summary()}\n```",
+                    emoji=self.ui.EMOJI["stats"],
+                    inline=False
+                )
+                .add_field(
+                    name="Rate Limits",
+                    value=f"```\n{self.bot.ratelimits.format_summary()}\n```",
+                    emoji=self.ui.EMOJI["refresh"],
+                    inline=False
+                )
                 .set_footer(
                     text="Dev Tools",
                     emoji=self.ui.EMOJI["tools"]
@@ -457,9 +1023,16 @@ class DevTools(commands.GroupCog, group_name="dev"):
                 .build()
             )
         except Exception as e:
-            self.logger.error(f"Error creating status embed: {e}")
+            logger.error(f"Error creating status embed: {e}")
             return self._create_error_embed(str(e))
 
+    def _calculate_uptime(self) -> Optional[timedelta]:
+        """คำนวณเวลาทำงานของบอท"""
+        start_time = getattr(self.bot, "start_time", None)
+        if start_time is None:
+            return None
+        return timedelta(seconds=time.time() - start_time)
+
     def _create_error_embed(self, error_message: str) -> discord.Embed:
         """สร้าง embed สำหรับแสดงข้อผิดพลาด"""
         return (
@@ -474,23 +1047,6 @@ class DevTools(commands.GroupCog, group_name="dev"):
             .build()
         )
 
-    async def _get_bot_process_info(self) -> Dict[str, Any]:
-        """รวบรวมข้อมูลการทำงานของบอท"""
-        try:
-            with self.process.oneshot():
-                cpu_percent = self.process.cpu_percent()
-                memory_info = self.process.memory_info()
-                threads = self.process.num_threads()
-
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_mb": memory_info.rss / 1024 / 1024,
-                "threads": threads
-            }
-        except Exception as e:
-            self.logger.error(f"Error getting process info: {e}")
-            return {}
-
     @commands.Cog.listener()
     async def on_ready(self):
         """เมื่อบอทพร้อมใช้งาน"""
@@ -502,28 +1058,37 @@ class DevTools(commands.GroupCog, group_name="dev"):
         """จัดการเมื่อมีการใช้งาน interaction"""
         if interaction.command:
             self.bot.stats["commands_used"] += 1
-            self._dev_cache.clear_expired()
 
     @commands.Cog.listener()
-    async def on_guild_join(self, guild: discord.Guild):
-        """จัดการเมื่อบอทถูกเชิญเข้า guild ใหม่"""
-        if self.bot.dev_mode:
-            dev_guild_id = os.getenv("DEV_GUILD_ID")
-            if str(guild.id) != dev_guild_id:
-                logger.warning(f"🚫 Leaving non-dev guild in dev mode: {guild.name}")
-                await guild.leave()
-                return
-        logger.info(f"✅ Joined guild: {guild.name} (ID: {guild.id})")
+    async def on_command_recorded(self, record: AuditRecord):
+        """เก็บประวัติการใช้คำสั่งล่าสุดไว้ใน memory"""
+        self._history.add(
+            record.user_id,
+            record.command,
+            record.outcome == Outcome.SUCCESS,
+            guild_id=record.guild_id or None,
+            timestamp=record.timestamp,
+        )
+
+    def export_state(self) -> dict:
+        """ส่งออก state ก่อน reload (cache และประวัติจะถูกส่งต่อโดยไม่ต้อง copy)"""
+        return {
+            "dev_cache": self._dev_cache,
+            "history": self._history,
+            "last_sync": self._last_sync,
+            "ready": self._ready,
+        }
+
+    def import_state(self, state: dict) -> None:
+        """รับ state จาก cog เดิมหลัง reload"""
+        self._dev_cache = state.get("dev_cache", self._dev_cache)
+        self._history = state.get("history", self._history)
+        self._last_sync = state.get("last_sync", self._last_sync)
+        self._ready = state.get("ready", self._ready)
 
     async def cog_unload(self):
-        """เรียกใช้เมื่อ Cog ถูก unload"""
-        try:
-            logger.info("💾 Saving important data before unload...")
-            self._dev_cache.clear()
-            self._history.clear()
-            logger.info("👋 DevTools cog unloaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Error during cog unload: {e}")
+        """เรียกใช้เมื่อ Cog ถูก unload (state ถูกส่งต่อผ่าน export_state)"""
+        logger.info("👋 DevTools cog unloaded successfully")
 
 
 async def setup(bot):
@@ -4,6 +4,8 @@ from discord.ext import commands
 import logging
 from datetime import datetime
 from typing import Optional
+from ..utils.async_cache import AsyncTTLCache
+from ..utils.decorators import profiled
 from ..utils.embed_builder import EmbedBuilder
 
 logger = logging.getLogger(__name__)
@@ -23,9 +25,22 @@ class EventHandler(commands.Cog):
             bot: Discord bot instance
         """
         self.bot = bot
+        # guild_id -> channel_id ของช่องทางที่ใช้ส่งข้อความต้อนรับ
+        # (ไม่ cache ผลว่า "ไม่มี" เพราะบอทอาจได้สิทธิ์ส่งข้อความจาก role ภายหลัง)
+        self._channel_cache: AsyncTTLCache[int, int] = AsyncTTLCache(
+            maxsize=10_000, ttl=600, name="welcome_channels"
+        )
         self._setup_constants()
         logger.info("✅ โหลด Event Handler สำเร็จ")
 
+    def export_state(self) -> dict:
+        """ส่งออก state ก่อน reload"""
+        return {"channel_cache": self._channel_cache}
+
+    def import_state(self, state: dict) -> None:
+        """รับ state จาก cog เดิมหลัง reload"""
+        self._channel_cache = state.get("channel_cache", self._channel_cache)
+
     def _setup_constants(self):
         """ตั้งค่าค่าคงที่สำหรับ event handler"""
         self.ERROR_MESSAGES = {
@@ -37,6 +52,7 @@ class EventHandler(commands.Cog):
         }
 
     @commands.Cog.listener()
+    @profiled()
     async def on_guild_join(self, guild: discord.Guild):
         """
         จัดการเมื่อ bot เข้าร่วมเซิร์ฟเวอร์ใหม่
@@ -44,24 +60,27 @@ class EventHandler(commands.Cog):
         Args:
             guild: Discord guild ที่ bot เข้าร่วม
         """
-        # ตรวจสอบ Dev Mode ก่อน
-        if await self.bot.handle_dev_mode(guild):
+        # MyBot.on_guild_join ออกจาก guild ที่ไม่ใช่ Dev Guild ให้แล้ว
+        if not self.bot.is_allowed_guild(guild):
             return
             
         logger.info(f"🎉 เข้าร่วมเซิร์ฟเวอร์: {guild.name} (ID: {guild.id})")
 
         # สร้าง embed แจ้งเตือน
-        embed = (
-            EmbedBuilder()
+        template = EmbedBuilder.template(
+            "guild_join",
+            lambda builder: builder
             .set_title("ขอบคุณที่เชิญบอทเข้าร่วมเซิร์ฟเวอร์", emoji="👋")
             .set_description("บอทพร้อมใช้งานแล้ว! ใช้คำสั่ง /help เพื่อดูคำสั่งทั้งหมด")
             .set_color("success")
-            .add_field("เซิร์ฟเวอร์", guild.name, emoji="🏢")
-            .add_field("สมาชิก", str(guild.member_count), emoji="👥")
-            .add_field("เจ้าของเซิร์ฟเวอร์", str(guild.owner), emoji="👑")
+            .add_field("เซิร์ฟเวอร์", "{guild}", emoji="🏢")
+            .add_field("สมาชิก", "{members}", emoji="👥")
+            .add_field("เจ้าของเซิร์ฟเวอร์", "{owner}", emoji="👑")
             .set_footer("Discord Bot", emoji="🤖")
-            .set_timestamp()
-            .build()
+            .set_timestamp(),
+        )
+        embed = template.render(
+            guild=guild.name, members=guild.member_count, owner=guild.owner
         )
 
         # ส่ง embed ไปยังช่องทางหลัก
@@ -78,7 +97,7 @@ class EventHandler(commands.Cog):
         self, guild: discord.Guild
     ) -> Optional[discord.TextChannel]:
         """
-        ค้นหาช่องทางที่เหมาะสมสำหรับส่งข้อความ
+        ค้นหาช่องทางที่เหมาะสมสำหรับส่งข้อความ (ใช้ผลจาก cache ถ้ามี)
 
         Args:
             guild: Discord guild ที่ต้องการค้นหาช่องทาง
@@ -86,6 +105,29 @@ class EventHandler(commands.Cog):
         Returns:
             Optional[discord.TextChannel]: ช่องทางที่เหมาะสม หรือ None ถ้าไม่พบ
         """
+        async def load() -> int:
+            channel = self._scan_suitable_channel(guild)
+            return channel.id if channel else 0
+
+        channel_id = await self._channel_cache.get_or_load(guild.id, load)
+        if not channel_id:
+            self._channel_cache.invalidate(guild.id)
+            return None
+
+        channel = guild.get_channel(channel_id)
+        if channel is None or not channel.permissions_for(guild.me).send_messages:
+            # ช่องทางใน cache ใช้ไม่ได้แล้ว ค้นหาใหม่
+            self._channel_cache.invalidate(guild.id)
+            channel = self._scan_suitable_channel(guild)
+            if channel is not None:
+                self._channel_cache.set(guild.id, channel.id)
+
+        return channel
+
+    def _scan_suitable_channel(
+        self, guild: discord.Guild
+    ) -> Optional[discord.TextChannel]:
+        """ไล่หาช่องทางที่เหมาะสมจากทุกช่องทางใน guild"""
         # ลองหาช่องทางชื่อ general ก่อน
         general_channel = discord.utils.get(guild.text_channels, name="general")
         if general_channel:
@@ -99,6 +141,25 @@ class EventHandler(commands.Cog):
         return None
 
     @commands.Cog.listener()
+    @profiled()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._channel_cache.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    @profiled()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._channel_cache.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    @profiled()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        if before.name != after.name or before.overwrites != after.overwrites:
+            self._channel_cache.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    @profiled()
     async def on_guild_remove(self, guild: discord.Guild):
         """
         จัดการเมื่อ bot ถูกลบออกจากเซิร์ฟเวอร์
@@ -106,15 +167,18 @@ class EventHandler(commands.Cog):
         Args:
             guild: Discord guild ที่ bot ถูกลบออก
         """
+        self._channel_cache.invalidate(guild.id)
         logger.info(f"👋 ออกจากเซิร์ฟเวอร์: {guild.name} (ID: {guild.id})")
 
     @commands.Cog.listener()
+    @profiled()
     async def on_command_error(
         self, ctx: commands.Context, error: commands.CommandError
     ):
         await self.bot.error_handler.handle_error(ctx, error)
 
     @commands.Cog.listener()
+    @profiled()
     async def on_member_join(self, member: discord.Member):
         """จัดการเมื่อมีสมาชิกเข้าร่วมเซิร์ฟเวอร์"""
         try:
@@ -138,6 +202,7 @@ class EventHandler(commands.Cog):
             logger.error(f"❌ เกิดข้อผิดพลาดในการส่งข้อความต้อนรับ: {str(e)}")
 
     @commands.Cog.listener()
+    @profiled()
     async def on_message(self, message: discord.Message):
         """จัดการเมื่อมีข้อความใหม่"""
         if message.author.bot or not message.guild:
@@ -26,6 +26,11 @@ class BaseCommand(ABC):
     def _setup_logger(self) -> None:
         """ตั้งค่า logger สำหรับคำสั่ง"""
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        # logger ถูกแชร์ข้ามการ reload จึงต้องไม่เพิ่ม handler ซ้ำ
+        if self.logger.handlers:
+            return
+
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
@@ -33,6 +38,24 @@ class BaseCommand(ABC):
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
 
+    def export_state(self) -> Dict[str, Any]:
+        """
+        ส่งออก state ของคำสั่งก่อน reload
+
+        Returns:
+            Dict[str, Any]: state ที่ต้องการส่งต่อให้ instance ใหม่
+        """
+        return {}
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """
+        รับ state จาก instance เดิมหลัง reload
+
+        Args:
+            state: state ที่ได้จาก export_state
+        """
+        pass
+
     @abstractmethod
     async def execute(
         self, interaction: discord.Interaction, *args: Any, **kwargs: Any
@@ -5,6 +5,7 @@ from discord import app_commands
 import logging
 from datetime import datetime
 from src.commands.base_command import BaseCommand
+from src.utils.decorators import profiled
 from src.utils.embed_builder import EmbedBuilder  # แก้ path import
 
 logger = logging.getLogger(__name__)
@@ -57,11 +58,28 @@ class HelpCommand(BaseCommand):
                 "category": "เกม",
                 "examples": [
                     "ทอยลูกเต๋า 1-6: /roll",
-                    "ลุ้นดวงของคุณ!",
+                    "ทอย 4 ลูกเก็บ 3 ลูกสูงสุด: /roll 4d6kh3",
+                    "ทอยพร้อมโบนัส: /roll 1d20+5",
+                    "ลูกเต๋าระเบิด: /roll 2d10!",
+                    "โอกาสได้อย่างน้อย 15 จาก 3d6: /dice odds 3d6 15",
+                    "สถิติการทอยของคุณ: /dice stats",
+                    "อันดับดวงดีในเซิร์ฟเวอร์: /dice leaderboard luck",
                 ],
                 "cooldown": 3,
                 "dev_only": False,
-                "description": "ทอยลูกเต๋าสุ่มตัวเลข"
+                "description": "ทอยลูกเต๋าตามนิพจน์ (NdS, kh/kl, dh/dl, !, +/-) คำนวณโอกาส และดูสถิติ/อันดับในเซิร์ฟเวอร์"
+            },
+            "dice": {
+                "emoji": "📊",
+                "category": "เกม",
+                "examples": [
+                    "โอกาสได้อย่างน้อย 15 จาก 3d6: /dice odds 3d6 15",
+                    "สถิติการทอยของคุณ: /dice stats",
+                    "อันดับดวงดีในเซิร์ฟเวอร์: /dice leaderboard luck",
+                ],
+                "cooldown": None,
+                "dev_only": False,
+                "description": "คำนวณโอกาสของนิพจน์ลูกเต๋า และดูสถิติ/อันดับการทอยในเซิร์ฟเวอร์"
             },
             "help": {
                 "emoji": "❓",
@@ -73,6 +91,14 @@ class HelpCommand(BaseCommand):
                 "cooldown": None,
                 "dev_only": False,
                 "description": "แสดงวิธีใช้งานคำสั่งต่างๆ"
+            },
+            "dev": {
+                "emoji": "🛠️",
+                "category": "พัฒนา",
+                "examples": ["ดูคำสั่ง Developer ทั้งหมด: /dev help"],
+                "cooldown": None,
+                "dev_only": True,
+                "description": "คำสั่งสำหรับจัดการระบบ"
             }
         }
 
@@ -111,6 +137,7 @@ class HelpCommand(BaseCommand):
             
         return choices
 
+    @profiled()
     async def execute(
         self,
         interaction: discord.Interaction,
@@ -214,46 +241,53 @@ class HelpCommand(BaseCommand):
 
         return builder.build()
 
+    def _group_commands_by_category(self) -> Dict[str, List[app_commands.Command]]:
+        """จัดกลุ่มคำสั่งใน CommandTree ตามหมวดหมู่ (เรียงตามลำดับของ self.categories)"""
+        grouped: Dict[str, List[app_commands.Command]] = {}
+        for command in self._filter_commands(self.bot.tree.get_commands()):
+            category = self.command_info.get(command.name, {}).get("category", "ทั่วไป")
+            grouped.setdefault(category, []).append(command)
+        order = list(self.categories)
+        return dict(
+            sorted(
+                grouped.items(),
+                key=lambda item: order.index(item[0]) if item[0] in order else len(order),
+            )
+        )
+
     async def _create_commands_overview_embed(self) -> discord.Embed:
-        """สร้าง embed สำหรับภาพรวมคำสั่งทั้งหมด"""
+        """สร้าง embed สำหรับภาพรวมคำสั่งทั้งหมด (template เปลี่ยนเมื่อรายการคำสั่งเปลี่ยน)"""
         commands_by_category = self._group_commands_by_category()
-        
-        builder = EmbedBuilder()
-        builder.set_title(
-            "คู่มือการใช้งานคำสั่ง",
-            emoji=self.ui.EMOJI["help"]
+        sections = tuple(
+            (category, tuple((cmd.name, cmd.description) for cmd in commands))
+            for category, commands in commands_by_category.items()
         )
-        builder.set_color(self.ui.COLORS["info"])
-        builder.set_description("รายการคำสั่งทั้งหมด แยกตามหมวดหมู่")
-
-        # เพิ่มแต่ละหมวดหมู่
-        for category, commands in commands_by_category.items():
-            category_emoji = self.ui.EMOJI.get(
-                category.lower(),
-                self.ui.EMOJI["commands"]
-            )
-            field_value = "\n".join(
-                f"`/{cmd.name}` - {cmd.description}"
-                for cmd in commands
-            )
-            builder.add_field(
-                name=f"{category}",
-                value=field_value,
-                emoji=category_emoji,
-                inline=False
-            )
 
-        # เพิ่ม footer
-        total_commands = sum(len(cmds) for cmds in commands_by_category.values())
-        builder.set_footer(
-            text=(
-                f"พิมพ์ /help [ชื่อคำสั่ง] เพื่อดูรายละเอียดเพิ่มเติม • "
-                f"มีทั้งหมด {total_commands} คำสั่ง"
-            ),
-            emoji=self.ui.EMOJI["info"]
-        )
+        def build(builder: EmbedBuilder) -> EmbedBuilder:
+            builder.set_title("คู่มือการใช้งานคำสั่ง", emoji=self.ui.EMOJI["help"])
+            builder.set_color(self.ui.COLORS["info"])
+            builder.set_description("รายการคำสั่งทั้งหมด แยกตามหมวดหมู่")
+
+            # เพิ่มแต่ละหมวดหมู่
+            for category, commands in sections:
+                category_emoji = self.categories.get(category, self.ui.EMOJI["commands"])
+                builder.add_field(
+                    name=category,
+                    value="\n".join(f"`/{name}` - {description}" for name, description in commands),
+                    emoji=category_emoji,
+                    inline=False,
+                )
 
-        return builder.build()
+            total_commands = sum(len(commands) for _, commands in sections)
+            return builder.set_footer(
+                text=(
+                    f"พิมพ์ /help [ชื่อคำสั่ง] เพื่อดูรายละเอียดเพิ่มเติม • "
+                    f"มีทั้งหมด {total_commands} คำสั่ง"
+                ),
+                emoji=self.ui.EMOJI["info"],
+            )
+
+        return EmbedBuilder.template(("help_overview", sections), build).render()
 
     def _get_command_examples(self, command_name: str) -> List[str]:
         """ดึงตัวอย่างการใช้งานของคำสั่ง"""
@@ -6,6 +6,7 @@ from typing import Dict, Optional
 import discord
 import logging
 from src.commands.base_command import BaseCommand
+from src.utils.decorators import profiled
 from src.utils.embed_builder import EmbedBuilder  # แก้ path import
 
 logger = logging.getLogger(__name__)
@@ -46,19 +47,19 @@ class PingCommand(BaseCommand):
         self._setup_thresholds()
 
     def _setup_thresholds(self) -> None:
-        """กำหนดเกณฑ์การประเมินความเร็วในการตอบสนอง"""
-        self.LATENCY_THRESHOLDS = {
-            100: StatusInfo(
+        """กำหนดสถานะของแต่ละระดับความเร็ว (เกณฑ์ ms อ่านจาก bot.config ตอนใช้งาน)"""
+        self.LATENCY_STATUS = {
+            "good": StatusInfo(
                 status="success",
                 emoji=self.ui.EMOJI["success"],
                 description="การเชื่อมต่อดีมาก"
             ),
-            200: StatusInfo(
+            "fair": StatusInfo(
                 status="warning",
                 emoji=self.ui.EMOJI["warning"],
                 description="การเชื่อมต่อปานกลาง"
             ),
-            float("inf"): StatusInfo(
+            "slow": StatusInfo(
                 status="error",
                 emoji=self.ui.EMOJI["error"],
                 description="การเชื่อมต่อช้า"
@@ -66,12 +67,15 @@ class PingCommand(BaseCommand):
         }
 
     def _get_status_info(self, latency: int) -> StatusInfo:
-        """ประเมินสถานะการเชื่อมต่อ"""
-        for threshold, info in self.LATENCY_THRESHOLDS.items():
-            if latency <= threshold:
-                return info
-        return self.LATENCY_THRESHOLDS[float("inf")]
-
+        """ประเมินสถานะการเชื่อมต่อตาม PING_GOOD_MS / PING_SLOW_MS"""
+        config = self.bot.config
+        if latency <= config.ping_good_ms:
+            return self.LATENCY_STATUS["good"]
+        if latency <= config.ping_slow_ms:
+            return self.LATENCY_STATUS["fair"]
+        return self.LATENCY_STATUS["slow"]
+
+    @profiled()
     async def execute(
         self,
         interaction: discord.Interaction,
@@ -90,9 +94,14 @@ class PingCommand(BaseCommand):
             command_stats["ping"] += 1
             latency = round(self.bot.latency * 1000)
 
+            # ประเมินสถานะจากค่ากลางช่วง 5 นาทีล่าสุด heartbeat ที่ช้าครั้งเดียวจะไม่ทำให้เป็นสีแดง
+            typical = self.bot.latency_monitor.heartbeat_median(300)
+            status_latency = latency if typical is None else round(typical)
+
             # สร้างและส่ง embed ด้วย EmbedBuilder
             embed = await self._create_response_embed(
                 latency=latency,
+                status_latency=status_latency,
                 user=interaction.user,
                 bot_start_time=bot_start_time,
                 stats=self._collect_system_stats(command_stats),
@@ -127,8 +136,8 @@ class PingCommand(BaseCommand):
     def _collect_system_stats(self, command_stats: Dict[str, int]) -> SystemStats:
         """รวบรวมสถิติของระบบ"""
         return SystemStats(
-            guild_count=len(self.bot.guilds),
-            member_count=sum(g.member_count for g in self.bot.guilds),
+            guild_count=self.bot.guild_stats.guild_count,
+            member_count=self.bot.guild_stats.member_count,
             total_commands=sum(command_stats.values()),
             command_stats=command_stats,
         )
@@ -140,12 +149,13 @@ class PingCommand(BaseCommand):
     async def _create_response_embed(
         self,
         latency: int,
+        status_latency: int,
         user: discord.User,
         bot_start_time: datetime,
         stats: SystemStats,
     ) -> discord.Embed:
         """สร้าง embed สำหรับการตอบกลับ"""
-        status_info = self._get_status_info(latency)
+        status_info = self._get_status_info(status_latency)
         uptime = self._format_uptime(bot_start_time)
 
         return (
@@ -171,6 +181,12 @@ class PingCommand(BaseCommand):
                 emoji=self.ui.EMOJI["time"],
                 inline=True
             )
+            .add_field(
+                name="ย้อนหลัง 1 ชั่วโมง (min/avg/p95)",
+                value=f"```\n{self.bot.latency_monitor.format_summary()}\n```",
+                emoji=self.ui.EMOJI["time"],
+                inline=False
+            )
             .add_field(
                 name="สถิติการใช้งาน",
                 value=stats.format_stats(),
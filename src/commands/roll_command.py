@@ -1,53 +1,451 @@
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional
 import discord
-import random
 import logging
 from .base_command import BaseCommand
+from src.utils import dice_odds
+from src.utils.async_cache import AsyncTTLCache
+from src.utils.decorators import profiled
+from src.utils.dice import (
+    DiceExpression,
+    DiceTerm,
+    RollResult,
+    TermResult,
+    compile_expression,
+)
+from src.utils.dice_odds import Distribution
 from src.utils.embed_builder import EmbedBuilder
+from src.utils.exceptions import UserError
+from src.utils.latency_monitor import render_sparkline
+from src.utils.roll_stats import MIN_LUCK_ROLLS, GuildRollStats, UserRollStats
 
 logger = logging.getLogger(__name__)
 
+# เวลาสูงสุดที่รอการทอยนิพจน์ขนาดใหญ่ (วินาที)
+LARGE_ROLL_TIMEOUT = 15
+# เวลาสูงสุดที่รอการคำนวณตารางโอกาส (วินาที)
+ODDS_TIMEOUT = 30
+
+# ชื่อเงื่อนไขของ /dice odds -> (สัญลักษณ์, ฟังก์ชันคำนวณโอกาส)
+ODDS_COMPARISONS: Dict[str, Any] = {
+    "at_least": ("≥", Distribution.at_least),
+    "at_most": ("≤", Distribution.at_most),
+    "exactly": ("=", Distribution.exactly),
+}
+
+# leaderboard ของ /dice leaderboard -> (ชื่อ, emoji)
+LEADERBOARDS: Dict[str, Any] = {
+    "rolls": ("ทอยบ่อยที่สุด", "🎲"),
+    "max_rolls": ("ทอยได้ผลสูงสุดบ่อยที่สุด", "🎯"),
+    "luck": ("ดวงดีที่สุด", "🍀"),
+}
+LEADERBOARD_SIZE = 10
+MEDALS = ["🥇", "🥈", "🥉"]
+
+
 class RollCommand(BaseCommand):
-    """คำสั่งสำหรับทอยลูกเต๋า"""
+    """คำสั่งสำหรับทอยลูกเต๋าและคำนวณโอกาส"""
+
+    def __init__(self, bot):
+        super().__init__(bot)
+        # ตารางการแจกแจง ต่อ (จำนวน, หน้า, modifiers) และต่อนิพจน์
+        # ค่าไม่เปลี่ยนตามเวลา TTL จึงยาว ขนาดจำกัดด้วย LRU
+        self._odds_cache: AsyncTTLCache[Any, Distribution] = AsyncTTLCache(
+            maxsize=256, ttl=24 * 3600, name="dice_odds"
+        )
 
+    def export_state(self) -> Dict[str, Any]:
+        return {"odds_cache": self._odds_cache}
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        self._odds_cache = state.get("odds_cache", self._odds_cache)
+
+    @profiled()
     async def execute(
         self,
         interaction: discord.Interaction,
-        stats: Dict[str, int]
+        stats: Dict[str, int],
+        expression: str = "1d6",
     ) -> None:
-        """ดำเนินการคำสั่งทอยลูกเต๋า"""
+        """
+        ดำเนินการคำสั่งทอยลูกเต๋า
+
+        Args:
+            interaction: Discord interaction object
+            stats: สถิติการใช้คำสั่งต่างๆ
+            expression: นิพจน์ลูกเต๋า เช่น 4d6kh3, 100d20+5, 2d10!
+        """
         try:
-            # ทอยลูกเต๋า
-            roll = random.randint(1, 6)
-            is_max = roll == 6
-            
-            # อัพเดทสถิติ
-            stats["roll"] = stats.get("roll", 0) + 1
-            
-            # สร้าง embed
-            if is_max:
-                embed = (
-                    EmbedBuilder()
-                    .set_title("ทอยได้เลขสูงสุด!", emoji="🎯")
-                    .set_description(f"คุณทอยได้ **{roll}** !")
-                    .set_color("success")
-                    .set_footer(f"ทอยโดย {interaction.user.display_name}", emoji="🎲")
-                    .build()
+            compiled = compile_expression(expression)
+
+            # นิพจน์ใหญ่ทอยใน process pool เพื่อไม่ให้บล็อก event loop
+            if compiled.is_large:
+                await interaction.response.defer(thinking=True)
+                result = await self.bot.run_blocking(
+                    compiled.evaluate, timeout=LARGE_ROLL_TIMEOUT, process=True
                 )
             else:
-                embed = (
-                    EmbedBuilder()
-                    .set_title("ผลการทอยลูกเต๋า", emoji="🎲")
-                    .set_description(f"คุณทอยได้ {roll}")
-                    .set_color("primary")
-                    .set_footer(f"ทอยโดย {interaction.user.display_name}", emoji="🎲")
-                    .build()
-                )
+                result = compiled.evaluate()
+
+            # อัพเดทสถิติ
+            stats["roll"] = stats.get("roll", 0) + 1
 
-            # ส่งผลลัพธ์
-            await interaction.response.send_message(embed=embed)
-            logger.debug(f"🎲 ผู้ใช้ {interaction.user} ทอยได้ {roll}")
+            embed = self._create_result_embed(result, interaction.user)
+            await self._safe_respond(interaction, embed=embed)
+            logger.debug(
+                f"🎲 ผู้ใช้ {interaction.user} ทอย {compiled.text} ได้ {result.total}"
+            )
+            await self._record_stats(interaction, result)
 
         except Exception as e:
             logger.error(f"❌ เกิดข้อผิดพลาดในคำสั่ง roll: {str(e)}")
-            await self.handle_error(interaction, e)
\ No newline at end of file
+            await self.handle_error(interaction, e)
+
+    async def _record_stats(
+        self, interaction: discord.Interaction, result: RollResult
+    ) -> None:
+        """บันทึกสถิติต่อ guild (ตอบผู้ใช้ไปแล้ว ข้อผิดพลาดจึงแค่บันทึก log)"""
+        if interaction.guild_id is None:
+            return
+        try:
+            await self.bot.roll_stats.record(
+                interaction.guild_id, interaction.user.id, result
+            )
+        except Exception as e:
+            logger.error(f"❌ บันทึกสถิติการทอยไม่สำเร็จ: {e}")
+
+    def _create_result_embed(
+        self, result: RollResult, user: discord.abc.User
+    ) -> discord.Embed:
+        """สร้าง embed แสดงผลการทอย"""
+        builder = EmbedBuilder()
+        if result.is_max:
+            builder.set_title("ทอยได้เลขสูงสุด!", emoji="🎯").set_color("success")
+        else:
+            builder.set_title("ผลการทอยลูกเต๋า", emoji="🎲").set_color("primary")
+
+        lines = [f"`{result.expression.text}` = **{result.total:,}**"]
+        lines.extend(self._format_terms(result))
+        description = "\n".join(lines)
+        if len(description) > 4096:  # ขีดจำกัดของ Discord
+            description = description[:4093] + "..."
+
+        return (
+            builder.set_description(description)
+            .set_footer(f"ทอยโดย {user.display_name}", emoji="🎲")
+            .build()
+        )
+
+    def _format_terms(self, result: RollResult) -> List[str]:
+        """แสดงรายละเอียดของแต่ละกลุ่มลูกเต๋า"""
+        dice_terms = [r for r in result.terms if isinstance(r.term, DiceTerm)]
+        # ลูกเต๋าลูกเดียวไม่ต้องแสดงรายละเอียดซ้ำ
+        if len(dice_terms) == 1 and dice_terms[0].term.count == 1 and len(result.terms) == 1:
+            return []
+        return [self._format_term(r) for r in dice_terms]
+
+    @staticmethod
+    def _format_term(term_result: TermResult) -> str:
+        term = term_result.term
+        sign = "-" if term.sign < 0 else ""
+        if term_result.rolls is not None:
+            rolls = ", ".join(
+                str(value) if kept else f"~~{value}~~"
+                for value, kept in zip(term_result.rolls, term_result.kept)
+            )
+            return f"{sign}{term.notation}: [{rolls}] → {abs(term_result.value):,}"
+
+        s = term_result.stats
+        text = (
+            f"{sign}{term.notation}: {abs(term_result.value):,} "
+            f"(เฉลี่ย {s.mean:.2f}, SD {s.stdev:.2f}, ต่ำสุด {s.minimum}, "
+            f"สูงสุด {s.maximum:,}, หน้าสูงสุด {s.max_hits:,} ครั้ง"
+        )
+        if s.explosions:
+            text += f", ระเบิด {s.explosions:,} ครั้ง"
+        return text + ")"
+
+    @profiled()
+    async def odds(
+        self,
+        interaction: discord.Interaction,
+        expression: str,
+        target: int,
+        comparison: str = "at_least",
+    ) -> None:
+        """
+        คำนวณโอกาสที่ผลรวมของนิพจน์จะเป็นไปตามเงื่อนไข (แบบ exact)
+
+        Args:
+            interaction: Discord interaction object
+            expression: นิพจน์ลูกเต๋า เช่น 3d6
+            target: ค่าเป้าหมาย
+            comparison: at_least, at_most หรือ exactly
+        """
+        try:
+            compiled = compile_expression(expression)
+            dice_odds.validate(compiled)
+
+            # ตารางที่ต้องคำนวณใหม่และใหญ่อาจใช้เวลาหลายวินาที
+            if compiled.text not in self._odds_cache and self._is_heavy(compiled):
+                await interaction.response.defer(thinking=True)
+
+            distribution = await self._odds_cache.get_or_load(
+                compiled.text, lambda: self._expression_distribution(compiled)
+            )
+
+            symbol, probability_of = ODDS_COMPARISONS[comparison]
+            probability = probability_of(distribution, target)
+            embed = self._create_odds_embed(
+                compiled, distribution, f"{symbol} {target:,}", probability
+            )
+            await self._safe_respond(interaction, embed=embed)
+            logger.debug(
+                f"📊 ผู้ใช้ {interaction.user} คำนวณโอกาส {compiled.text} "
+                f"{symbol} {target}: {probability:.6f}"
+            )
+
+        except Exception as e:
+            logger.error(f"❌ เกิดข้อผิดพลาดในคำสั่ง dice odds: {str(e)}")
+            await self.handle_error(interaction, e)
+
+    @staticmethod
+    def _is_heavy(compiled: DiceExpression) -> bool:
+        return dice_odds.combine_cost(compiled) > dice_odds.INLINE_ODDS_COST or any(
+            dice_odds.term_cost(t) > dice_odds.INLINE_ODDS_COST
+            for t in compiled.terms
+            if isinstance(t, DiceTerm)
+        )
+
+    async def _compute(self, cost: int, func: Callable[..., Any], *args: Any) -> Any:
+        """คำนวณใน event loop ถ้างานเล็ก ถ้างานใหญ่ส่งไป process pool"""
+        if cost <= dice_odds.INLINE_ODDS_COST:
+            return func(*args)
+        return await self.bot.run_blocking(func, *args, timeout=ODDS_TIMEOUT, process=True)
+
+    async def _term_distribution(self, term: DiceTerm) -> Distribution:
+        key = (term.count, term.sides, term.keep, term.explode)
+        return await self._odds_cache.get_or_load(
+            key,
+            lambda: self._compute(
+                dice_odds.term_cost(term),
+                dice_odds.term_distribution,
+                term.count,
+                term.sides,
+                term.keep,
+                term.explode,
+            ),
+        )
+
+    async def _expression_distribution(self, compiled: DiceExpression) -> Distribution:
+        parts = [
+            (term.sign, await self._term_distribution(term))
+            for term in compiled.terms
+            if isinstance(term, DiceTerm)
+        ]
+        return await self._compute(
+            dice_odds.combine_cost(compiled),
+            dice_odds.combine,
+            parts,
+            dice_odds.constant_of(compiled),
+        )
+
+    @staticmethod
+    def _format_probability(probability: float) -> str:
+        if probability <= 0:
+            return "0%"
+        if probability >= 1:
+            return "100%"
+        if probability < 1e-4:
+            return f"{probability:.2e}"
+        return f"{probability * 100:.2f}%"
+
+    @staticmethod
+    def _distribution_chart(distribution: Distribution, width: int = 32) -> str:
+        """sparkline ของการแจกแจงโดยรวมค่าที่อยู่ติดกันเป็นช่วง"""
+        probs = distribution.probs
+        size = max(1, -(-len(probs) // width))
+        return render_sparkline(
+            [sum(probs[i:i + size]) for i in range(0, len(probs), size)]
+        )
+
+    def _create_odds_embed(
+        self,
+        compiled: DiceExpression,
+        distribution: Distribution,
+        condition: str,
+        probability: float,
+    ) -> discord.Embed:
+        """สร้าง embed แสดงโอกาส"""
+        description = (
+            f"`{compiled.text}` {condition}: **{self._format_probability(probability)}**"
+        )
+        if 0 < probability < 1:
+            description += f" (ประมาณ 1 ใน {1 / probability:,.1f})"
+
+        return (
+            EmbedBuilder()
+            .set_title("โอกาสการทอย", emoji="📊")
+            .set_description(description)
+            .set_color("primary")
+            .add_field(
+                name="การแจกแจง",
+                value=(
+                    f"```\n{self._distribution_chart(distribution)}\n"
+                    f"{distribution.minimum:,} … {distribution.maximum:,}\n```"
+                ),
+                emoji="📈",
+                inline=False,
+            )
+            .add_field(
+                name="ค่าเฉลี่ย",
+                value=f"{distribution.mean:,.2f}",
+                emoji="🎯",
+                inline=True,
+            )
+            .add_field(
+                name="ส่วนเบี่ยงเบนมาตรฐาน",
+                value=f"{distribution.stdev:,.2f}",
+                emoji="📏",
+                inline=True,
+            )
+            .set_footer("คำนวณแบบ exact จากการแจกแจงของผลรวม", emoji="🎲")
+            .build()
+        )
+
+    @profiled()
+    async def stats(
+        self,
+        interaction: discord.Interaction,
+        user: Optional[discord.abc.User] = None,
+    ) -> None:
+        """
+        แสดงสถิติการทอยของผู้ใช้ในเซิร์ฟเวอร์นี้พร้อมอันดับ
+
+        Args:
+            interaction: Discord interaction object
+            user: ผู้ใช้ที่ต้องการดู (ค่าเริ่มต้นคือผู้ใช้คำสั่ง)
+        """
+        try:
+            guild_rolls = await self._guild_rolls(interaction)
+            user = user or interaction.user
+            user_stats = guild_rolls.users.get(user.id)
+            if user_stats is None:
+                raise UserError(f"{user.display_name} ยังไม่เคยทอยลูกเต๋าในเซิร์ฟเวอร์นี้")
+
+            embed = self._create_stats_embed(guild_rolls, user, user_stats)
+            await self._safe_respond(interaction, embed=embed)
+
+        except Exception as e:
+            logger.error(f"❌ เกิดข้อผิดพลาดในคำสั่ง dice stats: {str(e)}")
+            await self.handle_error(interaction, e)
+
+    @profiled()
+    async def leaderboard(
+        self, interaction: discord.Interaction, metric: str = "rolls"
+    ) -> None:
+        """
+        แสดง leaderboard ของเซิร์ฟเวอร์
+
+        Args:
+            interaction: Discord interaction object
+            metric: rolls, max_rolls หรือ luck
+        """
+        try:
+            guild_rolls = await self._guild_rolls(interaction)
+            embed = self._create_leaderboard_embed(
+                guild_rolls, metric, interaction.user
+            )
+            await self._safe_respond(interaction, embed=embed)
+
+        except Exception as e:
+            logger.error(f"❌ เกิดข้อผิดพลาดในคำสั่ง dice leaderboard: {str(e)}")
+            await self.handle_error(interaction, e)
+
+    async def _guild_rolls(self, interaction: discord.Interaction) -> GuildRollStats:
+        if interaction.guild_id is None:
+            raise UserError("สถิติการทอยใช้ได้เฉพาะในเซิร์ฟเวอร์")
+        return await self.bot.roll_stats.guild(interaction.guild_id)
+
+    @staticmethod
+    def _format_score(metric: str, score: float) -> str:
+        if metric == "luck":
+            return f"{score:+.2f}σ"
+        return f"{int(score):,} ครั้ง"
+
+    def _format_rank(self, guild_rolls: GuildRollStats, metric: str, user_id: int) -> str:
+        rank = guild_rolls.rank(metric, user_id)
+        if rank is None:
+            return "-"
+        return f"#{rank:,} จาก {guild_rolls.ranked(metric):,}"
+
+    def _create_stats_embed(
+        self, guild_rolls: GuildRollStats, user: discord.abc.User, user_stats: UserRollStats
+    ) -> discord.Embed:
+        """สร้าง embed แสดงสถิติของผู้ใช้"""
+        if user_stats.luck is None:
+            luck = "-"
+        else:
+            luck = self._format_score("luck", user_stats.luck)
+            if user_stats.luck_rolls < MIN_LUCK_ROLLS:
+                luck += f" (ติดอันดับเมื่อทอยครบ {MIN_LUCK_ROLLS} ครั้ง)"
+
+        return (
+            EmbedBuilder()
+            .set_title(f"สถิติการทอยของ {user.display_name}", emoji="📊")
+            .set_color("primary")
+            .add_field(
+                name="ทอยทั้งหมด",
+                value=(
+                    f"{user_stats.rolls:,} ครั้ง\n"
+                    f"{self._format_rank(guild_rolls, 'rolls', user.id)}"
+                ),
+                emoji="🎲",
+                inline=True,
+            )
+            .add_field(
+                name="ได้ผลสูงสุด",
+                value=(
+                    f"{user_stats.max_rolls:,} ครั้ง\n"
+                    f"{self._format_rank(guild_rolls, 'max_rolls', user.id)}"
+                ),
+                emoji="🎯",
+                inline=True,
+            )
+            .add_field(
+                name="ดวง (z-score เฉลี่ย)",
+                value=f"{luck}\n{self._format_rank(guild_rolls, 'luck', user.id)}",
+                emoji="🍀",
+                inline=True,
+            )
+            .set_footer("ดวงวัดจากผลรวมหน้าลูกเต๋าเทียบกับค่าเฉลี่ย", emoji="🎲")
+            .build()
+        )
+
+    def _create_leaderboard_embed(
+        self, guild_rolls: GuildRollStats, metric: str, user: discord.abc.User
+    ) -> discord.Embed:
+        """สร้าง embed แสดง leaderboard"""
+        title, emoji = LEADERBOARDS[metric]
+        entries = guild_rolls.top(metric, LEADERBOARD_SIZE)
+        if entries:
+            description = "\n".join(
+                f"{MEDALS[i] if i < len(MEDALS) else f'`#{i + 1}`'} <@{user_id}> — "
+                f"{self._format_score(metric, score)}"
+                for i, (user_id, score) in enumerate(entries)
+            )
+        elif metric == "luck":
+            description = f"ยังไม่มีใครทอยครบ {MIN_LUCK_ROLLS} ครั้ง"
+        else:
+            description = "ยังไม่มีใครทอยลูกเต๋าในเซิร์ฟเวอร์นี้"
+
+        return (
+            EmbedBuilder()
+            .set_title(title, emoji=emoji)
+            .set_description(description)
+            .set_color("primary")
+            .set_footer(
+                f"อันดับของคุณ: {self._format_rank(guild_rolls, metric, user.id)}",
+                emoji="🏆",
+            )
+            .build()
+        )
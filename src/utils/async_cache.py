@@ -0,0 +1,234 @@
+# utils/async_cache.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+# cache ทุกตัวที่ยังมีชีวิตอยู่ สำหรับรวม stats ไปแสดงใน metrics
+_instances: "weakref.WeakSet[AsyncTTLCache]" = weakref.WeakSet()
+
+
+class CacheStats:
+    """สถิติการใช้งาน cache"""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations", "loads", "load_errors", "coalesced")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.coalesced = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["hit_rate"] = round(self.hit_rate, 4)
+        return data
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "seq")
+
+    def __init__(self, value: Any, expires_at: float, seq: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.seq = seq
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """
+    Cache แบบ LRU ขนาดจำกัดที่แต่ละค่ามีอายุ (TTL) ของตัวเอง
+
+    - ค่าที่หมดอายุถูกลบผ่าน heap ตามเวลาหมดอายุ ไม่ต้องไล่ทั้ง cache
+    - get_or_load รวมการโหลดของ key เดียวกันที่เกิดพร้อมกันให้เหลือครั้งเดียว
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        name: str = "cache",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize ต้องมากกว่า 0")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._data: "OrderedDict[K, _Entry]" = OrderedDict()
+        self._heap: List[Tuple[float, int, K]] = []
+        self._seq = itertools.count()
+        self._inflight: Dict[K, asyncio.Future] = {}
+        _instances.add(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def _purge_expired(self, now: float) -> None:
+        """ลบค่าที่หมดอายุจากหัว heap (amortized O(log n) ต่อค่า)"""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            if entry is not None and entry.seq == seq:
+                del self._data[key]
+                self.stats.expirations += 1
+
+        # heap มีรายการเก่าค้าง (จากการ set ซ้ำหรือ evict) มากเกินไป ให้สร้างใหม่
+        if len(heap) > 2 * len(self._data) + 64:
+            self._heap = [(e.expires_at, e.seq, k) for k, e in self._data.items()]
+            heapq.heapify(self._heap)
+
+    def get(self, key: K, default: Any = None, *, count: bool = True) -> Any:
+        """
+        ดึงค่าจาก cache
+
+        Args:
+            key: key ที่ต้องการ
+            default: ค่าที่คืนเมื่อไม่พบหรือหมดอายุ
+            count: นับเป็น hit/miss ใน stats หรือไม่
+        """
+        entry = self._data.get(key)
+        if entry is None or entry.expires_at <= self._clock():
+            if count:
+                self.stats.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        if count:
+            self.stats.hits += 1
+        return entry.value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        เก็บค่าลง cache
+
+        Args:
+            key: key ที่ต้องการเก็บ
+            value: ค่าที่ต้องการเก็บ
+            ttl: อายุของค่า (วินาที) ถ้าไม่ระบุจะใช้ค่า default ของ cache
+        """
+        now = self._clock()
+        self._purge_expired(now)
+
+        seq = next(self._seq)
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._data[key] = _Entry(value, expires_at, seq)
+        self._data.move_to_end(key)
+        heapq.heappush(self._heap, (expires_at, seq, key))
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> bool:
+        """ลบ key ออกจาก cache คืน True ถ้ามี key นั้นอยู่"""
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """ล้าง cache ทั้งหมด (stats ยังคงอยู่)"""
+        self._data.clear()
+        self._heap.clear()
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        ttl: Optional[float] = None,
+    ) -> V:
+        """
+        ดึงค่าจาก cache หรือโหลดใหม่ถ้าไม่มี
+
+        ถ้ามีการโหลด key เดียวกันค้างอยู่ จะรอผลของการโหลดนั้นแทนการโหลดซ้ำ
+        loader รันใน task แยกที่ผู้เรียกทุกคนรอผ่าน asyncio.shield
+        ผู้เรียกที่ถูกยกเลิก (รวมถึงคนที่เริ่มโหลด) จึงไม่ยกเลิกการโหลดของคนอื่น
+
+        Args:
+            key: key ที่ต้องการ
+            loader: coroutine function สำหรับโหลดค่าเมื่อไม่พบใน cache
+            ttl: อายุของค่าที่โหลดใหม่ (วินาที)
+
+        Raises:
+            Exception: ข้อผิดพลาดจาก loader (จะไม่ถูกเก็บลง cache)
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.loads += 1
+            task = asyncio.ensure_future(self._load(key, loader, ttl))
+            # ป้องกัน warning "exception was never retrieved" เมื่อไม่มีใครรอ
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]], ttl: Optional[float]) -> V:
+        try:
+            value = await loader()
+        except BaseException:
+            self.stats.load_errors += 1
+            raise
+        else:
+            self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะของ cache สำหรับ metrics"""
+        data = self.stats.to_dict()
+        data.update(size=len(self._data), maxsize=self.maxsize, ttl=self.ttl)
+        return data
+
+    def format_summary(self) -> str:
+        """สรุปสถานะของ cache เป็นข้อความสั้นๆ"""
+        s = self.stats
+        return (
+            f"{self.name}: {len(self._data)}/{self.maxsize} "
+            f"hit {s.hit_rate:.0%} evict {s.evictions} exp {s.expirations}"
+        )
+
+
+def all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """รวม stats ของ cache ทุกตัวที่ยังใช้งานอยู่"""
+    return {cache.name: cache.snapshot() for cache in list(_instances)}
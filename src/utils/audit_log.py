@@ -0,0 +1,451 @@
+# utils/audit_log.py
+
+import asyncio
+import logging
+import mmap
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Executor
+from enum import IntEnum
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# timestamp, user_id, guild_id, channel_id, command, outcome, latency_ms
+RECORD = struct.Struct("<dQQQ32sBf3x")
+_TIMESTAMP = struct.Struct("<d")
+_USER_ID = struct.Struct("<Q")
+_USER_ID_OFFSET = 8
+
+# เก็บ timestamp ของทุกๆ INDEX_STRIDE บันทึกไว้ใน sparse index
+INDEX_STRIDE = 256
+SEGMENT_SUFFIX = ".seg"
+
+
+class Outcome(IntEnum):
+    """ผลลัพธ์ของการใช้คำสั่ง"""
+
+    SUCCESS = 0
+    ERROR = 1
+    REJECTED = 2
+
+
+class AuditRecord(NamedTuple):
+    """บันทึกการใช้คำสั่งหนึ่งครั้ง"""
+
+    timestamp: float
+    user_id: int
+    guild_id: int
+    channel_id: int
+    command: str
+    outcome: Outcome
+    latency_ms: float
+
+    @classmethod
+    def unpack(cls, buffer, offset: int = 0) -> "AuditRecord":
+        ts, user_id, guild_id, channel_id, command, outcome, latency = RECORD.unpack_from(
+            buffer, offset
+        )
+        return cls(
+            ts,
+            user_id,
+            guild_id,
+            channel_id,
+            command.rstrip(b"\0").decode("utf-8", errors="ignore"),
+            Outcome(outcome),
+            latency,
+        )
+
+    def pack(self) -> bytes:
+        return RECORD.pack(
+            self.timestamp,
+            self.user_id,
+            self.guild_id,
+            self.channel_id,
+            self.command.encode("utf-8")[:32],
+            self.outcome,
+            self.latency_ms,
+        )
+
+
+Predicate = Callable[[AuditRecord], bool]
+
+
+class _Segment:
+    """ไฟล์ segment หนึ่งไฟล์ของ audit log"""
+
+    def __init__(self, path: Path, count: int = 0):
+        self.path = path
+        self.start_ts = int(path.stem) / 1000
+        self.end_ts = self.start_ts
+        self.count = count
+        self.index: List[float] = []
+
+    @property
+    def size(self) -> int:
+        return self.count * RECORD.size
+
+    def load(self) -> None:
+        """อ่านจำนวนบันทึกและสร้าง sparse index จากไฟล์"""
+        size = self.path.stat().st_size
+        self.count = size // RECORD.size
+        if size % RECORD.size:
+            # ตัดบันทึกที่เขียนไม่ครบ (เช่น process ถูก kill ระหว่างเขียน)
+            with open(self.path, "r+b") as f:
+                f.truncate(self.count * RECORD.size)
+        self.index = []
+        if not self.count:
+            return
+
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for i in range(0, self.count, INDEX_STRIDE):
+                self.index.append(_TIMESTAMP.unpack_from(mm, i * RECORD.size)[0])
+            self.end_ts = _TIMESTAMP.unpack_from(mm, (self.count - 1) * RECORD.size)[0]
+
+    def note_appended(self, records: List[AuditRecord]) -> None:
+        """อัพเดท index หลังเขียนบันทึกต่อท้ายไฟล์"""
+        for record in records:
+            if self.count % INDEX_STRIDE == 0:
+                self.index.append(record.timestamp)
+            self.count += 1
+        if records:
+            self.end_ts = records[-1].timestamp
+
+    def _bounds(self, start: Optional[float], end: Optional[float], count: int):
+        """หาช่วงลำดับบันทึกที่อาจอยู่ในช่วงเวลา จาก sparse index"""
+        lo, hi = 0, count
+        if start is not None:
+            lo = max(bisect_left(self.index, start) - 1, 0) * INDEX_STRIDE
+        if end is not None:
+            hi = min(bisect_right(self.index, end) * INDEX_STRIDE, count)
+        return lo, hi
+
+    def scan_reverse(
+        self,
+        count: int,
+        start: Optional[float],
+        end: Optional[float],
+        user_id: Optional[int],
+        predicate: Optional[Predicate],
+    ) -> Iterator[AuditRecord]:
+        """
+        ไล่บันทึกจากใหม่ไปเก่าผ่าน mmap โดยไม่โหลดทั้งไฟล์
+
+        Args:
+            count: จำนวนบันทึกที่เขียนเสร็จแล้ว ณ ตอนเริ่ม query
+            start: เวลาเริ่มต้น (รวม)
+            end: เวลาสิ้นสุด (รวม)
+            user_id: กรองเฉพาะผู้ใช้นี้
+            predicate: เงื่อนไขเพิ่มเติม
+        """
+        if not count:
+            return
+
+        lo, hi = self._bounds(start, end, count)
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            for i in range(hi - 1, lo - 1, -1):
+                offset = i * RECORD.size
+                if (
+                    user_id is not None
+                    and _USER_ID.unpack_from(mm, offset + _USER_ID_OFFSET)[0] != user_id
+                ):
+                    continue
+
+                record = AuditRecord.unpack(mm, offset)
+                if end is not None and record.timestamp > end:
+                    continue
+                if start is not None and record.timestamp < start:
+                    return
+                if predicate is None or predicate(record):
+                    yield record
+
+
+class AuditLog:
+    """
+    บันทึกการใช้คำสั่งทุกครั้งลงไฟล์แบบ append-only แบ่งเป็น segment
+
+    การเพิ่มบันทึกทำใน event loop แค่เก็บลง buffer ส่วนการเขียนไฟล์,
+    การขึ้น segment ใหม่ และการลบ segment ที่หมดอายุทำใน executor เป็นระยะ
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/audit",
+        segment_bytes: int = 8 * 1024 * 1024,
+        retention_days: float = 30,
+        flush_interval: float = 2.0,
+        executor: Optional[Executor] = None,
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.retention = retention_days * 86400
+        self.flush_interval = flush_interval
+        self.executor = executor
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: List[AuditRecord] = []
+        self._inflight: List[AuditRecord] = []
+        self._segments: List[_Segment] = []
+        self._task: Optional[asyncio.Task] = None
+        self._opened = False
+
+    # ------------------------------------------------------------------
+    # การเขียน
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        user_id: int,
+        command: str,
+        outcome: Outcome,
+        latency_ms: float,
+        guild_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> AuditRecord:
+        """
+        เพิ่มบันทึกลง buffer (เขียนลงไฟล์ในรอบ flush ถัดไป)
+
+        Args:
+            user_id: ID ของผู้ใช้
+            command: ชื่อคำสั่ง (ตัดเหลือ 32 bytes)
+            outcome: ผลลัพธ์ของคำสั่ง
+            latency_ms: เวลาที่ใช้ (มิลลิวินาที)
+            guild_id: ID ของเซิร์ฟเวอร์ (0 ถ้าเป็น DM)
+            channel_id: ID ของช่องทาง
+            timestamp: เวลาที่ใช้คำสั่ง (ค่าเริ่มต้นคือเวลาปัจจุบัน)
+        """
+        record = AuditRecord(
+            time.time() if timestamp is None else timestamp,
+            user_id,
+            guild_id or 0,
+            channel_id or 0,
+            command,
+            Outcome(outcome),
+            latency_ms,
+        )
+        with self._lock:
+            self._pending.append(record)
+        return record
+
+    def open(self) -> None:
+        """โหลดรายการ segment ที่มีอยู่และสร้าง sparse index (blocking)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = []
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+            try:
+                segment = _Segment(path)
+                segment.load()
+                segments.append(segment)
+            except (ValueError, OSError) as e:
+                logger.warning(f"⚠️ ข้าม segment ที่อ่านไม่ได้ {path.name}: {e}")
+
+        with self._lock:
+            self._segments = segments
+        self._opened = True
+
+    def flush(self) -> int:
+        """
+        เขียนบันทึกใน buffer ลงไฟล์ (blocking)
+
+        Returns:
+            int: จำนวนบันทึกที่เขียน
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._inflight = batch
+        if not batch:
+            return 0
+
+        try:
+            written = 0
+            while written < len(batch):
+                segment = self._active_segment(batch[written].timestamp)
+                room = max((self.segment_bytes - segment.size) // RECORD.size, 1)
+                chunk = batch[written:written + room]
+                with open(segment.path, "ab") as f:
+                    f.write(b"".join(record.pack() for record in chunk))
+                with self._lock:
+                    segment.note_appended(chunk)
+                    self._inflight = batch[written + len(chunk):]
+                written += len(chunk)
+            return written
+        except Exception:
+            # คืนบันทึกที่ยังเขียนไม่สำเร็จกลับเข้า buffer
+            with self._lock:
+                self._pending[:0] = self._inflight
+                self._inflight = []
+            raise
+
+    def _active_segment(self, first_ts: float) -> _Segment:
+        """หา segment ปัจจุบัน หรือขึ้น segment ใหม่ถ้าเต็มแล้ว"""
+        if self._segments and self._segments[-1].size < self.segment_bytes:
+            return self._segments[-1]
+
+        start_ms = int(first_ts * 1000)
+        if self._segments:
+            # ชื่อไฟล์ต้องไม่ซ้ำและเรียงตามเวลาเสมอ
+            start_ms = max(start_ms, int(self._segments[-1].start_ts * 1000) + 1)
+
+        segment = _Segment(self.directory / f"{start_ms:013d}{SEGMENT_SUFFIX}")
+        segment.path.touch()
+        with self._lock:
+            self._segments.append(segment)
+        logger.info(f"📼 เริ่ม audit segment ใหม่ {segment.path.name}")
+        return segment
+
+    def enforce_retention(self) -> int:
+        """
+        ลบ segment ที่บันทึกล่าสุดเก่ากว่าระยะเวลาเก็บรักษา (blocking)
+
+        Returns:
+            int: จำนวน segment ที่ลบ
+        """
+        cutoff = time.time() - self.retention
+        with self._lock:
+            # segment ล่าสุดยังเขียนอยู่ จึงไม่ลบ
+            expired = [s for s in self._segments[:-1] if s.end_ts < cutoff]
+            self._segments = [s for s in self._segments if s not in expired]
+
+        for segment in expired:
+            try:
+                segment.path.unlink()
+            except OSError as e:
+                logger.warning(f"⚠️ ลบ segment {segment.path.name} ไม่สำเร็จ: {e}")
+        if expired:
+            logger.info(f"🧹 ลบ audit segment ที่หมดอายุ {len(expired)} ไฟล์")
+        return len(expired)
+
+    # ------------------------------------------------------------------
+    # การค้นหา
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        *,
+        user_id: Optional[int] = None,
+        outcome: Optional[Outcome] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: int = 10,
+    ) -> List[AuditRecord]:
+        """
+        ค้นหาบันทึกจากใหม่ไปเก่า (blocking - ควรเรียกผ่าน executor)
+
+        Args:
+            user_id: กรองเฉพาะผู้ใช้นี้
+            outcome: กรองเฉพาะผลลัพธ์นี้
+            start: เวลาเริ่มต้น (epoch seconds)
+            end: เวลาสิ้นสุด (epoch seconds)
+            limit: จำนวนบันทึกสูงสุด
+
+        Returns:
+            List[AuditRecord]: บันทึกที่ตรงเงื่อนไข (ใหม่สุดก่อน)
+        """
+        predicate = None if outcome is None else (lambda r: r.outcome == outcome)
+
+        with self._lock:
+            buffered = self._inflight + self._pending
+            segments = [(segment, segment.count) for segment in self._segments]
+
+        results: List[AuditRecord] = []
+        for record in reversed(buffered):
+            if len(results) >= limit:
+                return results
+            if self._matches(record, user_id, start, end, predicate):
+                results.append(record)
+
+        for segment, count in reversed(segments):
+            if len(results) >= limit:
+                break
+            if start is not None and count and segment.end_ts < start:
+                break
+            if end is not None and segment.start_ts > end:
+                continue
+
+            for record in segment.scan_reverse(count, start, end, user_id, predicate):
+                results.append(record)
+                if len(results) >= limit:
+                    break
+
+        return results
+
+    @staticmethod
+    def _matches(
+        record: AuditRecord,
+        user_id: Optional[int],
+        start: Optional[float],
+        end: Optional[float],
+        predicate: Optional[Predicate],
+    ) -> bool:
+        if user_id is not None and record.user_id != user_id:
+            return False
+        if start is not None and record.timestamp < start:
+            return False
+        if end is not None and record.timestamp > end:
+            return False
+        return predicate is None or predicate(record)
+
+    # ------------------------------------------------------------------
+    # งานเบื้องหลัง
+    # ------------------------------------------------------------------
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def start(self) -> None:
+        """เปิด audit log และเริ่ม flush/retention เบื้องหลัง"""
+        if self._task is not None:
+            return
+        await self._run_blocking(self.open)
+        self._task = asyncio.create_task(self._background(), name="audit-log")
+        logger.info(
+            f"📼 เปิด audit log ที่ {self.directory} ({len(self._segments)} segments)"
+        )
+
+    async def _background(self) -> None:
+        last_retention = 0.0
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._run_blocking(self.flush)
+                if time.monotonic() - last_retention > 3600:
+                    await self._run_blocking(self.enforce_retention)
+                    last_retention = time.monotonic()
+            except Exception as e:
+                logger.error(f"❌ เกิดข้อผิดพลาดในการเขียน audit log: {e}")
+
+    async def search(self, **kwargs) -> List[AuditRecord]:
+        """ค้นหาบันทึกใน executor (รับพารามิเตอร์เดียวกับ query)"""
+        if not self._opened:
+            await self._run_blocking(self.open)
+        return await self._run_blocking(lambda: self.query(**kwargs))
+
+    async def close(self) -> None:
+        """หยุดงานเบื้องหลังและเขียนบันทึกที่ค้างอยู่ลงไฟล์"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._opened:
+            try:
+                await self._run_blocking(self.flush)
+            except Exception as e:
+                logger.error(f"❌ เขียน audit log ครั้งสุดท้ายไม่สำเร็จ: {e}")
@@ -0,0 +1,285 @@
+# utils/cog_registry.py
+
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.startup_timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CogSpec:
+    """ข้อมูลของ cog หนึ่งตัวใน manifest"""
+
+    key: str  # ชื่อสั้นที่ใช้ใน /dev reload
+    path: str  # path ของ extension
+    display: str  # ชื่อที่แสดงใน autocomplete
+    depends: Tuple[str, ...] = ()
+    dev_only: bool = False
+    # modules ที่ cog ใช้ ซึ่งต้อง reload ก่อนตัว cog (เรียงตามลำดับ import)
+    submodules: Tuple[str, ...] = ()
+
+    @property
+    def modules(self) -> Tuple[str, ...]:
+        """modules ทั้งหมดของ cog นี้ (submodules ตามด้วยตัว extension)"""
+        return self.submodules + (self.path,)
+
+
+@dataclass
+class CogLoadResult:
+    """ผลการโหลด cog หนึ่งตัว"""
+
+    status: str  # loaded / failed / skipped
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+
+
+# manifest ของ cogs ทั้งหมดใน src/cogs
+DEFAULT_MANIFEST: Tuple[CogSpec, ...] = (
+    CogSpec(
+        "commands",
+        "src.cogs.commands",
+        "🎮 Commands",
+        submodules=(
+            "src.commands.base_command",
+            "src.commands.ping_command",
+            "src.commands.roll_command",
+            "src.commands.help_command",
+        ),
+    ),
+    CogSpec("events", "src.cogs.event_handler", "🎯 Events"),
+    CogSpec(
+        "dev",
+        "src.cogs.dev_tools",
+        "🛠️ Developer Tools",
+        depends=("commands",),
+        dev_only=True,
+    ),
+)
+
+
+class CogRegistry:
+    """
+    จัดการการโหลดและ reload cogs ตาม manifest
+
+    cogs ที่ไม่ได้พึ่งพากันจะถูกโหลดพร้อมกัน และ cog ที่โหลดไม่สำเร็จ
+    จะไม่ทำให้ cog อื่นที่ไม่เกี่ยวข้องโหลดไม่ได้
+    """
+
+    def __init__(self, manifest: Sequence[CogSpec] = DEFAULT_MANIFEST):
+        self.specs: Dict[str, CogSpec] = {spec.key: spec for spec in manifest}
+        self.results: Dict[str, CogLoadResult] = {}
+        self._levels = self._resolve_levels()
+
+    def _resolve_levels(self) -> List[List[CogSpec]]:
+        """
+        จัดลำดับ cogs เป็นชั้นตาม dependency (topological sort)
+
+        Raises:
+            ValueError: ถ้าพบ dependency ที่ไม่มีอยู่หรือเป็นวงวน
+        """
+        for spec in self.specs.values():
+            unknown = [dep for dep in spec.depends if dep not in self.specs]
+            if unknown:
+                raise ValueError(f"❌ cog {spec.key} พึ่งพา cog ที่ไม่มีอยู่: {', '.join(unknown)}")
+
+        levels: List[List[CogSpec]] = []
+        placed: set = set()
+        remaining = dict(self.specs)
+        while remaining:
+            level = [
+                spec for spec in remaining.values()
+                if all(dep in placed for dep in spec.depends)
+            ]
+            if not level:
+                raise ValueError(f"❌ พบ dependency วนกันระหว่าง: {', '.join(remaining)}")
+            levels.append(level)
+            for spec in level:
+                placed.add(spec.key)
+                del remaining[spec.key]
+        return levels
+
+    def get(self, key: str) -> Optional[CogSpec]:
+        return self.specs.get(key.lower())
+
+    def ordered(self, include_dev: bool = True) -> List[CogSpec]:
+        """รายชื่อ cogs เรียงตาม dependency"""
+        return [
+            spec
+            for level in self._levels
+            for spec in level
+            if include_dev or not spec.dev_only
+        ]
+
+    def loaded(self, bot) -> List[CogSpec]:
+        """รายชื่อ cogs ที่โหลดอยู่ เรียงตาม dependency"""
+        return [spec for spec in self.ordered() if spec.path in bot.extensions]
+
+    async def _load(self, bot, spec: CogSpec) -> None:
+        blocked = [
+            dep for dep in spec.depends
+            if self.results.get(dep) is None or self.results[dep].status != "loaded"
+        ]
+        if blocked:
+            self.results[spec.key] = CogLoadResult(
+                "skipped", error=f"dependency ไม่พร้อม: {', '.join(blocked)}"
+            )
+            logger.warning(f"⚠️ ข้ามการโหลด {spec.path} เพราะ {', '.join(blocked)} ไม่พร้อม")
+            return
+
+        start = time.perf_counter()
+        try:
+            with timeline.phase(f"load_extension:{spec.path}"):
+                await bot.load_extension(spec.path)
+        except Exception as e:
+            duration = (time.perf_counter() - start) * 1000
+            self.results[spec.key] = CogLoadResult("failed", duration, str(e))
+            logger.error(f"❌ โหลด {spec.path} ไม่สำเร็จ: {e}")
+            return
+
+        duration = (time.perf_counter() - start) * 1000
+        self.results[spec.key] = CogLoadResult("loaded", duration)
+        logger.info(f"✅ โหลด {spec.path} สำเร็จ ({duration:.1f}ms)")
+
+    async def load_all(self, bot, include_dev: bool = False) -> Dict[str, CogLoadResult]:
+        """
+        โหลด cogs ทั้งหมดตาม manifest
+
+        Args:
+            bot: Discord bot instance
+            include_dev: โหลด cogs ที่ใช้เฉพาะ dev mode ด้วยหรือไม่
+
+        Returns:
+            Dict[str, CogLoadResult]: ผลการโหลดของแต่ละ cog
+        """
+        for level in self._levels:
+            specs = [spec for spec in level if include_dev or not spec.dev_only]
+            await asyncio.gather(*(self._load(bot, spec) for spec in specs))
+
+        failed = [key for key, r in self.results.items() if r.status != "loaded"]
+        if failed:
+            logger.warning(f"⚠️ มี cog ที่โหลดไม่สำเร็จ: {', '.join(failed)}")
+        return dict(self.results)
+
+    @staticmethod
+    def _cogs_of(bot, spec: CogSpec) -> Dict[str, Any]:
+        """cogs ที่สร้างจาก extension นี้"""
+        return {
+            name: cog for name, cog in bot.cogs.items()
+            if type(cog).__module__ == spec.path
+        }
+
+    def _export_states(self, bot, spec: CogSpec) -> Dict[str, Any]:
+        """เก็บ state ของ cogs ก่อน reload"""
+        states = {}
+        for name, cog in self._cogs_of(bot, spec).items():
+            export = getattr(cog, "export_state", None)
+            if export is None:
+                continue
+            try:
+                states[name] = export()
+            except Exception as e:
+                logger.error(f"❌ export state ของ {name} ไม่สำเร็จ: {e}")
+        return states
+
+    def _import_states(self, bot, spec: CogSpec, states: Dict[str, Any]) -> None:
+        """ส่ง state ที่เก็บไว้ให้ cogs ตัวใหม่หลัง reload"""
+        for name, cog in self._cogs_of(bot, spec).items():
+            state = states.get(name)
+            restore = getattr(cog, "import_state", None)
+            if state is None or restore is None:
+                continue
+            try:
+                restore(state)
+            except Exception as e:
+                logger.error(f"❌ import state ของ {name} ไม่สำเร็จ: {e}")
+
+    @staticmethod
+    def _reload_submodules(spec: CogSpec) -> None:
+        """reload modules ที่ cog ใช้ เพื่อให้ได้โค้ดล่าสุด"""
+        for name in spec.submodules:
+            module = sys.modules.get(name)
+            if module is not None:
+                importlib.reload(module)
+
+    async def reload(self, bot, key: str) -> CogSpec:
+        """
+        Reload cog ตามชื่อใน manifest โดยส่งต่อ state ของ cog เดิมให้ cog ใหม่
+
+        Args:
+            bot: Discord bot instance
+            key: ชื่อ cog ใน manifest
+
+        Returns:
+            CogSpec: ข้อมูลของ cog ที่ reload
+
+        Raises:
+            ValueError: ถ้าไม่พบ cog ชื่อนี้
+        """
+        spec = self.get(key)
+        if spec is None:
+            raise ValueError(
+                f"ไม่พบ cog ชื่อ '{key}'\nCogs ที่มี: {', '.join(self.specs)}"
+            )
+
+        start = time.perf_counter()
+        states = self._export_states(bot, spec)
+        try:
+            if spec.path in bot.extensions:
+                self._reload_submodules(spec)
+                await bot.reload_extension(spec.path)
+            else:
+                await bot.load_extension(spec.path)
+        except Exception as e:
+            self.results[spec.key] = CogLoadResult(
+                "failed", (time.perf_counter() - start) * 1000, str(e)
+            )
+            raise
+        finally:
+            # ถ้า reload ไม่สำเร็จ discord.py จะคืน cog เดิม ซึ่งต้องได้ state คืนเช่นกัน
+            self._import_states(bot, spec, states)
+
+        self.results[spec.key] = CogLoadResult("loaded", (time.perf_counter() - start) * 1000)
+        return spec
+
+    async def reload_all(self, bot) -> Tuple[List[str], List[str]]:
+        """
+        Reload ทุก cog ที่โหลดอยู่ตามลำดับ dependency
+
+        Returns:
+            Tuple[List[str], List[str]]: (cogs ที่สำเร็จ, cogs ที่ไม่สำเร็จพร้อมสาเหตุ)
+        """
+        reloaded, failed = [], []
+        for spec in self.loaded(bot):
+            try:
+                await self.reload(bot, spec.key)
+                reloaded.append(spec.key)
+            except Exception as e:
+                failed.append(f"{spec.key} ({e})")
+        return reloaded, failed
+
+    def choices(self, bot, current: str = "") -> Iterable[Tuple[str, str]]:
+        """คู่ (ชื่อที่แสดง, key) ของ cogs ที่โหลดอยู่ สำหรับ autocomplete"""
+        current = current.lower()
+        for spec in self.loaded(bot):
+            if current in spec.key or current in spec.display.lower():
+                yield spec.display, spec.key
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """สรุปผลการโหลดสำหรับ metrics"""
+        return {
+            key: {
+                "status": r.status,
+                "duration_ms": round(r.duration_ms, 2),
+                "error": r.error,
+                "loaded_at": r.loaded_at,
+            }
+            for key, r in self.results.items()
+        }
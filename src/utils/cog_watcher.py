@@ -0,0 +1,96 @@
+# utils/cog_watcher.py
+
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+from src.utils.cog_registry import CogRegistry, CogSpec
+
+logger = logging.getLogger(__name__)
+
+
+class CogWatcher:
+    """
+    ตรวจการแก้ไขไฟล์ของ cogs ด้วยการ poll mtime และ reload เฉพาะ cog ที่เปลี่ยน
+    (ใช้ใน dev mode เท่านั้น)
+    """
+
+    def __init__(self, bot, registry: CogRegistry, interval: float = 0.5):
+        self.bot = bot
+        self.registry = registry
+        self.interval = interval
+        self._files: Dict[str, Tuple[str, ...]] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _module_file(module: str) -> Optional[str]:
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            return None
+        return spec.origin if spec and spec.origin else None
+
+    def _files_of(self, spec: CogSpec) -> Tuple[str, ...]:
+        files = self._files.get(spec.key)
+        if files is None:
+            files = tuple(
+                path for path in map(self._module_file, spec.modules) if path
+            )
+            self._files[spec.key] = files
+        return files
+
+    @staticmethod
+    def _mtime(path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _changed_specs(self):
+        """หา cogs ที่มีไฟล์ถูกแก้ไขตั้งแต่รอบก่อน"""
+        changed = []
+        for spec in self.registry.loaded(self.bot):
+            dirty = False
+            for path in self._files_of(spec):
+                mtime = self._mtime(path)
+                previous = self._mtimes.get(path)
+                self._mtimes[path] = mtime
+                if previous is not None and mtime != previous:
+                    dirty = True
+            if dirty:
+                changed.append(spec)
+        return changed
+
+    async def _run(self) -> None:
+        # บันทึก mtime เริ่มต้นก่อน จะได้ไม่ reload ทันทีที่เริ่ม
+        self._changed_specs()
+        while True:
+            await asyncio.sleep(self.interval)
+            for spec in self._changed_specs():
+                try:
+                    await self.registry.reload(self.bot, spec.key)
+                    result = self.registry.results[spec.key]
+                    logger.info(
+                        f"♻️ Auto reload {spec.key} สำเร็จ ({result.duration_ms:.1f}ms)"
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Auto reload {spec.key} ไม่สำเร็จ: {e}")
+
+    def start(self) -> None:
+        """เริ่ม poll ไฟล์เบื้องหลัง"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="cog-watcher")
+            logger.info(f"👀 เปิด auto reload (ตรวจทุก {self.interval}s)")
+
+    async def stop(self) -> None:
+        """หยุด poll ไฟล์"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
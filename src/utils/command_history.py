@@ -1,44 +1,173 @@
-from dataclasses import dataclass
-from datetime import datetime
-import discord
-from typing import List, Dict
+import sys
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
 
-@dataclass
 class CommandRecord:
-    """บันทึกการใช้คำสั่ง"""
-    user: discord.User
-    action: str
-    success: bool
-    timestamp: datetime = datetime.now()
+    """บันทึกการใช้คำสั่ง (เก็บเฉพาะ ID เพื่อประหยัดหน่วยความจำ)"""
+
+    __slots__ = ("user_id", "guild_id", "command", "success", "timestamp")
+
+    def __init__(
+        self,
+        user_id: int,
+        command: str,
+        success: bool,
+        guild_id: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ):
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.command = command
+        self.success = success
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __repr__(self) -> str:
+        return (
+            f"CommandRecord(user_id={self.user_id}, command={self.command!r}, "
+            f"success={self.success}, timestamp={self.timestamp})"
+        )
+
 
 class CommandHistory:
-    """จัดการประวัติการใช้คำสั่ง"""
-    def __init__(self, max_size: int = 100):
-        self.max_size = max_size
-        self._history: List[CommandRecord] = []
-        self._stats: Dict[str, int] = {
-            "total": 0,
-            "success": 0,
-            "failed": 0
-        }
-
-    def add(self, user: discord.User, action: str, success: bool) -> None:
-        """เพิ่มบันทึกใหม่"""
-        record = CommandRecord(user, action, success)
-        self._history.append(record)
-        
+    """
+    จัดการประวัติการใช้คำสั่งแบบ ring buffer ขนาดคงที่
+
+    เพิ่มบันทึกได้ใน O(1) และมี index แยกตามผู้ใช้และตามคำสั่ง
+    สำหรับดูกิจกรรมล่าสุดโดยไม่ต้องไล่ทั้ง buffer
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError("capacity ต้องมากกว่า 0")
+
+        self._capacity = capacity
+        self._records: List[Optional[CommandRecord]] = [None] * capacity
+        self._next_seq = 0  # ลำดับของบันทึกถัดไป (ไม่วนกลับ)
+        self._by_user: Dict[int, Deque[int]] = {}
+        self._by_command: Dict[str, Deque[int]] = {}
+        self._stats: Dict[str, int] = {"total": 0, "success": 0, "failed": 0}
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self._capacity)
+
+    def add(
+        self,
+        user_id: int,
+        command: str,
+        success: bool,
+        guild_id: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> CommandRecord:
+        """
+        เพิ่มบันทึกใหม่ ถ้า buffer เต็มจะเขียนทับบันทึกที่เก่าที่สุด
+
+        Args:
+            user_id: ID ของผู้ใช้
+            command: ชื่อคำสั่ง
+            success: คำสั่งทำงานสำเร็จหรือไม่
+            guild_id: ID ของเซิร์ฟเวอร์ (None ถ้าเป็น DM)
+            timestamp: เวลาที่ใช้คำสั่ง (ค่าเริ่มต้นคือเวลาปัจจุบัน)
+
+        Returns:
+            CommandRecord: บันทึกที่เพิ่ม
+        """
+        command = sys.intern(command)
+        record = CommandRecord(user_id, command, success, guild_id, timestamp)
+
+        seq = self._next_seq
+        slot = seq % self._capacity
+        evicted = self._records[slot]
+        if evicted is not None:
+            # บันทึกที่ถูกเขียนทับคือบันทึกเก่าที่สุดของทั้งผู้ใช้และคำสั่งนั้นเสมอ
+            self._drop_index(self._by_user, evicted.user_id)
+            self._drop_index(self._by_command, evicted.command)
+
+        self._records[slot] = record
+        self._next_seq = seq + 1
+        self._by_user.setdefault(user_id, deque()).append(seq)
+        self._by_command.setdefault(command, deque()).append(seq)
+
         # Update stats
         self._stats["total"] += 1
         self._stats["success" if success else "failed"] += 1
-        
-        # Trim history if needed
-        if len(self._history) > self.max_size:
-            self._history.pop(0)
+
+        return record
+
+    @staticmethod
+    def _drop_index(index: Dict, key) -> None:
+        """ลบลำดับที่เก่าที่สุดออกจาก index"""
+        seqs = index[key]
+        seqs.popleft()
+        if not seqs:
+            del index[key]
+
+    def _resolve(self, seqs: Iterable[int], count: int) -> List[CommandRecord]:
+        """แปลงลำดับเป็นบันทึก"""
+        records = []
+        for seq in seqs:
+            if len(records) >= count:
+                break
+            records.append(self._records[seq % self._capacity])
+        return records
+
+    def get_recent(self, count: int = 5) -> List[CommandRecord]:
+        """
+        รับประวัติล่าสุด (ใหม่สุดก่อน)
+
+        Args:
+            count: จำนวนบันทึกที่ต้องการ
+        """
+        oldest = self._next_seq - len(self)
+        start = self._next_seq - 1
+        stop = max(oldest, self._next_seq - count) - 1
+        return self._resolve(range(start, stop, -1), count)
+
+    def get_recent_for_user(self, user_id: int, count: int = 5) -> List[CommandRecord]:
+        """
+        รับประวัติล่าสุดของผู้ใช้ (ใหม่สุดก่อน)
+
+        Args:
+            user_id: ID ของผู้ใช้
+            count: จำนวนบันทึกที่ต้องการ
+        """
+        return self._resolve(reversed(self._by_user.get(user_id, ())), count)
+
+    def get_recent_for_command(self, command: str, count: int = 5) -> List[CommandRecord]:
+        """
+        รับประวัติล่าสุดของคำสั่ง (ใหม่สุดก่อน)
+
+        Args:
+            command: ชื่อคำสั่ง
+            count: จำนวนบันทึกที่ต้องการ
+        """
+        return self._resolve(reversed(self._by_command.get(command, ())), count)
+
+    def count_for_user(self, user_id: int) -> int:
+        """จำนวนบันทึกของผู้ใช้ที่ยังอยู่ใน buffer"""
+        return len(self._by_user.get(user_id, ()))
+
+    def count_for_command(self, command: str) -> int:
+        """จำนวนบันทึกของคำสั่งที่ยังอยู่ใน buffer"""
+        return len(self._by_command.get(command, ()))
+
+    @property
+    def active_users(self) -> int:
+        """จำนวนผู้ใช้ที่มีบันทึกอยู่ใน buffer"""
+        return len(self._by_user)
 
     def get_stats(self) -> Dict[str, int]:
         """รับสถิติการใช้คำสั่ง"""
         return self._stats.copy()
 
-    def get_recent(self, count: int = 5) -> List[CommandRecord]:
-        """รับประวัติล่าสุด"""
-        return self._history[-count:]
+    def clear(self) -> None:
+        """ล้างประวัติทั้งหมด (สถิติสะสมยังคงอยู่)"""
+        self._records = [None] * self._capacity
+        self._next_seq = 0
+        self._by_user.clear()
+        self._by_command.clear()
@@ -0,0 +1,212 @@
+# utils/config.py
+
+import logging
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from dotenv import dotenv_values, load_dotenv
+
+from src.utils.exceptions import BotError
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigError(BotError):
+    """Exception สำหรับค่า config ที่ไม่ถูกต้อง"""
+    pass
+
+
+# environment ของ process ก่อนโหลด .env (ค่าใน process มาก่อนค่าในไฟล์ทั้งตอนเริ่มและตอน reload)
+_process_env: Optional[Dict[str, str]] = None
+
+
+def load_env_file(env_file: str = ".env") -> None:
+    """
+    โหลด .env เข้า os.environ โดยไม่ทับค่าที่ process มีอยู่แล้ว
+    และจำ environment เดิมไว้ให้ BotConfig.reload ใช้กฎเดียวกัน
+
+    Args:
+        env_file: path ของไฟล์ .env
+    """
+    global _process_env
+    if _process_env is None:
+        _process_env = dict(os.environ)
+    load_dotenv(env_file)
+
+
+def _bool(value: str) -> bool:
+    return value.strip().lower() == "true"
+
+
+def _optional_int(value: str) -> Optional[int]:
+    return int(value) if value.strip() else None
+
+
+def _optional_str(value: str) -> Optional[str]:
+    return value.strip() or None
+
+
+def _env(name: str, parse: Callable[[str], Any] = str, live: bool = False) -> Dict[str, Any]:
+    """metadata ของ field: ชื่อ environment variable, ตัวแปลงค่า และมีผลทันทีเมื่อ reload หรือไม่"""
+    return {"env": name, "parse": parse, "live": live}
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    """
+    ค่าตั้งค่าของบอทที่อ่านและตรวจสอบครั้งเดียว
+
+    object นี้แก้ไขไม่ได้: การ reload สร้าง object ใหม่แล้วสลับ reference ที่ bot.config
+    ผู้อ่านจึงเห็นค่าชุดเดียวกันเสมอ (อ่าน bot.config ครั้งเดียวต่อการทำงานหนึ่งครั้ง)
+
+    field ที่ live=True มีผลทันทีเมื่อ reload ส่วน field อื่นต้องรีสตาร์ทบอท
+    """
+
+    # Dev Mode
+    dev_mode: bool = field(default=False, metadata=_env("DEV_MODE", _bool))
+    dev_guild_id: Optional[int] = field(
+        default=None, metadata=_env("DEV_GUILD_ID", _optional_int, live=True)
+    )
+    dev_auto_reload: bool = field(default=False, metadata=_env("DEV_AUTO_RELOAD", _bool))
+    command_history_size: int = field(default=1000, metadata=_env("COMMAND_HISTORY_SIZE", int))
+
+    # Discord
+    application_id: Optional[str] = field(
+        default=None, metadata=_env("APPLICATION_ID", _optional_str)
+    )
+    discord_api_base: Optional[str] = field(
+        default=None, metadata=_env("DISCORD_API_BASE", _optional_str)
+    )
+    discord_gateway_url: Optional[str] = field(
+        default=None, metadata=_env("DISCORD_GATEWAY_URL", _optional_str)
+    )
+
+    # คำสั่ง
+    ping_good_ms: int = field(default=100, metadata=_env("PING_GOOD_MS", int, live=True))
+    ping_slow_ms: int = field(default=200, metadata=_env("PING_SLOW_MS", int, live=True))
+
+    # executor และไฟล์ข้อมูล
+    offload_threads: int = field(default=3, metadata=_env("OFFLOAD_THREADS", int))
+    offload_processes: int = field(default=2, metadata=_env("OFFLOAD_PROCESSES", int))
+    audit_log_dir: str = field(default="data/audit", metadata=_env("AUDIT_LOG_DIR"))
+    audit_retention_days: float = field(
+        default=30.0, metadata=_env("AUDIT_RETENTION_DAYS", float)
+    )
+    roll_stats_dir: str = field(default="data/roll_stats", metadata=_env("ROLL_STATS_DIR"))
+
+    # เครื่องมือวินิจฉัย
+    memory_report_dir: str = field(default="logs/memory", metadata=_env("MEMORY_REPORT_DIR"))
+    profile_dir: str = field(default="logs/profiles", metadata=_env("PROFILE_DIR"))
+    profile_sample_rate: float = field(
+        default=0.0, metadata=_env("PROFILE_SAMPLE_RATE", float, live=True)
+    )
+    stack_sample_interval_ms: float = field(
+        default=20.0, metadata=_env("STACK_SAMPLE_INTERVAL_MS", float)
+    )
+    task_watchdog_lag_ms: float = field(
+        default=500.0, metadata=_env("TASK_WATCHDOG_LAG_MS", float, live=True)
+    )
+    task_stuck_seconds: float = field(
+        default=300.0, metadata=_env("TASK_STUCK_SECONDS", float, live=True)
+    )
+    log_sampling: str = field(default="", metadata=_env("LOG_SAMPLING", live=True))
+    log_rate_limits: str = field(default="", metadata=_env("LOG_RATE_LIMITS", live=True))
+
+    # การปิดและรีสตาร์ท
+    shutdown_drain_seconds: float = field(
+        default=25.0, metadata=_env("SHUTDOWN_DRAIN_SECONDS", float, live=True)
+    )
+    metrics_dir: str = field(default="logs/metrics", metadata=_env("METRICS_DIR", live=True))
+    gateway_session_file: str = field(
+        default="data/gateway_session.json", metadata=_env("GATEWAY_SESSION_FILE")
+    )
+    gateway_resume_seconds: float = field(
+        default=0.0, metadata=_env("GATEWAY_RESUME_SECONDS", float, live=True)
+    )
+
+    def __post_init__(self):
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value < 0:
+                raise ConfigError(f"{f.metadata['env']} ต้องไม่ติดลบ (ได้ {value})")
+        if not 0 <= self.profile_sample_rate <= 1:
+            raise ConfigError("PROFILE_SAMPLE_RATE ต้องอยู่ระหว่าง 0 ถึง 1")
+        if self.ping_good_ms >= self.ping_slow_ms:
+            raise ConfigError("PING_GOOD_MS ต้องน้อยกว่า PING_SLOW_MS")
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "BotConfig":
+        """
+        สร้าง config จาก environment variables (ตัวที่ไม่ได้กำหนดใช้ค่าเริ่มต้น)
+
+        Args:
+            env: แหล่งค่า (ค่าเริ่มต้นคือ os.environ)
+
+        Returns:
+            BotConfig: config ที่ตรวจสอบแล้ว
+
+        Raises:
+            ConfigError: ถ้ามีค่าที่แปลงไม่ได้หรือไม่ผ่านการตรวจสอบ
+        """
+        env = os.environ if env is None else env
+        values = {}
+        for f in fields(cls):
+            name = f.metadata["env"]
+            raw = env.get(name)
+            if raw is None:
+                continue
+            try:
+                values[f.name] = f.metadata["parse"](raw)
+            except ValueError:
+                raise ConfigError(f"ค่า {name}={raw!r} ไม่ถูกต้อง") from None
+        return cls(**values)
+
+    @classmethod
+    def reload(cls, env_file: str = ".env") -> "BotConfig":
+        """
+        อ่านไฟล์ .env อีกครั้งแล้วสร้าง config ใหม่ (blocking, ทำงานใน executor)
+
+        ใช้กฎเดียวกับตอนเริ่ม (load_env_file): ค่าใน environment ของ process
+        มาก่อนค่าในไฟล์ และไม่แก้ os.environ (ค่าที่ผิดแล้วถูกลบออกจากไฟล์จึงไม่ค้างอยู่)
+
+        Raises:
+            ConfigError: ถ้ามีค่าที่ไม่ถูกต้อง
+        """
+        file_values = {
+            key: value for key, value in dotenv_values(env_file).items() if value is not None
+        }
+        process_env = os.environ if _process_env is None else _process_env
+        return cls.from_env({**file_values, **process_env})
+
+    def diff(self, other: "BotConfig") -> Dict[str, Tuple[Any, Any]]:
+        """
+        field ที่ค่าต่างกัน
+
+        Returns:
+            Dict[str, Tuple[Any, Any]]: ชื่อ environment variable -> (ค่าเดิม, ค่าใหม่)
+        """
+        return {
+            f.metadata["env"]: (getattr(self, f.name), getattr(other, f.name))
+            for f in fields(self)
+            if getattr(self, f.name) != getattr(other, f.name)
+        }
+
+    def with_live_values(self, other: "BotConfig") -> "BotConfig":
+        """
+        config ที่ใช้ค่าของ field ที่ live=True จาก other และค่าเดิมสำหรับ field อื่น
+
+        ใช้ตอน reload เพื่อให้ bot.config ตรงกับค่าที่มีผลอยู่จริง
+        (เช่นขนาด thread pool ไม่เปลี่ยนจนกว่าจะรีสตาร์ท)
+        """
+        return replace(
+            self,
+            **{f.name: getattr(other, f.name) for f in fields(self) if f.metadata["live"]},
+        )
+
+    @staticmethod
+    def is_live(env_name: str) -> bool:
+        """field ของ environment variable นี้มีผลทันทีเมื่อ reload หรือไม่"""
+        return any(
+            f.metadata["env"] == env_name and f.metadata["live"] for f in fields(BotConfig)
+        )
@@ -1,6 +1,6 @@
 from functools import wraps
 import logging
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 import discord
 
 logger = logging.getLogger(__name__)
@@ -19,7 +19,12 @@ def dev_command_error_handler():
                 # Update command history
                 if hasattr(self, '_history'):
                     action = kwargs.get('action', func.__name__)
-                    self._history.add(interaction.user, action, False)
+                    self._history.add(
+                        interaction.user.id,
+                        action,
+                        False,
+                        guild_id=interaction.guild_id,
+                    )
                 
                 # Send error message
                 try:
@@ -38,3 +43,27 @@ def dev_command_error_handler():
                     
         return wrapper
     return decorator
+
+
+def profiled(name: Optional[str] = None):
+    """
+    Decorator สำหรับให้ handler ถูกสุ่ม profile ผ่าน bot.profiler
+
+    ใช้กับ method ของ object ที่มี self.bot (คำสั่งและ cog)
+    ถ้าปิดการสุ่มอยู่ ต้นทุนคือการเช็คค่าเดียวต่อการเรียก
+
+    Args:
+        name: ชื่อที่ใช้รวมผล (ค่าเริ่มต้นคือ qualname เช่น RollCommand.execute)
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        async def wrapper(self, *args: Any, **kwargs: Any):
+            profiler = getattr(self.bot, "profiler", None)
+            if profiler is None or not profiler.sample_rate:
+                return await func(self, *args, **kwargs)
+            return await profiler.run(label, func(self, *args, **kwargs))
+
+        return wrapper
+    return decorator
@@ -1,5 +1,4 @@
 from typing import Optional
-import os
 import discord
 import logging
 
@@ -20,9 +19,21 @@ class DevModeMixin:
         
     @property
     def dev_guild_id(self) -> Optional[int]:
-        """ดึง Dev Guild ID จาก environment variable"""
-        dev_guild_id = os.getenv("DEV_GUILD_ID")
-        return int(dev_guild_id) if dev_guild_id else None
+        """Dev Guild ID จาก config ปัจจุบัน (DEV_GUILD_ID)"""
+        return self.config.dev_guild_id
+
+    def is_allowed_guild(self, guild: discord.Guild) -> bool:
+        """
+        ตรวจสอบว่าบอททำงานใน guild นี้ได้หรือไม่
+
+        Args:
+            guild: Discord guild ที่ต้องการตรวจสอบ
+
+        Returns:
+            bool: False ถ้าอยู่ใน Dev Mode และ guild ไม่ใช่ Dev Guild
+        """
+        dev_guild_id = self.dev_guild_id
+        return not self.dev_mode or not dev_guild_id or guild.id == dev_guild_id
         
     async def handle_dev_mode(self, guild: discord.Guild) -> bool:
         """
@@ -41,7 +52,7 @@ class DevModeMixin:
             logger.warning("⚠️ DEV_MODE เปิดอยู่แต่ไม่พบ DEV_GUILD_ID")
             return False
             
-        if guild.id != self.dev_guild_id:
+        if not self.is_allowed_guild(guild):
             logger.info(f"👋 ออกจาก guild {guild.name} (ID: {guild.id}) เนื่องจากอยู่ใน Dev Mode")
             await guild.leave()
             return True
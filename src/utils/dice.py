@@ -0,0 +1,396 @@
+# utils/dice.py
+
+import functools
+import math
+import os
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from src.utils.exceptions import DiceError
+
+# ขีดจำกัดเพื่อป้องกันนิพจน์ที่ใหญ่เกินไป
+MAX_EXPRESSION_LENGTH = 100
+MAX_TERMS = 20
+MAX_DICE = 10_000_000
+MAX_SIDES = 1_000_000
+MAX_EXPLOSIONS = 100  # จำนวนครั้งสูงสุดที่ลูกเต๋าหนึ่งลูกระเบิดต่อได้
+
+# ทอยทีละ batch เพื่อให้ใช้ memory คงที่ไม่ว่าจะทอยกี่ลูก
+BATCH_SIZE = 65_536
+# แสดงผลทีละลูกเฉพาะ term ที่มีลูกเต๋าไม่เกินจำนวนนี้
+DETAIL_LIMIT = 50
+# นิพจน์ที่มีลูกเต๋ามากกว่านี้ควรประมวลผลนอก event loop
+INLINE_DICE_LIMIT = 10_000
+
+_TERM = re.compile(
+    r"(?P<sign>[+-])"
+    r"(?:(?P<count>\d*)d(?P<sides>\d+|%)(?P<mods>(?:(?:kh|kl|k|dh|dl|d)\d+|!)*)"
+    r"|(?P<constant>\d+))"
+)
+_MODIFIER = re.compile(r"(kh|kl|k|dh|dl|d)(\d+)|!")
+# ช่องว่างรอบเครื่องหมาย + และ - (ช่องว่างตำแหน่งอื่นอาจทำให้ตัวเลขสองตัวติดกัน เช่น "4d6 3")
+_SPACED_SIGN = re.compile(r"\s*([+-])\s*")
+
+# ตัวสุ่มของ process นี้ (process ลูกที่ fork มาจะได้ตัวสุ่มใหม่ ไม่ซ้ำกับ process แม่)
+_rng: Optional[random.Random] = None
+_rng_pid: Optional[int] = None
+
+
+def _default_rng() -> random.Random:
+    global _rng, _rng_pid
+    pid = os.getpid()
+    if _rng is None or _rng_pid != pid:
+        _rng = random.Random()
+        _rng_pid = pid
+    return _rng
+
+
+@dataclass(frozen=True)
+class DiceTerm:
+    """ลูกเต๋าหนึ่งกลุ่ม เช่น 4d6kh3"""
+
+    sign: int
+    count: int
+    sides: int
+    keep: Optional[Tuple[str, int]] = None  # ("h" หรือ "l", จำนวนที่เก็บ)
+    explode: bool = False
+
+    @property
+    def kept_count(self) -> int:
+        return self.count if self.keep is None else self.keep[1]
+
+    @property
+    def notation(self) -> str:
+        text = f"{self.count}d{self.sides}"
+        if self.explode:
+            text += "!"
+        if self.keep is not None:
+            text += f"k{self.keep[0]}{self.keep[1]}"
+        return text
+
+    @property
+    def max_total(self) -> float:
+        """ผลรวมสูงสุดที่เป็นไปได้ของ term นี้ (ไม่คิดเครื่องหมาย)"""
+        return math.inf if self.explode else self.kept_count * self.sides
+
+
+@dataclass(frozen=True)
+class ConstantTerm:
+    """ค่าคงที่ในนิพจน์ เช่น +5"""
+
+    sign: int
+    value: int
+
+    @property
+    def notation(self) -> str:
+        return str(self.value)
+
+
+Term = Union[DiceTerm, ConstantTerm]
+
+
+@dataclass(frozen=True)
+class DiceStats:
+    """สถิติของลูกเต๋าทุกลูกใน term (ก่อนเลือกเก็บ)"""
+
+    count: int
+    total: int
+    minimum: int
+    maximum: int
+    mean: float
+    stdev: float
+    max_hits: int  # จำนวนลูกที่ทอยครั้งแรกได้หน้าสูงสุด
+    explosions: int
+
+
+@dataclass(frozen=True)
+class TermResult:
+    """ผลของ term หนึ่ง"""
+
+    term: Term
+    value: int  # ผลรวมของ term (รวมเครื่องหมายแล้ว)
+    rolls: Optional[Tuple[int, ...]] = None  # ค่าทีละลูก (เฉพาะ term เล็ก)
+    kept: Optional[Tuple[bool, ...]] = None  # ลูกที่ถูกเก็บ (ตรงกับ rolls)
+    stats: Optional[DiceStats] = None
+
+
+@dataclass(frozen=True)
+class RollResult:
+    """ผลการทอยของทั้งนิพจน์"""
+
+    expression: "DiceExpression"
+    total: int
+    terms: Tuple[TermResult, ...]
+
+    @property
+    def is_max(self) -> bool:
+        """ทอยได้ผลรวมสูงสุดที่เป็นไปได้หรือไม่"""
+        return self.total >= self.expression.max_total
+
+    @property
+    def is_detailed(self) -> bool:
+        """ทุก term มีค่าทีละลูกให้แสดงหรือไม่"""
+        return all(
+            r.rolls is not None for r in self.terms if isinstance(r.term, DiceTerm)
+        )
+
+
+class _RunningStats:
+    """รวมสถิติจาก histogram ของแต่ละ batch"""
+
+    __slots__ = ("count", "total", "sumsq", "minimum", "maximum", "max_hits", "explosions")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.sumsq = 0
+        self.minimum = math.inf
+        self.maximum = 0
+        self.max_hits = 0
+        self.explosions = 0
+
+    def add(self, histogram: Counter, max_hits: int, explosions: int) -> None:
+        for value, times in histogram.items():
+            self.total += value * times
+            self.sumsq += value * value * times
+        self.count += sum(histogram.values())
+        self.minimum = min(self.minimum, min(histogram))
+        self.maximum = max(self.maximum, max(histogram))
+        self.max_hits += max_hits
+        self.explosions += explosions
+
+    def result(self) -> DiceStats:
+        mean = self.total / self.count
+        variance = max(0.0, self.sumsq / self.count - mean * mean)
+        return DiceStats(
+            count=self.count,
+            total=self.total,
+            minimum=int(self.minimum),
+            maximum=self.maximum,
+            mean=mean,
+            stdev=math.sqrt(variance),
+            max_hits=self.max_hits,
+            explosions=self.explosions,
+        )
+
+
+def _stats_of(histogram: Counter, max_hits: int, explosions: int) -> DiceStats:
+    running = _RunningStats()
+    running.add(histogram, max_hits, explosions)
+    return running.result()
+
+
+def _kept_sum(histogram: Counter, keep: Tuple[str, int]) -> int:
+    """
+    ผลรวมของลูกที่เก็บ คำนวณจาก histogram ของค่า (ค่า -> จำนวนลูก)
+
+    ใช้เวลาและ memory ตามจำนวนค่าที่ไม่ซ้ำกัน ไม่ใช่จำนวนลูกที่ทอย
+    """
+    mode, remaining = keep
+    total = 0
+    for value in sorted(histogram, reverse=mode == "h"):
+        taken = min(remaining, histogram[value])
+        total += value * taken
+        remaining -= taken
+        if not remaining:
+            break
+    return total
+
+
+def _explode(rng: random.Random, sides: int, values: List[int]) -> int:
+    """ทอยเพิ่มให้ลูกที่ได้หน้าสูงสุด (แก้ values ในที่) คืนจำนวนครั้งที่ระเบิด"""
+    explosions = 0
+    for i, value in enumerate(values):
+        if value != sides:
+            continue
+        extra = sides
+        chain = 0
+        while extra == sides and chain < MAX_EXPLOSIONS:
+            extra = rng.randint(1, sides)
+            value += extra
+            chain += 1
+        values[i] = value
+        explosions += chain
+    return explosions
+
+
+def _roll_dice(term: DiceTerm, rng: random.Random) -> TermResult:
+    """ทอยลูกเต๋าหนึ่ง term แบบทีละ batch"""
+    faces = range(1, term.sides + 1)
+
+    if term.count <= DETAIL_LIMIT:
+        values = rng.choices(faces, k=term.count)
+        max_hits = values.count(term.sides)
+        explosions = _explode(rng, term.sides, values) if term.explode else 0
+
+        kept = [True] * term.count
+        if term.keep is not None:
+            mode, keep_n = term.keep
+            order = sorted(range(term.count), key=values.__getitem__, reverse=mode == "h")
+            for index in order[keep_n:]:
+                kept[index] = False
+
+        total = sum(v for v, k in zip(values, kept) if k)
+        stats = _stats_of(Counter(values), max_hits, explosions)
+        return TermResult(term, term.sign * total, tuple(values), tuple(kept), stats)
+
+    # histogram รวมทุก batch สำหรับคำนวณลูกที่เก็บ (เฉพาะ term ที่มี keep/drop)
+    histogram: Counter = Counter()
+    histogram_stats = _RunningStats()
+    remaining = term.count
+    while remaining:
+        batch = min(remaining, BATCH_SIZE)
+        remaining -= batch
+        values = rng.choices(faces, k=batch)
+        max_hits = values.count(term.sides)
+        explosions = _explode(rng, term.sides, values) if term.explode and max_hits else 0
+        batch_histogram = Counter(values)
+        if term.keep is not None:
+            histogram.update(batch_histogram)
+        histogram_stats.add(batch_histogram, max_hits, explosions)
+
+    stats = histogram_stats.result()
+    total = stats.total if term.keep is None else _kept_sum(histogram, term.keep)
+    return TermResult(term, term.sign * total, stats=stats)
+
+
+@dataclass(frozen=True)
+class DiceExpression:
+    """นิพจน์ลูกเต๋าที่ parse แล้ว (immutable จึง cache และส่งข้าม process ได้)"""
+
+    text: str
+    terms: Tuple[Term, ...]
+
+    @property
+    def dice_count(self) -> int:
+        """จำนวนลูกเต๋าทั้งหมดในนิพจน์"""
+        return sum(t.count for t in self.terms if isinstance(t, DiceTerm))
+
+    @property
+    def is_large(self) -> bool:
+        """นิพจน์ใหญ่พอที่ควรประมวลผลนอก event loop หรือไม่"""
+        return self.dice_count > INLINE_DICE_LIMIT
+
+    @property
+    def max_total(self) -> float:
+        """ผลรวมสูงสุดที่เป็นไปได้ของนิพจน์"""
+        total = 0.0
+        for term in self.terms:
+            if isinstance(term, ConstantTerm):
+                total += term.sign * term.value
+            elif term.sign > 0:
+                total += term.max_total
+            else:
+                total -= term.kept_count
+        return total
+
+    def evaluate(self, rng: Optional[random.Random] = None) -> RollResult:
+        """
+        ทอยลูกเต๋าตามนิพจน์
+
+        Args:
+            rng: ตัวสุ่มที่ใช้ (ถ้าไม่ระบุจะใช้ตัวสุ่มของ process ปัจจุบัน)
+
+        Returns:
+            RollResult: ผลการทอย
+        """
+        rng = rng or _default_rng()
+        results = []
+        for term in self.terms:
+            if isinstance(term, ConstantTerm):
+                results.append(TermResult(term, term.sign * term.value))
+            else:
+                results.append(_roll_dice(term, rng))
+        return RollResult(self, sum(r.value for r in results), tuple(results))
+
+
+def _parse_term(match: "re.Match") -> Term:
+    sign = -1 if match["sign"] == "-" else 1
+    if match["constant"] is not None:
+        return ConstantTerm(sign, int(match["constant"]))
+
+    count = int(match["count"] or 1)
+    sides = 100 if match["sides"] == "%" else int(match["sides"])
+    if not 1 <= count <= MAX_DICE:
+        raise DiceError(f"จำนวนลูกเต๋าต้องอยู่ระหว่าง 1 ถึง {MAX_DICE:,}")
+    if not 1 <= sides <= MAX_SIDES:
+        raise DiceError(f"จำนวนหน้าลูกเต๋าต้องอยู่ระหว่าง 1 ถึง {MAX_SIDES:,}")
+
+    keep = None
+    explode = False
+    for mod in _MODIFIER.finditer(match["mods"]):
+        if mod.group(0) == "!":
+            explode = True
+            continue
+        if keep is not None:
+            raise DiceError("ใช้ keep/drop ได้ครั้งเดียวต่อกลุ่มลูกเต๋า")
+        kind, amount = mod.group(1), int(mod.group(2))
+        if kind.startswith("k"):
+            if not 1 <= amount <= count:
+                raise DiceError(f"จำนวนลูกที่เก็บต้องอยู่ระหว่าง 1 ถึง {count:,}")
+            keep = ("l" if kind == "kl" else "h", amount)
+        else:
+            if not 0 <= amount < count:
+                raise DiceError(f"จำนวนลูกที่ทิ้งต้องน้อยกว่า {count:,}")
+            # ทิ้งลูกต่ำสุด = เก็บลูกสูงสุด และกลับกัน
+            keep = ("h" if kind in ("d", "dl") else "l", count - amount)
+
+    if explode and sides == 1:
+        raise DiceError("ลูกเต๋า 1 หน้าระเบิดไม่ได้")
+    if keep is not None and keep[1] == count:
+        keep = None
+    return DiceTerm(sign, count, sides, keep, explode)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(normalized: str) -> DiceExpression:
+    text = normalized if normalized[0] in "+-" else "+" + normalized
+    terms: List[Term] = []
+    position = 0
+    while position < len(text):
+        match = _TERM.match(text, position)
+        if match is None:
+            raise DiceError(f"นิพจน์ไม่ถูกต้องที่ตำแหน่ง {max(position, 1)}: `{normalized}`")
+        terms.append(_parse_term(match))
+        position = match.end()
+        if len(terms) > MAX_TERMS:
+            raise DiceError(f"นิพจน์มีได้ไม่เกิน {MAX_TERMS} ส่วน")
+
+    expression = DiceExpression(normalized, tuple(terms))
+    if expression.dice_count > MAX_DICE:
+        raise DiceError(f"ทอยได้รวมไม่เกิน {MAX_DICE:,} ลูก")
+    return expression
+
+
+def compile_expression(text: str) -> DiceExpression:
+    """
+    แปลงข้อความเป็นนิพจน์ลูกเต๋า (ผลลัพธ์ถูก cache ไว้)
+
+    รองรับ: NdS, d%, ค่าคงที่, +/-, kh/kl/k (เก็บสูง/ต่ำ), dh/dl/d (ทิ้งสูง/ต่ำ), ! (ระเบิด)
+    เช่น 4d6kh3, 100d20+5, 2d10!
+
+    Args:
+        text: นิพจน์ที่ผู้ใช้พิมพ์
+
+    Returns:
+        DiceExpression: นิพจน์ที่ parse แล้ว
+
+    Raises:
+        DiceError: ถ้านิพจน์ไม่ถูกต้องหรือเกินขีดจำกัด
+    """
+    normalized = _SPACED_SIGN.sub(r"\1", text.strip()).lower()
+    if any(char.isspace() for char in normalized):
+        raise DiceError("เว้นวรรคได้เฉพาะรอบเครื่องหมาย + หรือ - เช่น `4d6 + 3`")
+    if not normalized:
+        raise DiceError("กรุณาระบุนิพจน์ลูกเต๋า เช่น `2d6+3`")
+    if len(normalized) > MAX_EXPRESSION_LENGTH:
+        raise DiceError(f"นิพจน์ยาวได้ไม่เกิน {MAX_EXPRESSION_LENGTH} ตัวอักษร")
+    return _compile(normalized)
+
+
+def cache_info():
+    """สถิติของ cache นิพจน์ที่ compile แล้ว"""
+    return _compile.cache_info()
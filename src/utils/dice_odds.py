@@ -0,0 +1,262 @@
+# utils/dice_odds.py
+
+import itertools
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils.dice import ConstantTerm, DiceExpression, DiceTerm, MAX_EXPLOSIONS
+from src.utils.exceptions import DiceError
+
+# ขีดจำกัดของการคำนวณโอกาส (ตารางที่ใหญ่กว่านี้ใช้เวลาหลายวินาที)
+MAX_ODDS_DICE = 500
+MAX_ODDS_SIDES = 1000
+MAX_ODDS_TABLE = 50_000  # จำนวนผลรวมที่เป็นไปได้ของหนึ่ง term
+MAX_ODDS_COST = 30_000_000  # จำนวนการคำนวณโดยประมาณต่อ term (ไม่เกินราว 5 วินาที)
+
+# ตัดการระเบิดเมื่อโอกาสที่เหลือน้อยกว่านี้
+EXPLODE_TAIL = 1e-12
+
+# งานที่ประเมินแล้วใช้จำนวนการคำนวณเกินนี้ควรทำนอก event loop
+INLINE_ODDS_COST = 50_000
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """การแจกแจงความน่าจะเป็นของผลรวม (ค่าต่ำสุด offset, ความน่าจะเป็นเรียงตามค่า)"""
+
+    offset: int
+    probs: Tuple[float, ...]
+    cdf: Tuple[float, ...] = field(init=False, repr=False, compare=False)
+    mean: float = field(init=False, compare=False)
+    stdev: float = field(init=False, compare=False)
+
+    def __post_init__(self):
+        # คำนวณล่วงหน้าเพื่อให้ตอบคำถามแต่ละครั้งได้ใน O(1)
+        object.__setattr__(self, "cdf", tuple(itertools.accumulate(self.probs)))
+        mean = sum((self.offset + i) * p for i, p in enumerate(self.probs))
+        variance = sum((self.offset + i - mean) ** 2 * p for i, p in enumerate(self.probs))
+        object.__setattr__(self, "mean", mean)
+        object.__setattr__(self, "stdev", math.sqrt(max(0.0, variance)))
+
+    @property
+    def minimum(self) -> int:
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        return self.offset + len(self.probs) - 1
+
+    def at_most(self, value: int) -> float:
+        """P(ผลรวม <= value)"""
+        index = value - self.offset
+        if index < 0:
+            return 0.0
+        return min(1.0, self.cdf[min(index, len(self.cdf) - 1)])
+
+    def at_least(self, value: int) -> float:
+        """P(ผลรวม >= value)"""
+        return max(0.0, 1.0 - self.at_most(value - 1))
+
+    def exactly(self, value: int) -> float:
+        """P(ผลรวม == value)"""
+        index = value - self.offset
+        return self.probs[index] if 0 <= index < len(self.probs) else 0.0
+
+    def negate(self) -> "Distribution":
+        """การแจกแจงของ -X"""
+        return Distribution(-self.maximum, tuple(reversed(self.probs)))
+
+    def shift(self, amount: int) -> "Distribution":
+        """การแจกแจงของ X + amount"""
+        return Distribution(self.offset + amount, self.probs)
+
+
+def _convolve(a: Sequence[float], b: Sequence[float]) -> List[float]:
+    """convolution ของสองตาราง (O(len(a) * len(b)))"""
+    if len(a) < len(b):
+        a, b = b, a
+    result = [0.0] * (len(a) + len(b) - 1)
+    for j, q in enumerate(b):
+        if q == 0.0:
+            continue
+        for i, p in enumerate(a):
+            result[i + j] += p * q
+    return result
+
+
+def _uniform_sum(count: int, sides: int) -> List[float]:
+    """
+    ผลรวมของลูกเต๋า count ลูก sides หน้า ด้วยการ convolve กับลูกเต๋าทีละลูก
+
+    การ convolve กับการแจกแจงแบบสม่ำเสมอใช้ผลรวมสะสมแบบเลื่อนหน้าต่าง
+    จึงใช้ O(ความยาวตาราง) ต่อหนึ่งลูก
+    """
+    probs = [1.0]  # ผลรวมของลูกเต๋า 0 ลูก
+    inv = 1.0 / sides
+    padding = [0.0] * sides
+    for _ in range(count):
+        # new[i] = (sum(probs[:i + 1]) - sum(probs[:i + 1 - sides])) / sides
+        prefix = list(itertools.accumulate(probs))
+        padded = padding + prefix + [prefix[-1]] * (sides - 1)
+        probs = [(a - b) * inv for a, b in zip(padded[sides:], padded)]
+    return probs
+
+
+def _keep_sum(count: int, sides: int, mode: str, keep: int) -> Tuple[List[float], int]:
+    """
+    ผลรวมของลูกที่เก็บ keep ลูก (สูงสุดหรือต่ำสุด) จาก count ลูก
+
+    ไล่หน้าลูกเต๋าจากหน้าที่ถูกเก็บก่อน (สูงสุดสำหรับ kh) และนับจำนวนวิธีแบบ exact
+    โดย state คือ (จำนวนลูกที่กำหนดหน้าแล้ว, ผลรวมของลูกที่เก็บ)
+    ลูกที่ถูกกำหนดหน้าก่อน keep ลูกแรกคือลูกที่ถูกเก็บ
+    """
+    faces = range(sides, 0, -1) if mode == "h" else range(1, sides + 1)
+    states: Dict[Tuple[int, int], int] = {(0, 0): 1}
+    for face in faces:
+        next_states: Dict[Tuple[int, int], int] = {}
+        for (assigned, kept_sum), ways in states.items():
+            remaining = count - assigned
+            for j in range(remaining + 1):
+                kept_now = max(0, min(j, keep - assigned))
+                key = (assigned + j, kept_sum + kept_now * face)
+                next_states[key] = next_states.get(key, 0) + ways * math.comb(remaining, j)
+        states = next_states
+
+    totals: Dict[int, int] = {}
+    for (assigned, kept_sum), ways in states.items():
+        if assigned == count:
+            totals[kept_sum] = totals.get(kept_sum, 0) + ways
+
+    low, high = min(totals), max(totals)
+    outcomes = sides ** count
+    return [totals.get(value, 0) / outcomes for value in range(low, high + 1)], low
+
+
+def _exploding_die(sides: int) -> List[float]:
+    """การแจกแจงของลูกเต๋าระเบิดหนึ่งลูก (ตัดหางที่โอกาสน้อยกว่า EXPLODE_TAIL)"""
+    depth = min(MAX_EXPLOSIONS, math.ceil(-math.log(EXPLODE_TAIL) / math.log(sides)))
+    probs = [0.0] * (depth * sides + sides)
+    chance = 1.0 / sides
+    for m in range(depth + 1):
+        # ระเบิด m ครั้งแล้วได้หน้าที่ไม่ใช่หน้าสูงสุด
+        faces = range(1, sides) if m < depth else range(1, sides + 1)
+        for r in faces:
+            probs[m * sides + r - 1] = chance
+        chance /= sides
+    return probs
+
+
+def term_cost(term: DiceTerm) -> int:
+    """ประมาณจำนวนการคำนวณที่ต้องใช้สร้างตารางของ term"""
+    if term.explode:
+        width = _exploding_width(term.sides)
+        return term.count * term.count * width * width // 2
+    if term.keep is not None:
+        # หน้า x state (ลูกที่กำหนดแล้ว, ผลรวม) x จำนวนลูกที่ได้หน้านั้น
+        return term.sides * term.count * (term.keep[1] * term.sides) * term.count
+    return term.count * term.count * term.sides // 2
+
+
+def _exploding_width(sides: int) -> int:
+    depth = min(MAX_EXPLOSIONS, math.ceil(-math.log(EXPLODE_TAIL) / math.log(sides)))
+    return depth * sides + sides
+
+
+def validate(expression: DiceExpression) -> None:
+    """
+    ตรวจว่าคำนวณโอกาสของนิพจน์นี้ได้หรือไม่
+
+    Raises:
+        DiceError: ถ้านิพจน์ใหญ่เกินไปหรือใช้ modifier ที่ไม่รองรับ
+    """
+    for term in expression.terms:
+        if not isinstance(term, DiceTerm):
+            continue
+        if term.count > MAX_ODDS_DICE or term.sides > MAX_ODDS_SIDES:
+            raise DiceError(
+                f"คำนวณโอกาสได้ไม่เกิน {MAX_ODDS_DICE} ลูก {MAX_ODDS_SIDES} หน้าต่อกลุ่ม"
+            )
+        if term.count * (term.sides - 1) + 1 > MAX_ODDS_TABLE:
+            raise DiceError(f"`{term.notation}` มีผลรวมที่เป็นไปได้มากเกินไป")
+        if term.explode and term.keep is not None:
+            raise DiceError("ยังไม่รองรับการคำนวณโอกาสของลูกเต๋าระเบิดที่มี keep/drop")
+        if term_cost(term) > MAX_ODDS_COST:
+            raise DiceError(f"`{term.notation}` ใหญ่เกินกว่าจะคำนวณโอกาสได้")
+
+
+def term_distribution(
+    count: int, sides: int, keep: Optional[Tuple[str, int]] = None, explode: bool = False
+) -> Distribution:
+    """
+    การแจกแจงของผลรวมของลูกเต๋าหนึ่งกลุ่ม (ไม่คิดเครื่องหมาย)
+
+    เป็นฟังก์ชันระดับ module จึงส่งไปรันใน process pool ได้
+
+    Args:
+        count: จำนวนลูกเต๋า
+        sides: จำนวนหน้า
+        keep: ("h" หรือ "l", จำนวนที่เก็บ)
+        explode: ลูกเต๋าระเบิดหรือไม่
+
+    Returns:
+        Distribution: การแจกแจงของผลรวม
+    """
+    if keep is not None:
+        probs, low = _keep_sum(count, sides, keep[0], keep[1])
+        return Distribution(low, tuple(probs))
+
+    if explode:
+        die = _exploding_die(sides)
+        probs = [1.0]
+        for _ in range(count):
+            probs = _convolve(probs, die)
+        return Distribution(count, tuple(probs))
+
+    return Distribution(count, tuple(_uniform_sum(count, sides)))
+
+
+def combine(parts: Iterable[Tuple[int, Distribution]], constant: int = 0) -> Distribution:
+    """
+    รวมการแจกแจงของหลาย term เป็นของทั้งนิพจน์
+
+    Args:
+        parts: (เครื่องหมาย, การแจกแจง) ของแต่ละ term
+        constant: ผลรวมของค่าคงที่ในนิพจน์
+
+    Returns:
+        Distribution: การแจกแจงของทั้งนิพจน์
+    """
+    parts = list(parts)
+    if constant == 0 and len(parts) == 1 and parts[0][0] > 0:
+        return parts[0][1]
+
+    offset = constant
+    probs: List[float] = [1.0]
+    for sign, dist in parts:
+        if sign < 0:
+            dist = dist.negate()
+        offset += dist.offset
+        probs = _convolve(probs, dist.probs)
+    return Distribution(offset, tuple(probs))
+
+
+def combine_cost(expression: DiceExpression) -> int:
+    """ประมาณจำนวนการคำนวณของการรวมทุก term"""
+    width = 1
+    cost = 0
+    for term in expression.terms:
+        if isinstance(term, DiceTerm):
+            term_width = (
+                term.count * _exploding_width(term.sides)
+                if term.explode
+                else term.kept_count * (term.sides - 1) + 1
+            )
+            cost += width * term_width
+            width += term_width
+    return cost
+
+
+def constant_of(expression: DiceExpression) -> int:
+    """ผลรวมของค่าคงที่ในนิพจน์"""
+    return sum(t.sign * t.value for t in expression.terms if isinstance(t, ConstantTerm))
@@ -0,0 +1,123 @@
+# utils/drain.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class InteractionDrain:
+    """
+    ติดตาม interaction ที่กำลังทำงานและปิดรับ interaction ใหม่ก่อนปิดบอท
+
+    discord.py รันแต่ละ app command ใน task ของตัวเอง (CommandTree-invoker)
+    จึงติดตาม task นั้นตั้งแต่ interaction_check จนจบ ไม่ว่าจะสำเร็จหรือ error
+
+    เมื่อเริ่ม drain จะไม่รับ interaction ใหม่ (ผู้เรียกตอบกลับทันทีว่ากำลังรีสตาร์ท)
+    และรอ task ที่ค้างอยู่ไม่เกิน deadline วินาที
+    """
+
+    def __init__(self, deadline: float = 25.0):
+        self.deadline = deadline
+        self.draining = False
+        self._inflight: Set[asyncio.Task] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._forced = asyncio.Event()
+
+        self.started = 0
+        self.rejected = 0
+        self.abandoned = 0
+        self.drain_started_at: Optional[float] = None
+        self.drain_seconds: Optional[float] = None
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def track(self) -> bool:
+        """
+        ติดตาม task ปัจจุบันจนกว่าจะจบ (เรียกใน interaction_check)
+
+        Returns:
+            bool: False ถ้ากำลัง drain (ผู้เรียกต้องปฏิเสธ interaction)
+        """
+        if self.draining:
+            self.rejected += 1
+            return False
+
+        task = asyncio.current_task()
+        if task is None or task in self._inflight:
+            return True
+        self.started += 1
+        self._inflight.add(task)
+        self._idle.clear()
+        task.add_done_callback(self._on_done)
+        return True
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._inflight.discard(task)
+        if not self._inflight:
+            self._idle.set()
+
+    def force(self) -> None:
+        """เลิกรอ handler ที่ค้างอยู่ (เช่นได้รับสัญญาณปิดซ้ำ)"""
+        self._forced.set()
+
+    async def drain(self) -> bool:
+        """
+        ปิดรับ interaction ใหม่และรอ handler ที่กำลังทำงานจนจบหรือจนถึง deadline
+
+        Returns:
+            bool: True ถ้า handler ทั้งหมดจบทันเวลา
+        """
+        if not self.draining:
+            self.draining = True
+            self.drain_started_at = time.monotonic()
+        logger.info(
+            f"🚰 เริ่ม drain: รอ interaction ที่ค้างอยู่ {self.inflight} รายการ "
+            f"(ไม่เกิน {self.deadline:.0f}s)"
+        )
+
+        waiters = [
+            asyncio.create_task(self._idle.wait()),
+            asyncio.create_task(self._forced.wait()),
+        ]
+        try:
+            await asyncio.wait(
+                waiters, timeout=self.deadline, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+        self.drain_seconds = time.monotonic() - self.drain_started_at
+        if self._inflight:
+            self.abandoned = len(self._inflight)
+            names = ", ".join(sorted(task.get_name() for task in self._inflight))
+            logger.warning(
+                f"⏰ drain ไม่ทัน: ยังมี interaction ค้างอยู่ {self.abandoned} รายการ "
+                f"หลัง {self.drain_seconds:.1f}s ({names})"
+            )
+            return False
+
+        logger.info(
+            f"✅ drain เสร็จใน {self.drain_seconds:.1f}s "
+            f"(ปฏิเสธ interaction ใหม่ {self.rejected} รายการ)"
+        )
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        return {
+            "draining": self.draining,
+            "inflight": self.inflight,
+            "started": self.started,
+            "rejected": self.rejected,
+            "abandoned": self.abandoned,
+            "drain_seconds": (
+                round(self.drain_seconds, 2) if self.drain_seconds is not None else None
+            ),
+        }
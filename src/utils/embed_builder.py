@@ -1,18 +1,206 @@
 # utils/embed_builder.py
 
-from typing import Optional, Union, Any
-from datetime import datetime
+import copy
+import re
+import time
+from typing import Optional, Union, Any, Callable, Dict, Hashable, List, Tuple
+from datetime import datetime, timezone
 import discord
 from src.utils.ui_constants import UIConstants  # แก้ path import
 
+# slot ในข้อความของ template เช่น "{user}"
+_SLOT = re.compile(r"\{([a-z_]+)\}")
+_now_iso: List[Any] = [None, ""]
+
+
+def _utc_now_iso() -> str:
+    """เวลาปัจจุบันแบบ ISO 8601 (UTC) ละเอียดระดับวินาที คำนวณใหม่เมื่อวินาทีเปลี่ยน"""
+    second = int(time.time())
+    if second != _now_iso[0]:
+        _now_iso[0] = second
+        _now_iso[1] = datetime.fromtimestamp(second, timezone.utc).isoformat()
+    return _now_iso[1]
+
+
+class RenderedEmbed(discord.Embed):
+    """
+    Embed ที่ serialize ไว้แล้ว: to_dict() คืน payload ที่ render ได้โดยตรง
+
+    attribute ของ Embed (title, fields ฯลฯ) ถูกสร้างจาก payload เมื่อมีการอ่านหรือแก้ไขครั้งแรก
+    หลังจากนั้นทำงานเหมือน discord.Embed ปกติ
+    """
+
+    def __init__(self, payload: Dict[str, Any]):
+        object.__setattr__(self, "_payload", payload)
+        object.__setattr__(self, "_materialized", False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> discord.Embed:
+        # ใช้โดย Embed.copy(): สำเนาเป็น discord.Embed ปกติ
+        return discord.Embed.from_dict(data)
+
+    def _materialize(self) -> None:
+        if self.__dict__.get("_materialized", True):
+            return
+        object.__setattr__(self, "_materialized", True)
+        full = discord.Embed.from_dict(self._payload)
+        for slot in discord.Embed.__slots__:
+            try:
+                object.__setattr__(self, slot, object.__getattribute__(full, slot))
+            except AttributeError:
+                pass
+
+    def __getattr__(self, name: str) -> Any:
+        # ถูกเรียกเมื่อ attribute ของ Embed ยังไม่ถูกตั้ง
+        if name.startswith("__") or self.__dict__.get("_materialized", True):
+            raise AttributeError(name)
+        self._materialize()
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._materialize()
+        object.__setattr__(self, name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.__dict__.get("_materialized", True):
+            return self._payload
+        return super().to_dict()
+
+
+class EmbedTemplate:
+    """
+    embed ที่ compile เป็น payload (dict ที่ discord.py ส่ง) ไว้แล้ว พร้อม slot ที่เติมตอน render
+
+    การ render คือ copy แบบตื้นเฉพาะ container ที่มี slot แล้วเติมค่าด้วย str.format_map
+    ไม่ต้องสร้าง discord.Embed ใหม่และไม่ต้อง serialize ซ้ำตอนส่ง
+    """
+
+    def __init__(self, payload: Dict[str, Any], timestamped: bool = False):
+        payload = copy.deepcopy(payload)
+        payload.pop("timestamp", None)
+        self._payload = payload
+        self.timestamped = timestamped
+
+        # path ของ container -> [(key, format string)]
+        holes: Dict[Tuple[Any, ...], List[Tuple[Any, str]]] = {}
+        slots: set = set()
+        self._collect(payload, (), holes, slots)
+        self.slots = frozenset(slots)
+        self._holes = list(holes.items())
+
+        # container ที่ต้อง copy ก่อนเติมค่า (ตัวนอกก่อนตัวใน) ส่วนที่ไม่มี slot ใช้ร่วมกันได้
+        paths: Dict[Tuple[Any, ...], None] = {}
+        for path in holes:
+            for depth in range(1, len(path) + 1):
+                paths.setdefault(path[:depth])
+        self._copies = [
+            (path[:-1], path[-1], type(self._lookup(payload, path))) for path in paths
+        ]
+
+    @staticmethod
+    def _lookup(payload: Any, path: Tuple[Any, ...]) -> Any:
+        for key in path:
+            payload = payload[key]
+        return payload
+
+    @classmethod
+    def _collect(
+        cls,
+        value: Any,
+        path: Tuple[Any, ...],
+        holes: Dict[Tuple[Any, ...], List[Tuple[Any, str]]],
+        slots: set,
+    ) -> None:
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            if isinstance(value, str) and _SLOT.search(value):
+                # split ด้วย group: ตำแหน่งคี่คือชื่อ slot ส่วนข้อความอื่น escape วงเล็บปีกกา
+                pieces = _SLOT.split(value)
+                slots.update(pieces[1::2])
+                fmt = "".join(
+                    f"{{{piece}}}" if i % 2 else piece.replace("{", "{{").replace("}", "}}")
+                    for i, piece in enumerate(pieces)
+                )
+                holes.setdefault(path[:-1], []).append((path[-1], fmt))
+            return
+        for key, item in items:
+            cls._collect(item, path + (key,), holes, slots)
+
+    def render(self, timestamp: Optional[datetime] = None, **values: Any) -> RenderedEmbed:
+        """
+        เติมค่าลง slot
+
+        Args:
+            timestamp: เวลาของ embed (ค่าเริ่มต้นคือตอนนี้ ถ้า template มี timestamp)
+            **values: ค่าของแต่ละ slot (แปลงเป็น str)
+
+        Returns:
+            RenderedEmbed: embed ที่ส่งได้ทันที
+
+        Raises:
+            KeyError: ถ้าไม่ได้ส่งค่าของบาง slot
+        """
+        if not values.keys() >= self.slots:
+            missing = self.slots.difference(values)
+            raise KeyError(f"ไม่ได้ส่งค่าของ slot: {', '.join(sorted(missing))}")
+
+        payload = dict(self._payload)
+        lookup = self._lookup
+        for parent, key, kind in self._copies:
+            container = lookup(payload, parent)
+            container[key] = kind(container[key])
+        for path, entries in self._holes:
+            container = lookup(payload, path)
+            for key, fmt in entries:
+                container[key] = fmt.format_map(values)
+
+        if self.timestamped:
+            if timestamp is None:
+                payload["timestamp"] = _utc_now_iso()
+            else:
+                when = timestamp if timestamp.tzinfo else timestamp.astimezone()
+                payload["timestamp"] = when.astimezone(timezone.utc).isoformat()
+        return RenderedEmbed(payload)
+
 
 class EmbedBuilder:
     """Builder class สำหรับสร้าง Discord Embed"""
-    
+
+    # UIConstants มีแต่ค่าคงที่ ใช้ instance เดียวร่วมกัน
+    ui = UIConstants()
+    _templates: Dict[Hashable, EmbedTemplate] = {}
+
     def __init__(self):
         """สร้าง embed เปล่า"""
         self.embed = discord.Embed()
-        self.ui = UIConstants()
+
+    @classmethod
+    def template(
+        cls, key: Hashable, build: Callable[["EmbedBuilder"], "EmbedBuilder"]
+    ) -> EmbedTemplate:
+        """
+        template ที่ compile ไว้แล้วของ key (compile ด้วย build ในครั้งแรกที่ใช้)
+
+        ข้อความที่ส่งให้ builder ใส่ slot แบบ "{user}" ได้ และค่าที่เติมจะไม่ถูกตีความซ้ำ
+
+        Args:
+            key: key ของ template (รวมทุกอย่างที่ทำให้โครงของ embed ต่างกัน)
+            build: ฟังก์ชันที่รับ builder เปล่าแล้วคืน builder ที่ตั้งค่าแล้ว
+
+        Returns:
+            EmbedTemplate: template ของ key
+        """
+        template = cls._templates.get(key)
+        if template is None:
+            template = cls._templates[key] = build(cls()).compile()
+        return template
+
+    def compile(self) -> EmbedTemplate:
+        """compile embed ปัจจุบันเป็น template (ถ้าตั้ง timestamp ไว้ จะใช้เวลาตอน render)"""
+        return EmbedTemplate(self.embed.to_dict(), timestamped=self.embed.timestamp is not None)
     # Template Methods สำหรับ Embed ที่ใช้บ่อย
     @classmethod
     def create_welcome_embed(
@@ -31,26 +219,30 @@ class EmbedBuilder:
             guild_name: ชื่อเซิร์ฟเวอร์ (optional)
             thumbnail_url: URL รูปภาพขนาดเล็ก (optional)
         """
-        member_mention = member.mention if isinstance(member, discord.Member) else member
-        
-        builder = (
-            cls()
-            .set_title("ยินดีต้อนรับสมาชิกใหม่!", emoji="👋")
-            .set_description(
-                f"ยินดีต้อนรับ {member_mention} "
-                f"เข้าสู่{f'เซิร์ฟเวอร์ {guild_name}' if guild_name else 'เซิร์ฟเวอร์'}!"
+        is_member = isinstance(member, discord.Member)
+
+        def build(builder: "EmbedBuilder") -> "EmbedBuilder":
+            builder = (
+                builder
+                .set_title("ยินดีต้อนรับสมาชิกใหม่!", emoji="👋")
+                .set_description("ยินดีต้อนรับ {user} เข้าสู่{server}!")
+                .set_color("success")
+                .add_field("สมาชิกคนที่", "{count}", emoji="👥")
             )
-            .set_color("success")
-            .add_field("สมาชิกคนที่", str(member_count), emoji="👥")
+            if thumbnail_url:
+                builder.embed.set_thumbnail(url="{thumbnail}")
+            if is_member:
+                builder.set_footer("User ID: {user_id}")
+            return builder.set_timestamp()
+
+        template = cls.template(("welcome", bool(thumbnail_url), is_member), build)
+        return template.render(
+            user=member.mention if is_member else member,
+            server=f"เซิร์ฟเวอร์ {guild_name}" if guild_name else "เซิร์ฟเวอร์",
+            count=member_count,
+            thumbnail=thumbnail_url,
+            user_id=member.id if is_member else None,
         )
-        
-        if thumbnail_url:
-            builder.embed.set_thumbnail(url=thumbnail_url)
-            
-        if isinstance(member, discord.Member):
-            builder.set_footer(f"User ID: {member.id}")
-            
-        return builder.set_timestamp().build()
 
     @classmethod
     def create_help_embed(
@@ -69,23 +261,28 @@ class EmbedBuilder:
             user: ผู้ใช้ที่เรียกคำสั่ง (optional)
             command_count: จำนวนคำสั่งทั้งหมด (optional)
         """
-        builder = (
-            cls()
-            .set_title("คำสั่งที่ใช้ได้", emoji="❔")
-            .set_color("info")
-            .add_field("Prefix", prefix, emoji="⌨️", inline=True)
+        def build(builder: "EmbedBuilder") -> "EmbedBuilder":
+            builder = (
+                builder
+                .set_title("คำสั่งที่ใช้ได้", emoji="❔")
+                .set_color("info")
+                .add_field("Prefix", "{prefix}", emoji="⌨️", inline=True)
+            )
+            if description:
+                builder.set_description("{description}")
+            if command_count:
+                builder.add_field("จำนวนคำสั่ง", "{count}", emoji="📜", inline=True)
+            if user:
+                builder.set_footer("Requested by {user}")
+            return builder.set_timestamp()
+
+        key = ("help", bool(description), bool(command_count), bool(user))
+        return cls.template(key, build).render(
+            prefix=prefix,
+            description=description,
+            count=command_count,
+            user=user.name if user else None,
         )
-        
-        if description:
-            builder.set_description(description)
-            
-        if command_count:
-            builder.add_field("จำนวนคำสั่ง", str(command_count), emoji="📜", inline=True)
-            
-        if user:
-            builder.set_footer(f"Requested by {user.name}")
-            
-        return builder.set_timestamp().build()
 
     @classmethod
     def create_error_embed(
@@ -102,17 +299,20 @@ class EmbedBuilder:
             description: คำอธิบายข้อผิดพลาด
             error_details: รายละเอียดข้อผิดพลาดเพิ่มเติม (optional)
         """
-        builder = (
-            cls()
-            .set_title(title, emoji="❌")
-            .set_description(description)
-            .set_color("error")
+        def build(builder: "EmbedBuilder") -> "EmbedBuilder":
+            builder = (
+                builder
+                .set_title("{title}", emoji="❌")
+                .set_description("{description}")
+                .set_color("error")
+            )
+            if error_details:
+                builder.add_field("รายละเอียด", "{details}", emoji="ℹ️")
+            return builder.set_timestamp()
+
+        return cls.template(("error", bool(error_details)), build).render(
+            title=title, description=description, details=error_details
         )
-        
-        if error_details:
-            builder.add_field("รายละเอียด", error_details, emoji="ℹ️")
-            
-        return builder.set_timestamp().build()
 
     # Utility Methods
     def set_title(self, title: str, emoji: Optional[str] = None) -> "EmbedBuilder":
@@ -92,6 +92,10 @@ class GlobalErrorHandler:
         try:
             # Unwrap error จริง
             error = getattr(error, 'original', error)
+
+            # ทำเครื่องหมายให้ audit log รู้ว่าคำสั่งนี้ล้มเหลว
+            if isinstance(ctx, discord.Interaction):
+                ctx.extras["error"] = type(error).__name__
             
             # หา error data จาก mapping
             error_data = self._get_error_data(error)
@@ -155,15 +159,16 @@ class GlobalErrorHandler:
         error_data: ErrorData,
         error_message: str
     ) -> discord.Embed:
-        """สร้าง error embed"""
-        return (
-            EmbedBuilder()
-            .set_title(error_data.title)
-            .set_description(error_message)
+        """สร้าง error embed (จาก template ที่ compile ไว้ต่อสี)"""
+        template = EmbedBuilder.template(
+            ("error_handler", error_data.color),
+            lambda builder: builder
+            .set_title("{title}")
+            .set_description("{description}")
             .set_color(error_data.color)
-            .set_timestamp()
-            .build()
+            .set_timestamp(),
         )
+        return template.render(title=error_data.title, description=error_message)
         
     async def _send_error_response(
         self,
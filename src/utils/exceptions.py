@@ -20,3 +20,7 @@ class PermissionError(BotError):
     def __init__(self, message: str, missing_perms: list[str]):
         self.missing_perms = missing_perms
         super().__init__(message)
+
+class DiceError(UserError):
+    """Exception สำหรับนิพจน์ลูกเต๋าที่ไม่ถูกต้อง"""
+    pass
@@ -0,0 +1,300 @@
+# utils/gateway_session.py
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiohttp
+import discord
+import yarl
+from discord.errors import ConnectionClosed
+from discord.gateway import DiscordWebSocket
+from discord.state import ConnectionState
+
+logger = logging.getLogger(__name__)
+
+# จำนวน guild สูงสุดต่อหน้าของ GET /users/@me/guilds
+GUILDS_PAGE_SIZE = 200
+
+# RESUME ข้าม process ใช้ API ภายในของ discord.py ที่ตรวจแล้วกับ 2.4 (requirements.txt):
+# - แทนที่ DiscordWebSocket.from_client และส่ง gateway/session/sequence/resume เอง
+# - ConnectionState._add_guild_from_data สำหรับเติม guild จาก REST
+# - ConnectionState.call_handlers("ready") (Client._handle_ready) เพื่อปลด wait_until_ready
+# เวอร์ชันอื่นจะปิด RESUME ข้าม process และ IDENTIFY ตามปกติ
+VERIFIED_DISCORD_VERSION = (2, 4)
+_FROM_CLIENT_PARAMS = {"initial", "gateway", "shard_id", "session", "sequence", "resume"}
+
+
+@functools.lru_cache(maxsize=None)
+def supported() -> bool:
+    """
+    discord.py ที่ติดตั้งอยู่มี API ภายในที่ RESUME ข้าม process ต้องใช้หรือไม่
+    (ตรวจครั้งเดียว ถ้าไม่รองรับจะเขียน warning ครั้งเดียว)
+    """
+    version = (discord.version_info.major, discord.version_info.minor)
+    problem = None
+    if version != VERIFIED_DISCORD_VERSION:
+        problem = f"ตรวจแล้วกับ discord.py {'.'.join(map(str, VERIFIED_DISCORD_VERSION))} เท่านั้น"
+    elif _from_client is None or not _FROM_CLIENT_PARAMS <= set(
+        inspect.signature(DiscordWebSocket.from_client).parameters
+    ):
+        problem = "signature ของ DiscordWebSocket.from_client เปลี่ยนไป"
+    elif not all(
+        hasattr(ConnectionState, name) for name in ("_add_guild_from_data", "call_handlers")
+    ) or not hasattr(discord.Client, "_handle_ready"):
+        problem = "ไม่พบ API ภายในที่ใช้เติม cache หลัง RESUME"
+
+    if problem is not None:
+        logger.warning(
+            f"⚠️ ปิด RESUME ข้าม process ({problem}, พบ {discord.__version__}) จะ IDENTIFY ทุกครั้ง"
+        )
+        return False
+    return True
+
+
+@dataclass
+class SavedSession:
+    """gateway session ของ shard หนึ่งตัวที่บันทึกไว้ตอนปิดบอท"""
+
+    session_id: str
+    sequence: int
+    resume_url: str
+    saved_at: float
+
+
+class GatewaySessions:
+    """
+    บันทึก gateway session ตอนปิดบอทและ RESUME ต่อเมื่อรีสตาร์ทภายใน max_age วินาที
+
+    RESUME ไม่ต้องรอ GUILD_CREATE ของทุก guild และไม่ใช้ identify quota
+    แต่ Discord จะไม่ส่ง READY / GUILD_CREATE ให้ process ใหม่ cache จึงว่าง:
+    หลัง RESUMED จะเติม guild จาก REST (ทีละ 200 guild) แล้วถือว่าพร้อมใช้งาน
+    โดยช่อง, role และสมาชิกของ guild เดิมจะไม่อยู่ใน cache จนกว่าจะ IDENTIFY ใหม่
+    (interaction ใช้ได้ตามปกติเพราะข้อมูลที่ต้องใช้มากับ payload)
+
+    ถ้า RESUME ถูกปฏิเสธ (INVALID_SESSION) หรือเชื่อมต่อ resume URL ไม่ได้
+    discord.py จะ IDENTIFY ตามปกติ
+    """
+
+    def __init__(
+        self,
+        path: str = "data/gateway_session.json",
+        max_age: float = 0.0,
+        executor: Optional[Executor] = None,
+    ):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.executor = executor
+
+        self._saved: Dict[str, SavedSession] = {}
+        self._closing: Dict[str, SavedSession] = {}
+        self.identify_ready_ms: Optional[float] = None
+        self.ready_ms: Optional[float] = None
+        self.attempted = False
+        self.resumed = False
+        self.warmed_guilds = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0 and supported()
+
+    @property
+    def mode(self) -> str:
+        """วิธีเชื่อมต่อครั้งแรก: resume / identify / identify_fallback (resume ถูกปฏิเสธ)"""
+        if self.resumed:
+            return "resume"
+        return "identify_fallback" if self.attempted else "identify"
+
+    @staticmethod
+    def _key(shard_id: Optional[int]) -> str:
+        return str(shard_id or 0)
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    # ------------------------------------------------------------------
+    # ไฟล์
+    # ------------------------------------------------------------------
+
+    def _read(self) -> Dict[str, Any]:
+        """อ่านไฟล์และลบ session ออกจากไฟล์ทันที (blocking, ทำงานใน executor)"""
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        # ใช้ session ได้ครั้งเดียว: ถ้า process นี้ crash จะไม่ RESUME จาก sequence เก่าซ้ำ
+        self._write({"identify_ready_ms": data.get("identify_ready_ms")})
+        return data
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        """เขียนไฟล์แบบ atomic (blocking, ทำงานใน executor)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    async def load(self) -> None:
+        """โหลด session ที่บันทึกไว้ (เฉพาะที่อายุไม่เกิน max_age)"""
+        if not self.enabled or not self.path.exists():
+            return
+        try:
+            data = await self._run_blocking(self._read)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ อ่าน gateway session ไม่สำเร็จ: {e}")
+            return
+
+        self.identify_ready_ms = data.get("identify_ready_ms")
+        now = time.time()
+        for key, entry in (data.get("shards") or {}).items():
+            session = SavedSession(**entry)
+            age = now - session.saved_at
+            if age > self.max_age:
+                logger.info(f"⌛ ข้าม gateway session ของ shard {key} (อายุ {age:.0f}s)")
+                continue
+            self._saved[key] = session
+
+    async def flush(self) -> None:
+        """เขียน session ที่เก็บได้ตอนปิด connection ลงไฟล์"""
+        if not self._closing:
+            return
+        data = {
+            "identify_ready_ms": self.identify_ready_ms,
+            "shards": {key: asdict(session) for key, session in self._closing.items()},
+        }
+        try:
+            await self._run_blocking(self._write, data)
+            logger.info(f"💾 บันทึก gateway session {len(self._closing)} shard สำหรับ RESUME")
+        except OSError as e:
+            logger.error(f"❌ บันทึก gateway session ไม่สำเร็จ: {e}")
+
+    # ------------------------------------------------------------------
+    # connection
+    # ------------------------------------------------------------------
+
+    def take(self, shard_id: Optional[int]) -> Optional[SavedSession]:
+        """
+        หยิบ session ที่บันทึกไว้ของ shard (ใช้ได้ครั้งเดียว)
+
+        Args:
+            shard_id: shard ที่กำลังเชื่อมต่อ
+
+        Returns:
+            Optional[SavedSession]: session หรือ None ถ้าไม่มี
+        """
+        session = self._saved.pop(self._key(shard_id), None)
+        if session is not None:
+            self.attempted = True
+        return session
+
+    def keep_resumable(self, ws: DiscordWebSocket) -> None:
+        """
+        ให้การปิด websocket ครั้งถัดไปเก็บ session ไว้และไม่ทำให้ session ถูกยกเลิก
+
+        Client.close() ปิดด้วย code 1000 ซึ่ง Discord จะยกเลิก session ทันที
+        จึงเปลี่ยนเป็น 4000 และเก็บ sequence ล่าสุด ณ ตอนปิดจริง
+
+        Args:
+            ws: websocket ของ shard
+        """
+        original_close = ws.close
+
+        async def close(code: int = 4000) -> None:
+            if ws.session_id and ws.sequence is not None:
+                self._closing[self._key(ws.shard_id)] = SavedSession(
+                    session_id=ws.session_id,
+                    sequence=ws.sequence,
+                    resume_url=str(ws.gateway),
+                    saved_at=time.time(),
+                )
+            await original_close(code=4000)
+
+        ws.close = close
+
+    async def warm_cache(self, client: Any) -> int:
+        """
+        เติม guild ลง cache จาก REST หลัง RESUME ข้าม process
+
+        Args:
+            client: บอทที่ RESUME สำเร็จ
+
+        Returns:
+            int: จำนวน guild ที่เติม
+        """
+        state = client._connection
+        after = None
+        count = 0
+        while True:
+            page = await client.http.get_guilds(GUILDS_PAGE_SIZE, after=after, with_counts=True)
+            for data in page:
+                # GuildStats ใช้ member_count ซึ่ง endpoint นี้ให้เป็นค่าประมาณ
+                data.setdefault("member_count", data.get("approximate_member_count"))
+                state._add_guild_from_data(data)
+            count += len(page)
+            if len(page) < GUILDS_PAGE_SIZE:
+                break
+            after = page[-1]["id"]
+        self.warmed_guilds = count
+        return count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "ready_ms": self.ready_ms,
+            "identify_ready_ms": self.identify_ready_ms,
+            "warmed_guilds": self.warmed_guilds,
+        }
+
+
+# None ถ้า from_client ไม่ใช่ classmethod (discord.py เวอร์ชันที่ไม่รองรับ)
+_from_client = getattr(DiscordWebSocket.from_client, "__func__", None)
+
+
+async def _from_client_with_resume(cls, client, **kwargs):
+    """DiscordWebSocket.from_client ที่ RESUME ด้วย session ที่บันทึกไว้ในการเชื่อมต่อครั้งแรก"""
+    sessions = getattr(client, "gateway_sessions", None)
+    saved = None
+    if isinstance(sessions, GatewaySessions) and kwargs.get("initial"):
+        saved = sessions.take(kwargs.get("shard_id"))
+    if saved is None:
+        return await _from_client(cls, client, **kwargs)
+
+    logger.info(
+        f"🔁 RESUME gateway session ของ shard {kwargs.get('shard_id') or 0} "
+        f"(seq {saved.sequence}, บันทึกไว้ {time.time() - saved.saved_at:.0f}s ก่อน)"
+    )
+    try:
+        return await _from_client(
+            cls,
+            client,
+            **{
+                **kwargs,
+                "gateway": yarl.URL(saved.resume_url),
+                "session": saved.session_id,
+                "sequence": saved.sequence,
+                "resume": True,
+            },
+        )
+    except (OSError, aiohttp.ClientError, asyncio.TimeoutError, ConnectionClosed) as e:
+        logger.warning(f"⚠️ เชื่อมต่อ resume URL ไม่สำเร็จ ({e}) จะ IDENTIFY แทน")
+        return await _from_client(cls, client, **kwargs)
+
+
+def install() -> bool:
+    """
+    ให้ discord.py ลอง RESUME ด้วย session ที่บันทึกไว้ก่อน IDENTIFY (เรียกซ้ำได้)
+
+    Returns:
+        bool: False ถ้า discord.py เวอร์ชันนี้ไม่รองรับ (ไม่แก้อะไรและ IDENTIFY ตามปกติ)
+    """
+    if not supported():
+        return False
+    DiscordWebSocket.from_client = classmethod(_from_client_with_resume)
+    return True
@@ -0,0 +1,146 @@
+# utils/guild_stats.py
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class GuildStats:
+    """
+    ยอดรวมของ guilds (จำนวน guild, จำนวนสมาชิก, สมาชิกต่อ shard)
+    ที่ปรับทีละ guild จาก events แทนการวนทุก guild ทุกครั้งที่อ่าน
+
+    การอ่านค่าเป็น O(1) ส่วนการ re-baseline (วนทุก guild) ทำเป็นระยะ
+    เพื่อแก้ค่าที่คลาดเคลื่อนจาก event ที่หลุดไป
+    """
+
+    def __init__(self, rebaseline_interval: float = 600.0):
+        self.rebaseline_interval = rebaseline_interval
+        # guild_id -> (shard_id, member_count)
+        self._guilds: Dict[int, Tuple[int, int]] = {}
+        self._members = 0
+        self._shard_members: Dict[int, int] = {}
+        self._shard_guilds: Dict[int, int] = {}
+        self.last_drift = 0
+        self.rebaselines = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def guild_count(self) -> int:
+        return len(self._guilds)
+
+    @property
+    def member_count(self) -> int:
+        return self._members
+
+    def members_for_shard(self, shard_id: int) -> int:
+        return self._shard_members.get(shard_id, 0)
+
+    def _adjust_shard(self, shard_id: int, guilds: int, members: int) -> None:
+        self._shard_guilds[shard_id] = self._shard_guilds.get(shard_id, 0) + guilds
+        self._shard_members[shard_id] = self._shard_members.get(shard_id, 0) + members
+        if self._shard_guilds[shard_id] <= 0:
+            del self._shard_guilds[shard_id]
+            del self._shard_members[shard_id]
+
+    def update_guild(self, guild: discord.Guild) -> None:
+        """
+        เพิ่มหรือปรับยอดของ guild หนึ่งตัว (ใช้ได้ทั้งตอน join และเมื่อสมาชิกเปลี่ยน)
+
+        Args:
+            guild: guild ที่ต้องการปรับยอด
+        """
+        members = guild.member_count or 0
+        previous = self._guilds.get(guild.id)
+        if previous is not None:
+            shard_id, old_members = previous
+            self._members -= old_members
+            self._adjust_shard(shard_id, -1, -old_members)
+
+        self._guilds[guild.id] = (guild.shard_id, members)
+        self._members += members
+        self._adjust_shard(guild.shard_id, 1, members)
+
+    def remove_guild(self, guild: discord.Guild) -> None:
+        """
+        ลบ guild ออกจากยอดรวม
+
+        Args:
+            guild: guild ที่บอทออกไปแล้ว
+        """
+        previous = self._guilds.pop(guild.id, None)
+        if previous is None:
+            return
+        shard_id, members = previous
+        self._members -= members
+        self._adjust_shard(shard_id, -1, -members)
+
+    def rebaseline(self, guilds: Iterable[discord.Guild]) -> int:
+        """
+        คำนวณยอดรวมใหม่ทั้งหมด (O(guilds))
+
+        Args:
+            guilds: guilds ทั้งหมดที่บอทอยู่
+
+        Returns:
+            int: ผลต่างของจำนวนสมาชิกระหว่างยอดเดิมกับยอดที่คำนวณใหม่
+        """
+        previous = self._members
+        self._guilds.clear()
+        self._members = 0
+        self._shard_members.clear()
+        self._shard_guilds.clear()
+        for guild in guilds:
+            self.update_guild(guild)
+
+        self.last_drift = self._members - previous
+        self.rebaselines += 1
+        return self.last_drift
+
+    async def _run(self, bot) -> None:
+        while True:
+            await asyncio.sleep(self.rebaseline_interval)
+            if not bot.is_ready():
+                continue
+            drift = self.rebaseline(bot.guilds)
+            if drift:
+                logger.warning(f"⚠️ ยอดสมาชิกคลาดเคลื่อน {drift:+,} คน (ปรับแล้ว)")
+
+    def start(self, bot) -> None:
+        """เริ่ม re-baseline เป็นระยะเบื้องหลัง"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(bot), name="guild-stats-rebaseline")
+
+    async def stop(self) -> None:
+        """หยุด re-baseline เบื้องหลัง"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปยอดรวมสำหรับ metrics"""
+        return {
+            "guilds": len(self._guilds),
+            "members": self._members,
+            "shards": {
+                shard_id: {
+                    "guilds": self._shard_guilds[shard_id],
+                    "members": self._shard_members[shard_id],
+                }
+                for shard_id in sorted(self._shard_guilds)
+            },
+            "last_drift": self.last_drift,
+            "rebaselines": self.rebaselines,
+        }
+
+    def format_summary(self) -> str:
+        """สรุปยอดรวมเป็นข้อความสั้นๆ"""
+        return f"เซิร์ฟเวอร์: {len(self._guilds):,}\nผู้ใช้: {self._members:,}"
@@ -0,0 +1,291 @@
+# utils/latency_monitor.py
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# route ที่ใช้ตอบ interaction ครั้งแรก (defer / send_message)
+ACK_ROUTE = "POST /interactions/{id}/{token}/callback"
+
+
+def render_sparkline(values: Sequence[Optional[float]]) -> str:
+    """
+    แปลงลำดับค่าเป็นกราฟข้อความแบบย่อ
+
+    Args:
+        values: ค่าที่ต้องการแสดง (None คือช่วงที่ไม่มีข้อมูล แสดงเป็น "·")
+
+    Returns:
+        str: กราฟ เช่น "▁▁▂▁▇▁"
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return "·" * len(values)
+    low, high = min(present), max(present)
+    scale = (len(SPARK_CHARS) - 1) / (high - low) if high > low else 0
+    return "".join(
+        "·" if v is None else SPARK_CHARS[int((v - low) * scale)] for v in values
+    )
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """สรุปค่า latency ในช่วงเวลาหนึ่ง (หน่วย ms)"""
+
+    count: int
+    minimum: float
+    average: float
+    p95: float
+    last: float
+
+    def format(self) -> str:
+        return f"{self.minimum:.0f}/{self.average:.0f}/{self.p95:.0f}ms"
+
+
+class LatencySeries:
+    """
+    Ring buffer ขนาดคงที่ของค่า latency พร้อมเวลาที่วัด
+
+    เก็บใน array ของ double จึงไม่สร้าง object ต่อ sample
+    """
+
+    def __init__(self, capacity: int = 360, clock: Callable[[], float] = time.monotonic):
+        if capacity <= 0:
+            raise ValueError("capacity ต้องมากกว่า 0")
+        self.capacity = capacity
+        self._clock = clock
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value_ms: float, timestamp: Optional[float] = None) -> None:
+        """
+        เพิ่ม sample ใหม่ (ถ้าเต็มจะทับ sample ที่เก่าที่สุด)
+
+        Args:
+            value_ms: ค่า latency (ms)
+            timestamp: เวลาที่วัด (ค่าจาก clock) ถ้าไม่ระบุใช้เวลาปัจจุบัน
+        """
+        self._times[self._next] = self._clock() if timestamp is None else timestamp
+        self._values[self._next] = value_ms
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def window(self, seconds: float) -> List[Tuple[float, float]]:
+        """
+        sample ในช่วง seconds วินาทีล่าสุด เรียงจากเก่าไปใหม่
+
+        Returns:
+            List[Tuple[float, float]]: (เวลา, ค่า)
+        """
+        since = self._clock() - seconds
+        result = []
+        # ไล่จากใหม่ไปเก่าและหยุดเมื่อเจอ sample ที่เก่ากว่าช่วง
+        for i in range(self._size):
+            index = (self._next - 1 - i) % self.capacity
+            at = self._times[index]
+            if at < since:
+                break
+            result.append((at, self._values[index]))
+        result.reverse()
+        return result
+
+    def coverage(self, seconds: float) -> float:
+        """
+        ช่วงเวลาที่ sample ในบัฟเฟอร์ครอบคลุมจริงภายใน seconds วินาทีล่าสุด
+
+        ถ้าบัฟเฟอร์เต็มและ sample เก่าสุดยังอยู่ในช่วง (ค่าเข้ามาถี่จน sample เก่าถูกทับ)
+        จะได้ค่าน้อยกว่า seconds
+        """
+        if self._size < self.capacity:
+            return seconds
+        oldest = self._times[self._next]
+        return min(seconds, self._clock() - oldest)
+
+    def summary(self, seconds: float = 3600) -> Optional[LatencySummary]:
+        """สรุป min/avg/p95 ในช่วงเวลาที่ระบุ คืน None ถ้าไม่มี sample"""
+        samples = self.window(seconds)
+        if not samples:
+            return None
+        values = sorted(value for _, value in samples)
+        p95_index = min(len(values) - 1, math.ceil(len(values) * 0.95) - 1)
+        return LatencySummary(
+            count=len(values),
+            minimum=values[0],
+            average=sum(values) / len(values),
+            p95=values[p95_index],
+            last=samples[-1][1],
+        )
+
+    def sparkline(self, seconds: float = 3600, width: int = 24) -> str:
+        """
+        กราฟข้อความแบบย่อของค่าเฉลี่ยในแต่ละช่วงย่อย
+
+        Args:
+            seconds: ช่วงเวลาทั้งหมด
+            width: จำนวนช่วงย่อย (ตัวอักษร)
+
+        Returns:
+            str: กราฟ เช่น "▁▁▂▁▇▁" (ช่วงที่ไม่มี sample แสดงเป็น "·")
+        """
+        now = self._clock()
+        start = now - seconds
+        sums = [0.0] * width
+        counts = [0] * width
+        for at, value in self.window(seconds):
+            bucket = min(width - 1, int((at - start) / seconds * width))
+            sums[bucket] += value
+            counts[bucket] += 1
+
+        return render_sparkline([s / c if c else None for s, c in zip(sums, counts)])
+
+
+class LatencyMonitor:
+    """
+    วัด latency ของบอทเป็นระยะเบื้องหลัง
+
+    - heartbeat: latency ของ gateway แยกตาม shard
+    - rest: เวลาไป-กลับของ REST request ที่เบาที่สุด (GET /users/@me)
+    - ack: เวลาของ request ที่ตอบ interaction ครั้งแรก (วัดจากทุกคำสั่งจริง)
+    """
+
+    def __init__(self, bot, interval: float = 30.0, capacity: int = 360):
+        self.bot = bot
+        self.interval = interval
+        self.capacity = capacity
+        self.heartbeat: Dict[int, LatencySeries] = {}
+        self.rest = LatencySeries(capacity)
+        self.ack = LatencySeries(capacity * 4)
+        self._task: Optional[asyncio.Task] = None
+
+    def _heartbeat_series(self, shard_id: int) -> LatencySeries:
+        series = self.heartbeat.get(shard_id)
+        if series is None:
+            series = self.heartbeat[shard_id] = LatencySeries(self.capacity)
+        return series
+
+    def record_request(self, route: str, status: int, elapsed_ms: float) -> None:
+        """รับ REST request ที่เสร็จแล้วจาก RateLimitMonitor เพื่อเก็บ ack latency"""
+        if route == ACK_ROUTE and status < 400:
+            self.ack.add(elapsed_ms)
+
+    def sample_heartbeat(self) -> None:
+        """เก็บ heartbeat latency ปัจจุบันของทุก shard"""
+        latencies = getattr(self.bot, "latencies", None) or [
+            (self.bot.shard_id or 0, self.bot.latency)
+        ]
+        for shard_id, latency in latencies:
+            if math.isfinite(latency):
+                self._heartbeat_series(shard_id or 0).add(latency * 1000)
+
+    async def probe_rest(self) -> float:
+        """วัดเวลาไป-กลับของ REST request หนึ่งครั้ง (ms)"""
+        start = time.perf_counter()
+        with self.bot.ratelimits.tag("latency_probe"):
+            await self.bot.http.get_user("@me")
+        elapsed = (time.perf_counter() - start) * 1000
+        self.rest.add(elapsed)
+        return elapsed
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            self.sample_heartbeat()
+            try:
+                await self.probe_rest()
+            except Exception as e:
+                logger.warning(f"⚠️ วัด REST latency ไม่สำเร็จ: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """เริ่มวัด latency เบื้องหลัง"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="latency-monitor")
+
+    async def stop(self) -> None:
+        """หยุดวัด latency"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def heartbeat_median(self, seconds: float = 300) -> Optional[float]:
+        """ค่ากลางของ heartbeat ทุก shard ในช่วงล่าสุด (ใช้ประเมินสถานะ)"""
+        values = sorted(
+            value
+            for series in self.heartbeat.values()
+            for _, value in series.window(seconds)
+        )
+        if not values:
+            return None
+        return values[len(values) // 2]
+
+    def _all_series(self) -> List[Tuple[str, LatencySeries]]:
+        series = [
+            (f"Heartbeat #{shard_id}" if len(self.heartbeat) > 1 else "Heartbeat", s)
+            for shard_id, s in sorted(self.heartbeat.items())
+        ]
+        series.append(("REST", self.rest))
+        series.append(("Ack", self.ack))
+        return series
+
+    def format_summary(self, seconds: float = 3600, width: int = 24) -> str:
+        """
+        สรุป min/avg/p95 พร้อม sparkline ของทุก series
+
+        Args:
+            seconds: ช่วงเวลาที่สรุป
+            width: ความกว้างของ sparkline
+
+        Returns:
+            str: ข้อความหลายบรรทัด
+        """
+        lines = []
+        for name, series in self._all_series():
+            summary = series.summary(seconds)
+            if summary is None:
+                lines.append(f"{name}: ยังไม่มีข้อมูล")
+                continue
+            coverage = series.coverage(seconds)
+            if coverage < seconds:
+                # บัฟเฟอร์ไม่พอสำหรับทั้งช่วง (เช่น ack ตอนมีคำสั่งถี่) บอกช่วงที่ครอบคลุมจริง
+                label = f"n={summary.count} ล่าสุด ~{coverage / 60:.0f} นาที"
+            else:
+                label = f"n={summary.count}"
+            lines.append(f"{name}: {summary.format()} ({label})")
+            lines.append(series.sparkline(seconds, width))
+        return "\n".join(lines)
+
+    def snapshot(self, seconds: float = 3600) -> Dict[str, Any]:
+        """สรุปผลสำหรับ metrics"""
+        data = {}
+        for name, series in self._all_series():
+            summary = series.summary(seconds)
+            data[name.lower().replace(" #", "_")] = (
+                None
+                if summary is None
+                else {
+                    "count": summary.count,
+                    "min_ms": round(summary.minimum, 2),
+                    "avg_ms": round(summary.average, 2),
+                    "p95_ms": round(summary.p95, 2),
+                    "last_ms": round(summary.last, 2),
+                    "coverage_s": round(series.coverage(seconds), 1),
+                }
+            )
+        return data
@@ -0,0 +1,273 @@
+# utils/log_sampling.py
+
+import fnmatch
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.exceptions import UserError
+
+logger = logging.getLogger(__name__)
+
+# จำนวน message key สูงสุดที่จำสถานะ rate limit ไว้ (เกินแล้วเริ่มนับใหม่ทั้งหมด)
+MAX_KEYS = 1000
+
+
+def _parse_level(text: str) -> int:
+    level = logging.getLevelName(text.strip().upper())
+    if not isinstance(level, int):
+        raise UserError(f"ไม่รู้จักระดับ log `{text}`")
+    return level
+
+
+@dataclass
+class SampleRule:
+    """เก็บ log 1 ใน every รายการของ logger ที่ตรง pattern ที่ระดับ level ลงไป"""
+
+    pattern: str
+    level: int
+    every: int
+    seen: int = 0
+    dropped: int = 0
+
+    def describe(self) -> str:
+        return f"{self.pattern}:{logging.getLevelName(self.level)}:{self.every}"
+
+
+@dataclass
+class RateLimit:
+    """เก็บ log ได้ไม่เกิน limit รายการต่อ per วินาทีต่อ message key"""
+
+    pattern: str
+    level: int
+    limit: int
+    per: float
+    dropped: int = 0
+    # message key -> [เริ่มช่วงเวลา, จำนวนที่เก็บ, จำนวนที่ทิ้ง]
+    windows: Dict[str, List[float]] = field(default_factory=dict, repr=False)
+
+    def describe(self) -> str:
+        return f"{self.pattern}:{logging.getLevelName(self.level)}:{self.limit}/{self.per:g}"
+
+
+class LogSampler(logging.Filter):
+    """
+    ลดปริมาณ log ของ hot path โดยไม่ปิด log ทั้งหมด
+
+    - sampling: logger ที่ตรง pattern (เช่น "src.commands.*") ที่ระดับ level ลงไป
+      เก็บ 1 ใน N รายการ
+    - rate limit: ต่อ message key (ค่า extra={"log_key": ...} หรือตำแหน่งที่เรียก log)
+      เก็บได้ไม่เกิน N รายการต่อช่วงเวลา รายการแรกหลังช่วงที่ถูกทิ้งจะบอกจำนวนที่ข้ามไป
+
+    ติดตั้งเป็น filter ของ handler ทุกตัวของ root logger จึงตัดได้ก่อนจัดรูปแบบและเขียนลงไฟล์
+    ผลการตัดสินจำไว้บน record เพื่อให้ทุก handler เห็นผลเดียวกัน
+    กฎที่ใช้คือกฎที่ pattern ตรงและยาวที่สุด
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sampling: Dict[str, SampleRule] = {}
+        self.rate_limits: Dict[str, RateLimit] = {}
+        self._rules: Dict[str, Tuple[Optional[SampleRule], Optional[RateLimit]]] = {}
+        self._handlers: List[logging.Handler] = []
+
+    @classmethod
+    def from_env(cls, sampling: str = "", rate_limits: str = "") -> "LogSampler":
+        """
+        สร้างจากค่าใน environment
+
+        Args:
+            sampling: กฎคั่นด้วย comma รูปแบบ pattern:LEVEL:N
+                เช่น "src.commands.*:INFO:100"
+            rate_limits: กฎคั่นด้วย comma รูปแบบ pattern:LEVEL:N/วินาที
+                เช่น "src.cogs.event_handler:INFO:5/60"
+
+        Returns:
+            LogSampler: sampler ที่ตั้งกฎแล้ว (กฎที่ผิดรูปแบบถูกข้ามพร้อม warning)
+        """
+        sampler = cls()
+        sampler.load(sampling, rate_limits)
+        return sampler
+
+    def load(self, sampling: str, rate_limits: str) -> None:
+        """แทนที่กฎทั้งหมดด้วยกฎจากข้อความรูปแบบเดียวกับ from_env"""
+        self.clear()
+        for text, apply in ((sampling, self._parse_sampling), (rate_limits, self._parse_limit)):
+            for entry in filter(None, (part.strip() for part in text.split(","))):
+                try:
+                    apply(entry)
+                except UserError as e:
+                    logger.warning(f"⚠️ ข้ามกฎ log `{entry}`: {e.message}")
+
+    @staticmethod
+    def _split(entry: str) -> Tuple[str, int, str]:
+        try:
+            pattern, level, value = entry.rsplit(":", 2)
+        except ValueError:
+            raise UserError("กฎต้องอยู่ในรูปแบบ pattern:LEVEL:ค่า") from None
+        return pattern.strip(), _parse_level(level), value.strip()
+
+    def _parse_sampling(self, entry: str) -> None:
+        pattern, level, value = self._split(entry)
+        if not value.isdigit():
+            raise UserError("ค่าของ sampling ต้องเป็นจำนวนเต็ม N (เก็บ 1 ใน N)")
+        self.set_sampling(pattern, level, int(value))
+
+    def _parse_limit(self, entry: str) -> None:
+        pattern, level, value = self._split(entry)
+        self.set_rate_limit(pattern, level, *self.parse_limit(value))
+
+    @staticmethod
+    def parse_limit(value: str) -> Tuple[int, float]:
+        """
+        แปลงค่า rate limit รูปแบบ N/วินาที
+
+        Raises:
+            UserError: ถ้ารูปแบบไม่ถูกต้อง
+        """
+        try:
+            limit, per = value.split("/")
+            return int(limit), float(per)
+        except ValueError:
+            raise UserError("rate limit ต้องอยู่ในรูปแบบ N/วินาที เช่น 5/60") from None
+
+    # ------------------------------------------------------------------
+    # กฎ
+    # ------------------------------------------------------------------
+
+    def set_sampling(self, pattern: str, level: int, every: int) -> None:
+        """
+        ตั้งกฎ sampling (every <= 1 = ลบกฎ)
+
+        Raises:
+            UserError: ถ้า pattern ว่าง
+        """
+        if not pattern:
+            raise UserError("ต้องระบุ pattern ของ logger")
+        if every <= 1:
+            self.sampling.pop(pattern, None)
+        else:
+            self.sampling[pattern] = SampleRule(pattern, level, every)
+        self._rules.clear()
+
+    def set_rate_limit(self, pattern: str, level: int, limit: int, per: float) -> None:
+        """
+        ตั้งกฎ rate limit (limit <= 0 = ลบกฎ)
+
+        Raises:
+            UserError: ถ้า pattern ว่างหรือช่วงเวลาไม่ถูกต้อง
+        """
+        if not pattern:
+            raise UserError("ต้องระบุ pattern ของ logger")
+        if limit <= 0:
+            self.rate_limits.pop(pattern, None)
+        elif per <= 0:
+            raise UserError("ช่วงเวลาของ rate limit ต้องมากกว่า 0")
+        else:
+            self.rate_limits[pattern] = RateLimit(pattern, level, limit, per)
+        self._rules.clear()
+
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """
+        ลบกฎทั้งหมดของ pattern (None = ทุกกฎ)
+
+        Returns:
+            int: จำนวนกฎที่ลบ
+        """
+        removed = 0
+        for rules in (self.sampling, self.rate_limits):
+            for key in [key for key in rules if pattern is None or key == pattern]:
+                del rules[key]
+                removed += 1
+        self._rules.clear()
+        return removed
+
+    def _rules_for(self, name: str) -> Tuple[Optional[SampleRule], Optional[RateLimit]]:
+        rules = self._rules.get(name)
+        if rules is None:
+            rules = self._rules[name] = (
+                self._best(self.sampling, name),
+                self._best(self.rate_limits, name),
+            )
+        return rules
+
+    @staticmethod
+    def _best(rules: Dict[str, Any], name: str) -> Any:
+        matches = [pattern for pattern in rules if fnmatch.fnmatchcase(name, pattern)]
+        return rules[max(matches, key=len)] if matches else None
+
+    # ------------------------------------------------------------------
+    # filter
+    # ------------------------------------------------------------------
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        decision = record.__dict__.get("_sampled")
+        if decision is None:
+            decision = record._sampled = self._decide(record)
+        return decision
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        if not self.sampling and not self.rate_limits:
+            return True
+        sample, limit = self._rules_for(record.name)
+
+        if sample is not None and record.levelno <= sample.level:
+            sample.seen += 1
+            if (sample.seen - 1) % sample.every:
+                sample.dropped += 1
+                return False
+
+        if limit is not None and record.levelno <= limit.level:
+            return self._within_limit(limit, record)
+        return True
+
+    def _within_limit(self, limit: RateLimit, record: logging.LogRecord) -> bool:
+        key = getattr(record, "log_key", None) or f"{record.name}:{record.lineno}"
+        now = time.monotonic()
+        window = limit.windows.get(key)
+        if window is None or now - window[0] >= limit.per:
+            if window is None and len(limit.windows) >= MAX_KEYS:
+                limit.windows.clear()
+            skipped = int(window[2]) if window is not None else 0
+            limit.windows[key] = [now, 1, 0]
+            if skipped:
+                record.msg = f"{record.getMessage()} (ข้ามข้อความนี้ไป {skipped} ครั้งก่อนหน้า)"
+                record.args = None
+            return True
+        if window[1] < limit.limit:
+            window[1] += 1
+            return True
+        window[2] += 1
+        limit.dropped += 1
+        return False
+
+    # ------------------------------------------------------------------
+    # ติดตั้ง
+    # ------------------------------------------------------------------
+
+    def install(self, target: Optional[logging.Logger] = None) -> None:
+        """เพิ่ม filter ให้ทุก handler ของ logger (ค่าเริ่มต้นคือ root)"""
+        for handler in (target or logging.getLogger()).handlers:
+            if self not in handler.filters:
+                handler.addFilter(self)
+                self._handlers.append(handler)
+
+    def uninstall(self) -> None:
+        """ถอด filter ออกจาก handler ที่ติดตั้งไว้"""
+        for handler in self._handlers:
+            handler.removeFilter(self)
+        self._handlers.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปกฎและจำนวนที่ทิ้งสำหรับ metrics"""
+        return {
+            "sampling": {
+                rule.describe(): {"seen": rule.seen, "dropped": rule.dropped}
+                for rule in self.sampling.values()
+            },
+            "rate_limits": {
+                rule.describe(): {"keys": len(rule.windows), "dropped": rule.dropped}
+                for rule in self.rate_limits.values()
+            },
+        }
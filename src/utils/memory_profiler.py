@@ -0,0 +1,294 @@
+# utils/memory_profiler.py
+
+import asyncio
+import linecache
+import logging
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from src.utils.exceptions import UserError
+
+logger = logging.getLogger(__name__)
+
+# ตัดการจองหน่วยความจำของเครื่องมือเองและของ import system ออกจากผล
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+KEY_TYPES = ("lineno", "traceback", "filename")
+MAX_FRAMES = 64
+
+
+def format_bytes(size: float, signed: bool = False) -> str:
+    """แปลงจำนวน byte เป็นข้อความ (signed=True ใส่ + หน้าค่าบวก สำหรับค่าที่เปลี่ยน)"""
+    sign = "+" if signed and size > 0 else ""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+@dataclass
+class SnapshotInfo:
+    """snapshot หนึ่งครั้งที่เก็บไว้เทียบ"""
+
+    label: str
+    taken_at: float
+    traced_bytes: int
+    snapshot: tracemalloc.Snapshot = field(repr=False)
+
+
+@dataclass
+class GrowthSite:
+    """ตำแหน่งที่หน่วยความจำเปลี่ยนระหว่างสอง snapshot"""
+
+    location: str
+    size_diff: int
+    count_diff: int
+    size: int
+
+
+@dataclass
+class MemoryDiff:
+    """ผลการเทียบ snapshot"""
+
+    before: str
+    after: str
+    seconds: float
+    total_diff: int
+    total: int
+    top: List[GrowthSite]
+    report_file: Path
+    compute_ms: float
+
+
+class MemoryProfiler:
+    """
+    จับ snapshot ของ tracemalloc ตามคำสั่งและหาตำแหน่งที่หน่วยความจำโตขึ้น
+
+    tracemalloc ทำให้การจองหน่วยความจำทุกครั้งช้าลง จึงเปิดเฉพาะตอนตรวจสอบ
+    การจับ snapshot และการเทียบ (ต้องไล่ trace ทั้งหมด) ทำใน executor
+    รายงานฉบับเต็มเขียนลงไฟล์ ส่วน Discord แสดงเฉพาะอันดับต้นๆ
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        report_dir: str = "logs/memory",
+        max_snapshots: int = 4,
+    ):
+        self.executor = executor
+        self.report_dir = Path(report_dir)
+        self._snapshots: Deque[SnapshotInfo] = deque(maxlen=max_snapshots)
+        self._lock = asyncio.Lock()
+        self.frames = 0
+        self.started_at: Optional[float] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @property
+    def snapshots(self) -> List[SnapshotInfo]:
+        return list(self._snapshots)
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _require_tracing(self) -> None:
+        if not self.tracing:
+            raise UserError("ยังไม่ได้เริ่ม tracemalloc ใช้ `/dev memory start` ก่อน")
+
+    def start(self, frames: int = 1) -> None:
+        """
+        เริ่ม tracemalloc
+
+        Args:
+            frames: จำนวน frame ของ traceback ที่เก็บต่อการจอง (มากขึ้น = ละเอียดขึ้นแต่ช้าลง)
+
+        Raises:
+            UserError: ถ้ากำลัง trace อยู่แล้วหรือ frames ไม่ถูกต้อง
+        """
+        if self.tracing:
+            raise UserError(f"tracemalloc ทำงานอยู่แล้ว ({self.frames} frames)")
+        if not 1 <= frames <= MAX_FRAMES:
+            raise UserError(f"frames ต้องอยู่ระหว่าง 1 ถึง {MAX_FRAMES}")
+
+        tracemalloc.start(frames)
+        self.frames = frames
+        self.started_at = time.time()
+        self._snapshots.clear()
+        logger.warning(f"🔬 เริ่ม tracemalloc ({frames} frames) การจองหน่วยความจำจะช้าลง")
+
+    def stop(self) -> None:
+        """หยุด tracemalloc และทิ้ง snapshot ทั้งหมด"""
+        if not self.tracing:
+            return
+        tracemalloc.stop()
+        self._snapshots.clear()
+        self.started_at = None
+        logger.info("🔬 หยุด tracemalloc แล้ว")
+
+    def _take(self, label: str) -> SnapshotInfo:
+        """จับ snapshot (blocking, ทำงานใน executor)"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        return SnapshotInfo(label, time.time(), traced, snapshot)
+
+    async def take_snapshot(self, label: Optional[str] = None) -> SnapshotInfo:
+        """
+        จับ snapshot และเก็บไว้เป็นจุดเทียบ (เก็บเฉพาะล่าสุดไม่เกิน max_snapshots)
+
+        Args:
+            label: ชื่อของ snapshot (ค่าเริ่มต้นคือลำดับ)
+
+        Returns:
+            SnapshotInfo: snapshot ที่จับได้
+
+        Raises:
+            UserError: ถ้ายังไม่ได้เริ่ม tracemalloc
+        """
+        self._require_tracing()
+        async with self._lock:
+            info = await self._run_blocking(
+                self._take, label or f"#{len(self._snapshots) + 1}"
+            )
+            self._snapshots.append(info)
+        logger.info(
+            f"📸 จับ snapshot {info.label}: {format_bytes(info.traced_bytes)} ที่ถูก trace"
+        )
+        return info
+
+    def _compare(
+        self,
+        before: SnapshotInfo,
+        after: SnapshotInfo,
+        key_type: str,
+        limit: int,
+        context: Dict[str, Any],
+    ) -> MemoryDiff:
+        """เทียบ snapshot และเขียนรายงานฉบับเต็ม (blocking, ทำงานใน executor)"""
+        started = time.perf_counter()
+        stats = after.snapshot.compare_to(before.snapshot, key_type)
+        # เรียงตามการเติบโต (compare_to เรียงตามค่าสัมบูรณ์ ซึ่งรวมส่วนที่ลดลงด้วย)
+        stats.sort(key=lambda s: (s.size_diff, s.count_diff), reverse=True)
+
+        top = [
+            GrowthSite(
+                str(s.traceback[0]) if s.traceback else "?", s.size_diff, s.count_diff, s.size
+            )
+            for s in stats[:limit]
+            if s.size_diff > 0
+        ]
+        total_diff = sum(s.size_diff for s in stats)
+        total = sum(s.size for s in stats)
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(after.taken_at).strftime("%Y-%m-%d_%H%M%S")
+        report_file = self.report_dir / f"memory_diff_{stamp}.txt"
+        with open(report_file, "w", encoding="utf-8") as f:
+            f.write(f"tracemalloc diff {before.label} -> {after.label}\n")
+            f.write(f"ช่วงเวลา: {after.taken_at - before.taken_at:.1f}s\n")
+            f.write(f"frames: {self.frames}  key_type: {key_type}\n")
+            f.write(f"รวม: {format_bytes(total)} ({format_bytes(total_diff, signed=True)})\n")
+            for name, value in context.items():
+                f.write(f"{name}: {value}\n")
+            f.write("\n")
+            for rank, stat in enumerate(stats, 1):
+                if not stat.size_diff and not stat.count_diff:
+                    continue
+                f.write(
+                    f"#{rank} {format_bytes(stat.size_diff, signed=True):>12} "
+                    f"({stat.count_diff:+d} blocks) now {format_bytes(stat.size)} "
+                    f"in {stat.count} blocks\n"
+                )
+                for line in stat.traceback.format(most_recent_first=True):
+                    f.write(f"    {line}\n")
+
+        return MemoryDiff(
+            before=before.label,
+            after=after.label,
+            seconds=after.taken_at - before.taken_at,
+            total_diff=total_diff,
+            total=total,
+            top=top,
+            report_file=report_file,
+            compute_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    async def diff(
+        self,
+        key_type: str = "lineno",
+        limit: int = 10,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> MemoryDiff:
+        """
+        จับ snapshot ใหม่แล้วเทียบกับ snapshot ก่อนหน้า
+
+        Args:
+            key_type: จัดกลุ่มตาม lineno / traceback / filename
+            limit: จำนวนตำแหน่งที่โตขึ้นมากที่สุดที่คืนกลับ
+            context: ข้อมูลเพิ่มเติมที่เขียนไว้หัวรายงาน (เช่นขนาด cache)
+
+        Returns:
+            MemoryDiff: ผลการเทียบ
+
+        Raises:
+            UserError: ถ้ายังไม่ได้เริ่ม tracemalloc หรือยังไม่มี snapshot ให้เทียบ
+        """
+        self._require_tracing()
+        if key_type not in KEY_TYPES:
+            raise UserError(f"key_type ต้องเป็นหนึ่งใน {', '.join(KEY_TYPES)}")
+        if not self._snapshots:
+            raise UserError("ยังไม่มี snapshot ให้เทียบ ใช้ `/dev memory snapshot` ก่อน")
+
+        before = self._snapshots[-1]
+        after = await self.take_snapshot()
+        async with self._lock:
+            result = await self._run_blocking(
+                self._compare, before, after, key_type, limit, context or {}
+            )
+        logger.info(
+            f"🔬 memory diff {result.before} -> {result.after}: "
+            f"{format_bytes(result.total_diff, signed=True)} ({result.compute_ms:.0f}ms) "
+            f"รายงานที่ {result.report_file}"
+        )
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        if not self.tracing:
+            return {"tracing": False}
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "frames": self.frames,
+            "since": self.started_at,
+            "snapshots": len(self._snapshots),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        }
+
+    def format_summary(self) -> str:
+        """สรุปสถานะเป็นข้อความสั้นๆ"""
+        data = self.snapshot()
+        if not data["tracing"]:
+            return "tracemalloc: ปิดอยู่"
+        return (
+            f"tracemalloc: {data['frames']} frames, {data['snapshots']} snapshots\n"
+            f"traced {format_bytes(data['traced_bytes'])} "
+            f"(peak {format_bytes(data['peak_bytes'])}, "
+            f"overhead {format_bytes(data['overhead_bytes'])})"
+        )
@@ -0,0 +1,276 @@
+# utils/offload.py
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.utils.latency_monitor import LatencySeries
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], args: tuple, kwargs: dict) -> Tuple[float, float, T]:
+    """
+    เรียก func ใน worker พร้อมบันทึกเวลาเริ่มและเวลาเสร็จ
+
+    ใช้ time.time() เพราะต้องเทียบเวลาข้าม process ได้
+    """
+    started = time.time()
+    result = func(*args, **kwargs)
+    return started, time.time(), result
+
+
+def _name_of(func: Callable) -> str:
+    if isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, "__qualname__", repr(func))
+
+
+def _series_max(series: LatencySeries, seconds: float) -> float:
+    return max((value for _, value in series.window(seconds)), default=0.0)
+
+
+class PoolStats:
+    """
+    สถิติการใช้งาน pool หนึ่งตัว
+
+    นับจาก done callback ของ future งานจึงถูกนับว่าเสร็จเมื่อ worker ทำเสร็จจริง
+    (ไม่ใช่เมื่อผู้เรียกเลิกรอเพราะหมดเวลาหรือถูกยกเลิก) callback ทำงานใน worker thread
+    จึงแก้ค่าภายใต้ lock
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        # งานที่ถูกยกเลิกก่อนเริ่มรัน (ผู้เรียกเลิกรอขณะงานยังอยู่ในคิว)
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # งานที่ถูกส่งเข้ามาตอนที่ worker ไม่ว่างทุกตัว (ต้องรอคิว)
+        self.saturated = 0
+        self.queue_wait = LatencySeries(512)
+        self.run_time = LatencySeries(512)
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        future: Future,
+        submitted: float,
+        timing: Callable[[Future], Tuple[float, float]],
+    ) -> None:
+        """
+        นับงานที่เพิ่งส่งเข้า pool และบันทึกผลเมื่องานจบ
+
+        Args:
+            future: future ที่ได้จาก pool.submit
+            submitted: เวลาที่ส่งงาน (time.time())
+            timing: ฟังก์ชันที่คืน (เวลาเริ่ม, เวลาเสร็จ) ของงานที่สำเร็จ
+        """
+        with self._lock:
+            if self.in_flight >= self.workers:
+                self.saturated += 1
+            self.submitted += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        future.add_done_callback(functools.partial(self._finish, submitted, timing))
+
+    def _finish(
+        self,
+        submitted: float,
+        timing: Callable[[Future], Tuple[float, float]],
+        future: Future,
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.exception() is not None:
+                self.failed += 1
+            else:
+                started, finished = timing(future)
+                self.completed += 1
+                self.queue_wait.add(max(0.0, started - submitted) * 1000)
+                self.run_time.add((finished - started) * 1000)
+
+    def snapshot(self, seconds: float = 3600) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot(seconds)
+
+    def _snapshot(self, seconds: float) -> Dict[str, Any]:
+        data = {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturated": self.saturated,
+        }
+        for name, series in (("queue_wait", self.queue_wait), ("run_time", self.run_time)):
+            summary = series.summary(seconds)
+            data[name] = (
+                None
+                if summary is None
+                else {
+                    "avg_ms": round(summary.average, 2),
+                    "p95_ms": round(summary.p95, 2),
+                    "max_ms": round(_series_max(series, seconds), 2),
+                }
+            )
+        return data
+
+
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor ที่เก็บ PoolStats ของทุกงาน
+
+    นับทั้งงานจาก Offloader.run และงานที่ส่งตรงผ่าน loop.run_in_executor
+    (audit log, roll stats, profiler ฯลฯ) เพราะทุกทางผ่าน submit
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.stats = PoolStats(max_workers)
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future:
+        times: list = []
+
+        def call() -> T:
+            times.append(time.time())
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                times.append(time.time())
+
+        submitted = time.time()
+        future = super().submit(call)
+        self.stats.track(future, submitted, lambda _: (times[0], times[1]))
+        return future
+
+
+def _process_timing(future: Future) -> Tuple[float, float]:
+    started, finished, _ = future.result()
+    return started, finished
+
+
+class Offloader:
+    """
+    ส่งงานที่ blocking หรือใช้ CPU หนักไปทำนอก event loop
+
+    - thread pool: งาน I/O หรือไลบรารีที่ปล่อย GIL (ไฟล์, psutil, รูปภาพ)
+    - process pool: งานคำนวณล้วน (สร้างเมื่อใช้ครั้งแรกด้วย spawn
+      เพื่อไม่ fork process ที่มี thread อยู่, ปิดได้ด้วย processes=0)
+    """
+
+    def __init__(self, threads: int = 3, processes: int = 2):
+        self.thread_pool = InstrumentedThreadPool(threads, thread_name_prefix="offload")
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._warned_no_process = False
+        self.stats: Dict[str, PoolStats] = {"thread": self.thread_pool.stats}
+        if processes > 0:
+            self.stats["process"] = PoolStats(processes)
+
+    def _pool(self, process: bool) -> Tuple[str, Executor]:
+        if not process:
+            return "thread", self.thread_pool
+        if self.processes <= 0:
+            if not self._warned_no_process:
+                self._warned_no_process = True
+                logger.warning(
+                    "⚠️ ปิด process pool อยู่ (OFFLOAD_PROCESSES=0) "
+                    "งานคำนวณหนักจะรันใน thread pool และแย่ง GIL กับ event loop"
+                )
+            return "thread", self.thread_pool
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"🧮 เปิด process pool ({self.processes} workers)")
+        return "process", self._process_pool
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        process: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        """
+        รัน func ใน pool และรอผลโดยไม่บล็อก event loop
+
+        Args:
+            func: ฟังก์ชันที่ต้องการรัน (ถ้า process=True ต้อง pickle ได้)
+            *args: arguments ของ func
+            timeout: เวลาสูงสุดที่รอ (วินาที)
+            process: ใช้ process pool สำหรับงานคำนวณล้วน
+                (ถ้าปิด process pool ไว้จะใช้ thread pool แทนพร้อม warning)
+            **kwargs: keyword arguments ของ func
+
+        Returns:
+            ผลลัพธ์ของ func
+
+        Raises:
+            asyncio.TimeoutError: ถ้าเกิน timeout
+            Exception: ข้อผิดพลาดจาก func
+        """
+        kind, pool = self._pool(process)
+        stats = self.stats[kind]
+
+        if kind == "thread":
+            # InstrumentedThreadPool นับสถิติเอง
+            future = pool.submit(func, *args, **kwargs)
+        else:
+            submitted = time.time()
+            future = pool.submit(_timed_call, func, args, kwargs)
+            stats.track(future, submitted, _process_timing)
+
+        try:
+            # การยกเลิกหรือหมดเวลาจะยกเลิกงานที่ยังอยู่ในคิวด้วย
+            # (งานที่เริ่มรันไปแล้วหยุดกลางทางไม่ได้ และยังนับเป็น in_flight จนกว่าจะเสร็จ)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"⏱️ งาน {_name_of(func)} ใน {kind} pool เกิน {timeout}s")
+            raise
+        return result if kind == "thread" else result[2]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สถิติของทุก pool สำหรับ metrics"""
+        return {kind: stats.snapshot() for kind, stats in self.stats.items()}
+
+    def format_summary(self) -> str:
+        """สรุปสถิติเป็นข้อความสั้นๆ"""
+        lines = []
+        for kind, stats in self.snapshot().items():
+            wait = stats["queue_wait"]
+            run = stats["run_time"]
+            lines.append(
+                f"{kind}: {stats['in_flight']}/{stats['workers']} busy, "
+                f"{stats['completed']:,} done, {stats['saturated']:,} queued"
+            )
+            if wait and run:
+                lines.append(
+                    f"  wait p95 {wait['p95_ms']:.1f}ms, run p95 {run['p95_ms']:.1f}ms"
+                )
+        return "\n".join(lines)
+
+    def shutdown(self) -> None:
+        """ปิดทุก pool โดยยกเลิกงานที่ยังไม่เริ่ม"""
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,419 @@
+# utils/profiler.py
+
+import asyncio
+import cProfile
+import logging
+import pstats
+import random
+import time
+import types
+from collections import Counter
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, TypeVar
+
+from src.utils.exceptions import UserError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (filename, line, function) -> (primitive calls, calls, tottime, cumtime, callers)
+RawStats = Dict[Tuple[str, int, str], Tuple[int, int, float, float, Dict[Any, Any]]]
+
+MAX_SESSION_SECONDS = 300
+MAX_STACK_DEPTH = 64
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    """ชื่อ frame แบบสั้นสำหรับรายงาน (ไม่มี ; เพราะใช้คั่น frame ใน collapsed stack)"""
+    filename, line, name = func
+    if filename == "~":  # builtin
+        return name.replace(";", ",")
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: RawStats, min_us: float = 1.0) -> Counter:
+    """
+    แปลงผลของ cProfile เป็น collapsed stack (ใช้กับ flamegraph.pl / speedscope)
+
+    cProfile เก็บเฉพาะเส้นเรียก caller -> callee จึงแบ่งเวลาของแต่ละฟังก์ชัน
+    ไปตาม stack ตามสัดส่วนของเวลาที่ถูกเรียกจากแต่ละ caller (แบบเดียวกับ flameprof)
+
+    Args:
+        stats: dict จาก Profile.snapshot_stats / pstats.Stats.stats
+        min_us: ตัดเส้นทางที่ใช้เวลาน้อยกว่านี้ (ไมโครวินาที)
+
+    Returns:
+        Counter: "frame;frame;frame" -> เวลาที่ใช้เอง (ไมโครวินาที)
+    """
+    children: Dict[Any, Dict[Any, float]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, {})[func] = edge[3]
+
+    out: Counter = Counter()
+
+    def walk(func, path: List[str], seen: set, scale: float) -> None:
+        _, _, tottime, cumtime, _ = stats[func]
+        key = ";".join(path)
+        if len(path) >= MAX_STACK_DEPTH:
+            out[key] += round(cumtime * scale * 1e6)
+            return
+        out[key] += round(tottime * scale * 1e6)
+        for child, edge_time in children.get(func, {}).items():
+            child_cumtime = stats[child][3]
+            path_time = edge_time * scale
+            if child in seen or child_cumtime <= 0 or path_time * 1e6 < min_us:
+                continue
+            seen.add(child)
+            path.append(_label(child))
+            walk(child, path, seen, path_time / child_cumtime)
+            path.pop()
+            seen.discard(child)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, [_label(func)], {func}, 1.0)
+
+    return Counter({stack: us for stack, us in out.items() if us > 0})
+
+
+class _StatsSnapshot:
+    """ผลของ cProfile ที่คัดลอกออกมาแล้ว (ให้ pstats.Stats โหลดได้โดยไม่แตะ Profile)"""
+
+    def __init__(self, stats: RawStats):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def _freeze(profile: cProfile.Profile) -> _StatsSnapshot:
+    """คัดลอกผลของ profile (ต้องเรียกใน event loop ตอนที่ profile ไม่ได้ทำงาน)"""
+    profile.create_stats()
+    return _StatsSnapshot(profile.stats)
+
+
+@dataclass
+class FunctionCost:
+    """เวลาของฟังก์ชันหนึ่งในผล profile"""
+
+    name: str
+    calls: int
+    own_ms: float
+    total_ms: float
+
+
+@dataclass
+class ProfileReport:
+    """สรุปผล profile ที่เขียนลงไฟล์แล้ว"""
+
+    name: str
+    seconds: float
+    top: List[FunctionCost]
+    pstats_file: Path
+    collapsed_file: Path
+
+
+def _top_functions(stats: RawStats, limit: int) -> List[FunctionCost]:
+    ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        FunctionCost(_label(func), calls, tottime * 1000, cumtime * 1000)
+        for func, (_, calls, tottime, cumtime, _) in ranked[:limit]
+    ]
+
+
+@dataclass
+class HandlerProfile:
+    """ผล profile สะสมของ handler หนึ่งตัวในโหมดสุ่ม"""
+
+    name: str
+    profile: cProfile.Profile
+    calls: int = 0
+    sampled: int = 0
+    # เวลาที่ handler ใช้บน event loop จริง (ไม่รวมเวลาที่ await I/O)
+    loop_ms: float = 0.0
+    wall_ms: float = 0.0
+
+    @property
+    def estimated_loop_ms(self) -> float:
+        """เวลาบน loop โดยประมาณของทุกการเรียก (ขยายจากที่สุ่มได้)"""
+        return self.loop_ms * self.calls / self.sampled if self.sampled else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "sampled": self.sampled,
+            "loop_ms": round(self.loop_ms, 2),
+            "wall_ms": round(self.wall_ms, 2),
+            "estimated_loop_ms": round(self.estimated_loop_ms, 2),
+        }
+
+
+@dataclass
+class _Session:
+    profile: cProfile.Profile
+    started_at: float
+    duration: float
+    task: Optional[asyncio.Task] = None
+
+
+class HandlerProfiler:
+    """
+    profile คำสั่งและ event handler ใน production
+
+    - session: เปิด cProfile ทั้ง event loop thread ตามเวลาที่กำหนด
+    - โหมดสุ่ม: profile เพียงสัดส่วน sample_rate ของการเรียก handler ที่ติด @profiled
+      เปิด profiler เฉพาะตอนที่ coroutine ของ handler นั้นทำงานอยู่บน loop
+      และสะสมผลแยกตาม handler จึงเห็น handler ที่แพงแม้สุ่มเพียง 1%
+
+    ผลเขียนเป็นไฟล์ pstats และ collapsed stack ใน executor
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        report_dir: str = "logs/profiles",
+        sample_rate: float = 0.0,
+    ):
+        self.executor = executor
+        self.report_dir = Path(report_dir)
+        self.sample_rate = 0.0
+        self.handlers: Dict[str, HandlerProfile] = {}
+        self.last_report: Optional[ProfileReport] = None
+        self._session: Optional[_Session] = None
+        # มี profiler ทำงานอยู่บน loop (cProfile เปิดซ้อนกันไม่ได้)
+        self._active = False
+        self.set_sample_rate(sample_rate)
+
+    @property
+    def session_active(self) -> bool:
+        return self._session is not None
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _write(
+        self, name: str, snapshot: _StatsSnapshot, limit: int
+    ) -> Tuple[List[FunctionCost], Path, Path]:
+        """เขียน pstats และ collapsed stack (blocking, ทำงานใน executor)"""
+        pstats_file = self.report_dir / f"{name}.prof"
+        collapsed_file = self.report_dir / f"{name}.collapsed"
+        pstats_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # pstats.Stats ย้าย dict ออกจาก snapshot จึงเก็บไว้ก่อน
+        stats = snapshot.stats
+        pstats.Stats(snapshot).dump_stats(pstats_file)
+        with open(collapsed_file, "w", encoding="utf-8") as f:
+            for stack, us in collapsed_stacks(stats).most_common():
+                f.write(f"{stack} {us}\n")
+        return _top_functions(stats, limit), pstats_file, collapsed_file
+
+    # ------------------------------------------------------------------
+    # session
+    # ------------------------------------------------------------------
+
+    def start_session(self, duration: float) -> None:
+        """
+        เริ่ม profile ทั้ง event loop thread แล้วหยุดเองเมื่อครบเวลา
+
+        Args:
+            duration: ระยะเวลาสูงสุด (วินาที)
+
+        Raises:
+            UserError: ถ้ามี session ทำงานอยู่แล้วหรือ duration ไม่ถูกต้อง
+        """
+        if self._session is not None:
+            raise UserError("กำลัง profile อยู่แล้ว ใช้ `/dev profile stop` เพื่อหยุด")
+        if not 0 < duration <= MAX_SESSION_SECONDS:
+            raise UserError(f"duration ต้องอยู่ระหว่าง 1 ถึง {MAX_SESSION_SECONDS} วินาที")
+        if self._active:
+            raise UserError("มี handler ที่ถูกสุ่ม profile อยู่ ลองใหม่อีกครั้ง")
+
+        profile = cProfile.Profile()
+        self._session = _Session(profile, time.perf_counter(), duration)
+        self._session.task = asyncio.create_task(
+            self._stop_after(duration), name="profiler-session"
+        )
+        self._active = True
+        profile.enable()
+        logger.warning(f"🔬 เริ่ม profile event loop (สูงสุด {duration:.0f}s)")
+
+    async def _stop_after(self, duration: float) -> None:
+        await asyncio.sleep(duration)
+        try:
+            await self.stop_session()
+        except Exception as e:
+            logger.error(f"❌ หยุด profile ไม่สำเร็จ: {e}")
+
+    async def stop_session(self, limit: int = 10) -> ProfileReport:
+        """
+        หยุด session และเขียนผลลงไฟล์
+
+        Args:
+            limit: จำนวนฟังก์ชันที่ใช้เวลามากที่สุดที่คืนกลับ
+
+        Returns:
+            ProfileReport: ผลของ session (ถ้า session หยุดเองไปแล้วจะคืนผลล่าสุด)
+
+        Raises:
+            UserError: ถ้าไม่มี session และยังไม่เคยมีผล
+        """
+        session = self._session
+        if session is None:
+            if self.last_report is None:
+                raise UserError("ไม่มี profile ที่ทำงานอยู่ ใช้ `/dev profile start` ก่อน")
+            return self.last_report
+
+        session.profile.disable()
+        self._active = False
+        self._session = None
+        if session.task is not None and session.task is not asyncio.current_task():
+            session.task.cancel()
+
+        seconds = time.perf_counter() - session.started_at
+        name = f"session_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}"
+        top, pstats_file, collapsed_file = await self._run_blocking(
+            self._write, name, _freeze(session.profile), limit
+        )
+        self.last_report = ProfileReport(name, seconds, top, pstats_file, collapsed_file)
+        logger.info(f"🔬 profile {seconds:.1f}s เสร็จแล้ว บันทึกที่ {pstats_file}")
+        return self.last_report
+
+    # ------------------------------------------------------------------
+    # โหมดสุ่ม
+    # ------------------------------------------------------------------
+
+    def set_sample_rate(self, rate: float) -> None:
+        """
+        ตั้งสัดส่วนการสุ่ม profile handler (0 = ปิด) และล้างผลสะสมเดิม
+
+        Raises:
+            UserError: ถ้า rate ไม่อยู่ระหว่าง 0 ถึง 1
+        """
+        if not 0 <= rate <= 1:
+            raise UserError("sample rate ต้องอยู่ระหว่าง 0 ถึง 1")
+        self.sample_rate = rate
+        self.handlers.clear()
+        if rate:
+            logger.info(f"🎯 สุ่ม profile handler {rate:.2%} ของการเรียก")
+
+    def _handler(self, name: str) -> HandlerProfile:
+        handler = self.handlers.get(name)
+        if handler is None:
+            handler = self.handlers[name] = HandlerProfile(name, cProfile.Profile())
+        return handler
+
+    async def run(self, name: str, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        await coroutine ของ handler และสุ่ม profile ตาม sample_rate
+
+        Args:
+            name: ชื่อ handler สำหรับรวมผล
+            coro: coroutine ของ handler
+
+        Returns:
+            ผลลัพธ์ของ coroutine
+        """
+        if not self.sample_rate:
+            return await coro
+
+        handler = self._handler(name)
+        handler.calls += 1
+        if self._session is not None or random.random() >= self.sample_rate:
+            return await coro
+
+        started = time.perf_counter()
+        try:
+            return await self._drive(coro, handler)
+        finally:
+            handler.sampled += 1
+            handler.wall_ms += (time.perf_counter() - started) * 1000
+
+    @types.coroutine
+    def _drive(self, coro: Coroutine[Any, Any, T], handler: HandlerProfile):
+        """
+        ส่งต่อ coroutine ทีละ step และเปิด profiler เฉพาะระหว่าง step
+
+        เวลาที่ coroutine รอ I/O อยู่ (handler อื่นทำงาน) จึงไม่ถูกนับรวม
+        """
+        profile = handler.profile
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            # handler ซ้อนกันหรือมี session อยู่: ทำ step นี้โดยไม่ profile
+            enabled = not self._active
+            if enabled:
+                self._active = True
+                profile.enable()
+            started = time.perf_counter()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    profile.disable()
+                    self._active = False
+                    handler.loop_ms += (time.perf_counter() - started) * 1000
+
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+    async def write_handlers(
+        self, limit: int = 5
+    ) -> Tuple[Path, List[Tuple[HandlerProfile, List[FunctionCost]]]]:
+        """
+        เขียนผลสะสมของทุก handler (pstats + collapsed stack ต่อ handler)
+
+        Args:
+            limit: จำนวนฟังก์ชันที่ใช้เวลามากที่สุดต่อ handler ที่คืนกลับ
+
+        Returns:
+            โฟลเดอร์ที่เขียน และรายการ (handler, ฟังก์ชันที่แพงที่สุด)
+            เรียงตามเวลาบน loop โดยประมาณจากมากไปน้อย
+
+        Raises:
+            UserError: ถ้ายังไม่มี handler ที่ถูกสุ่มหรือ session ยังทำงานอยู่
+        """
+        if self._session is not None:
+            # การคัดลอกผลต้อง disable profile ซึ่งจะปิด session ไปด้วย
+            raise UserError("รอให้ profile session จบก่อน")
+        handlers = sorted(
+            (h for h in self.handlers.values() if h.sampled),
+            key=lambda h: h.estimated_loop_ms,
+            reverse=True,
+        )
+        if not handlers:
+            raise UserError("ยังไม่มี handler ที่ถูกสุ่ม profile (ตั้ง sample rate ก่อน)")
+
+        directory = f"handlers_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}"
+        results = []
+        for handler in handlers:
+            # คัดลอกผลใน loop ระหว่างที่ profile ไม่ได้ทำงาน (handler อาจถูกสุ่มอีกระหว่างเขียน)
+            snapshot = _freeze(handler.profile)
+            top, _, _ = await self._run_blocking(
+                self._write, f"{directory}/{handler.name}", snapshot, limit
+            )
+            results.append((handler, top))
+        return self.report_dir / directory, results
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        return {
+            "session_active": self._session is not None,
+            "sample_rate": self.sample_rate,
+            "handlers": {name: h.snapshot() for name, h in self.handlers.items()},
+        }
@@ -0,0 +1,192 @@
+# utils/ranking.py
+
+import random
+from typing import Dict, Generic, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+M = TypeVar("M", bound=Hashable)
+
+_MAX_LEVEL = 32
+_P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "member", "forward", "span")
+
+    def __init__(self, key, member, level: int):
+        self.key = key
+        self.member = member
+        self.forward: List[Optional["_Node"]] = [None] * level
+        # จำนวนตำแหน่งที่ข้ามไปเมื่อเดินตาม forward[i]
+        self.span: List[int] = [0] * level
+
+
+class RankedSet(Generic[M]):
+    """
+    เซตของ member พร้อม score ที่เรียงจาก score มากไปน้อยตลอดเวลา
+    (score เท่ากันเรียงตาม member)
+
+    ใช้ skip list ที่เก็บระยะข้าม (span) ของแต่ละ link จึงทำได้ใน O(log n):
+    เพิ่ม/ปรับ score, ลบ, หาอันดับของ member และหา member ที่อันดับใดๆ
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._head = _Node(None, None, _MAX_LEVEL)
+        self._level = 1
+        self._length = 0
+        self._scores: Dict[M, float] = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, member: M) -> bool:
+        return member in self._scores
+
+    def __iter__(self) -> Iterator[Tuple[M, float]]:
+        node = self._head.forward[0]
+        while node is not None:
+            yield node.member, self._scores[node.member]
+            node = node.forward[0]
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._rng.random() < _P:
+            level += 1
+        return level
+
+    @staticmethod
+    def _key(member: M, score: float) -> tuple:
+        return (-score, member)
+
+    def score(self, member: M) -> Optional[float]:
+        return self._scores.get(member)
+
+    def set(self, member: M, score: float) -> None:
+        """
+        กำหนด score ของ member (เพิ่มใหม่หรือปรับค่าเดิม)
+
+        Args:
+            member: member ที่ต้องการ
+            score: score ใหม่
+        """
+        old = self._scores.get(member)
+        if old is not None:
+            if old == score:
+                return
+            self._delete(self._key(member, old))
+        self._scores[member] = score
+        self._insert(self._key(member, score), member)
+
+    def remove(self, member: M) -> bool:
+        """ลบ member คืน True ถ้ามี member นี้อยู่"""
+        old = self._scores.pop(member, None)
+        if old is None:
+            return False
+        self._delete(self._key(member, old))
+        return True
+
+    def _insert(self, key: tuple, member: M) -> None:
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        rank = [0] * _MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.forward[i] is not None and node.forward[i].key < key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.span[i] = self._length
+            self._level = level
+
+        new = _Node(key, member, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+        self._length += 1
+
+    def _delete(self, key: tuple) -> None:
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        if target is None or target.key != key:
+            return
+
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._length -= 1
+
+    def rank(self, member: M) -> Optional[int]:
+        """
+        อันดับของ member (เริ่มที่ 1 = score สูงสุด)
+
+        Returns:
+            Optional[int]: อันดับ หรือ None ถ้าไม่มี member นี้
+        """
+        score = self._scores.get(member)
+        if score is None:
+            return None
+
+        key = self._key(member, score)
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key <= key:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if node.key == key:
+                return traversed
+        return None
+
+    def _node_at(self, rank: int) -> Optional[_Node]:
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= rank:
+                traversed += node.span[i]
+                node = node.forward[i]
+            if traversed == rank:
+                return node
+        return None
+
+    def top(self, count: int, start: int = 1) -> List[Tuple[M, float]]:
+        """
+        member ตามอันดับ ตั้งแต่อันดับ start ไม่เกิน count คน (O(log n + count))
+
+        Args:
+            count: จำนวนที่ต้องการ
+            start: อันดับแรกที่ต้องการ (เริ่มที่ 1)
+
+        Returns:
+            List[Tuple[M, float]]: (member, score) เรียงตามอันดับ
+        """
+        if count <= 0 or start < 1 or start > self._length:
+            return []
+        node = self._node_at(start)
+        result = []
+        while node is not None and len(result) < count:
+            result.append((node.member, self._scores[node.member]))
+            node = node.forward[0]
+        return result
@@ -0,0 +1,318 @@
+# utils/ratelimit_monitor.py
+
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# ป้ายกำกับของโค้ดที่กำลังเรียก REST (ตั้งผ่าน RateLimitMonitor.tag)
+_current_tag: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "ratelimit_tag", default=None
+)
+
+_API_PREFIX = re.compile(r"^/api/v\d+")
+_SNOWFLAKE = re.compile(r"/\d{15,21}(?=/|$)")
+_TOKEN_ROUTE = re.compile(r"(/(?:webhooks|interactions)/\{id\})/[^/]+")
+_REACTION_ROUTE = re.compile(r"(/reactions)/[^/]+")
+# ชื่อ task ที่ลงท้ายด้วยตัวเลข (Task-123 ของ task ที่ไม่ได้ตั้งชื่อ) รวมเป็นกลุ่มเดียวกัน
+# เพื่อให้ Counter ของ code path ไม่โตตามจำนวน task
+_TASK_SUFFIX = re.compile(r"[-_]\d+$")
+
+
+def normalize_route(method: str, path: str) -> str:
+    """
+    แปลง URL ของ request เป็น route template สำหรับรวมสถิติ
+
+    Args:
+        method: HTTP method
+        path: path ของ URL (เช่น /api/v10/channels/123/messages)
+
+    Returns:
+        str: route เช่น "POST /channels/{id}/messages"
+    """
+    path = _API_PREFIX.sub("", path)
+    path = _SNOWFLAKE.sub("/{id}", path)
+    path = _TOKEN_ROUTE.sub(r"\1/{token}", path)
+    path = _REACTION_ROUTE.sub(r"\1/{emoji}", path)
+    return f"{method.upper()} {path}"
+
+
+class RouteStats:
+    """สถิติ rate limit ของ route เดียว"""
+
+    __slots__ = (
+        "requests",
+        "rate_limited",
+        "global_limited",
+        "bucket",
+        "limit",
+        "remaining",
+        "min_remaining",
+        "reset_after",
+        "reset_at",
+        "last_seen",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.rate_limited = 0
+        self.global_limited = 0
+        self.bucket: Optional[str] = None
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        # ค่า remaining ต่ำสุดใน reset window ปัจจุบัน (เริ่มนับใหม่เมื่อ bucket reset)
+        self.min_remaining: Optional[int] = None
+        self.reset_after: Optional[float] = None
+        # เวลาที่ bucket จะ reset ตาม response ล่าสุด (time.time())
+        self.reset_at: Optional[float] = None
+        self.last_seen = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RateLimitMonitor:
+    """
+    เก็บ telemetry ของ rate limit จากทุก response ของ REST API
+    โดยเกาะกับ aiohttp TraceConfig ที่ส่งให้ discord.py ผ่าน http_trace
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, RouteStats] = {}
+        self._tag_requests: Counter = Counter()
+        self._tag_limited: Counter = Counter()
+        self.total_requests = 0
+        self.total_limited = 0
+        self.global_limited = 0
+        self.last_429: Optional[Dict[str, Any]] = None
+        # callback(route, status, elapsed_ms) ที่ถูกเรียกหลังทุก request
+        self._listeners: List[Callable[[str, int, float], None]] = []
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+
+    def add_listener(self, callback: Callable[[str, int, float], None]) -> None:
+        """
+        ลงทะเบียน callback ที่จะถูกเรียกหลังทุก REST request
+
+        Args:
+            callback: ฟังก์ชันที่รับ (route, status, elapsed_ms)
+        """
+        self._listeners.append(callback)
+
+    @staticmethod
+    @contextmanager
+    def tag(name: str) -> Iterator[None]:
+        """
+        ระบุชื่อ code path ให้ทุก request ที่เกิดขึ้นภายใน block นี้
+
+        Args:
+            name: ชื่อ code path เช่น "tree.sync"
+        """
+        token = _current_tag.set(name)
+        try:
+            yield
+        finally:
+            _current_tag.reset(token)
+
+    @staticmethod
+    def set_tag(name: str) -> None:
+        """ระบุชื่อ code path ให้ request ที่เหลือทั้งหมดของ task ปัจจุบัน"""
+        _current_tag.set(name)
+
+    @staticmethod
+    def current_tag() -> str:
+        """หาชื่อ code path จาก context หรือชื่อ task ของ discord.py"""
+        tag = _current_tag.get()
+        if tag:
+            return tag
+
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return "unknown"
+        return _TASK_SUFFIX.sub("", task.get_name().removeprefix("discord.py: "))
+
+    async def _on_request_start(
+        self,
+        session: aiohttp.ClientSession,
+        trace_ctx: Any,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        trace_ctx.started_at = time.perf_counter()
+
+    async def _on_request_end(
+        self,
+        session: aiohttp.ClientSession,
+        trace_ctx: Any,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        try:
+            route = self.record(
+                params.method,
+                params.url.path,
+                params.response.status,
+                params.response.headers,
+            )
+        except Exception as e:
+            logger.error(f"❌ บันทึก rate limit ไม่สำเร็จ: {e}")
+            return
+
+        started_at = getattr(trace_ctx, "started_at", None)
+        if started_at is None or not self._listeners:
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        for callback in self._listeners:
+            try:
+                callback(route, params.response.status, elapsed_ms)
+            except Exception as e:
+                logger.error(f"❌ REST listener ทำงานผิดพลาด: {e}")
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        headers: Mapping[str, str],
+    ) -> str:
+        """
+        บันทึกข้อมูล rate limit จาก response หนึ่งครั้ง
+
+        Args:
+            method: HTTP method
+            path: path ของ URL
+            status: HTTP status code
+            headers: headers ของ response
+
+        Returns:
+            str: route template ของ request
+        """
+        route = normalize_route(method, path)
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = RouteStats()
+
+        tag = self.current_tag()
+        self.total_requests += 1
+        self._tag_requests[tag] += 1
+
+        stats.requests += 1
+        stats.last_seen = time.time()
+
+        bucket = headers.get("X-RateLimit-Bucket")
+        if bucket:
+            stats.bucket = bucket
+
+        limit = headers.get("X-RateLimit-Limit")
+        if limit is not None:
+            stats.limit = int(limit)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            stats.remaining = int(remaining)
+            new_window = stats.reset_at is not None and stats.last_seen >= stats.reset_at
+            if new_window or stats.min_remaining is None or stats.remaining < stats.min_remaining:
+                stats.min_remaining = stats.remaining
+
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if reset_after is not None:
+            stats.reset_after = float(reset_after)
+            stats.reset_at = stats.last_seen + stats.reset_after
+
+        if status != 429:
+            return route
+
+        is_global = headers.get("X-RateLimit-Global", "").lower() == "true"
+        scope = headers.get("X-RateLimit-Scope") or ("global" if is_global else "unknown")
+
+        self.total_limited += 1
+        self._tag_limited[tag] += 1
+        stats.rate_limited += 1
+        if is_global:
+            self.global_limited += 1
+            stats.global_limited += 1
+
+        self.last_429 = {
+            "route": route,
+            "tag": tag,
+            "scope": scope,
+            "global": is_global,
+            "retry_after": float(headers.get("Retry-After", 0) or 0),
+            "timestamp": stats.last_seen,
+        }
+        logger.warning(
+            f"⏳ ติด rate limit ({scope}) ที่ {route} จาก {tag}"
+        )
+        return route
+
+    def get_route(self, route: str) -> Optional[RouteStats]:
+        """ดึงสถิติของ route ที่ระบุ"""
+        return self._routes.get(route)
+
+    def snapshot(self, top: int = 10) -> Dict[str, Any]:
+        """
+        สรุปสถิติ rate limit สำหรับ metrics
+
+        Args:
+            top: จำนวน route/code path สูงสุดที่แสดง
+
+        Returns:
+            Dict[str, Any]: สถิติรวม แยกตาม route และ code path
+        """
+        busiest = sorted(
+            self._routes.items(), key=lambda item: item[1].requests, reverse=True
+        )[:top]
+        return {
+            "total_requests": self.total_requests,
+            "rate_limited": self.total_limited,
+            "global_limited": self.global_limited,
+            "last_429": self.last_429,
+            "routes": {route: stats.to_dict() for route, stats in busiest},
+            "by_tag": dict(self._tag_requests.most_common(top)),
+            "limited_by_tag": dict(self._tag_limited.most_common(top)),
+        }
+
+    def format_summary(self, top: int = 3) -> str:
+        """
+        สรุปสถิติเป็นข้อความสั้นๆ สำหรับแสดงใน embed
+
+        Args:
+            top: จำนวน route ที่แสดง
+
+        Returns:
+            str: ข้อความสรุป
+        """
+        lines = [
+            f"Requests: {self.total_requests:,}",
+            f"429: {self.total_limited:,} (global {self.global_limited:,})",
+        ]
+
+        busiest = sorted(
+            self._routes.items(), key=lambda item: item[1].requests, reverse=True
+        )[:top]
+        for route, stats in busiest:
+            quota = (
+                f"{stats.min_remaining}/{stats.limit}"
+                if stats.limit is not None
+                else "-"
+            )
+            lines.append(f"{route}: {stats.requests:,} req, min {quota}")
+
+        top_tags = self._tag_requests.most_common(top)
+        if top_tags:
+            lines.append(
+                "โดย: " + ", ".join(f"{tag} ({count:,})" for tag, count in top_tags)
+            )
+
+        return "\n".join(lines)
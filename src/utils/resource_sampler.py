@@ -0,0 +1,157 @@
+# utils/resource_sampler.py
+
+import asyncio
+import gc
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.latency_monitor import render_sparkline
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceSample(NamedTuple):
+    """การใช้ทรัพยากรของ process ณ เวลาหนึ่ง"""
+
+    timestamp: float
+    cpu_percent: float
+    rss_mb: float
+    threads: int
+    open_fds: int
+    gc_counts: Tuple[int, int, int]
+    tasks: int
+
+
+class ResourceSampler:
+    """
+    เก็บการใช้ทรัพยากรของบอทเป็นระยะลง ring buffer
+
+    การเรียก psutil ทำใน executor จึงไม่บล็อก event loop
+    และ /dev status อ่านค่าจาก memory ได้ทันที
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        interval: float = 10.0,
+        capacity: int = 360,
+    ):
+        self.executor = executor
+        self.interval = interval
+        self._samples: Deque[ResourceSample] = deque(maxlen=capacity)
+        self._process = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    @property
+    def latest(self) -> Optional[ResourceSample]:
+        return self._samples[-1] if self._samples else None
+
+    def _collect(self, tasks: int) -> ResourceSample:
+        """อ่านค่าจาก psutil (blocking, ทำงานใน executor)"""
+        if self._process is None:
+            import psutil
+
+            self._process = psutil.Process()
+            # ครั้งแรกคืน 0.0 เสมอ ใช้ตั้งจุดเริ่มต้นของการวัด CPU
+            self._process.cpu_percent(None)
+
+        process = self._process
+        with process.oneshot():
+            cpu_percent = process.cpu_percent(None)
+            rss = process.memory_info().rss
+            threads = process.num_threads()
+            if hasattr(process, "num_fds"):
+                open_fds = process.num_fds()
+            else:  # Windows
+                open_fds = process.num_handles()
+
+        return ResourceSample(
+            timestamp=time.time(),
+            cpu_percent=cpu_percent,
+            rss_mb=rss / 1024 / 1024,
+            threads=threads,
+            open_fds=open_fds,
+            gc_counts=gc.get_count(),
+            tasks=tasks,
+        )
+
+    async def sample(self) -> ResourceSample:
+        """เก็บค่าหนึ่งครั้ง"""
+        # จำนวน task ต้องอ่านจาก thread ของ event loop
+        tasks = len(asyncio.all_tasks())
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, self._collect, tasks)
+        self._samples.append(result)
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.warning(f"⚠️ เก็บข้อมูลทรัพยากรไม่สำเร็จ: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """เริ่มเก็บข้อมูลเบื้องหลัง"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="resource-sampler")
+
+    async def stop(self) -> None:
+        """หยุดเก็บข้อมูล"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def recent(self, count: int) -> List[ResourceSample]:
+        """sample ล่าสุดไม่เกิน count ตัว เรียงจากเก่าไปใหม่"""
+        start = max(0, len(self._samples) - count)
+        return [self._samples[i] for i in range(start, len(self._samples))]
+
+    def trend(self, field: str, count: int = 30) -> str:
+        """sparkline ของค่าที่ระบุจาก sample ล่าสุด count ตัว"""
+        return render_sparkline([getattr(s, field) for s in self.recent(count)])
+
+    def format_summary(self, count: int = 30) -> str:
+        """
+        สรุปค่าปัจจุบันพร้อมแนวโน้มเป็นข้อความสั้นๆ
+
+        Args:
+            count: จำนวน sample ที่ใช้แสดงแนวโน้ม
+
+        Returns:
+            str: ข้อความหลายบรรทัด
+        """
+        latest = self.latest
+        if latest is None:
+            return "ยังไม่มีข้อมูล"
+        gen0, gen1, gen2 = latest.gc_counts
+        return "\n".join(
+            [
+                f"CPU: {latest.cpu_percent:5.1f}%  {self.trend('cpu_percent', count)}",
+                f"RAM: {latest.rss_mb:5.1f}MB {self.trend('rss_mb', count)}",
+                f"Tasks: {latest.tasks:<5} {self.trend('tasks', count)}",
+                f"Threads: {latest.threads} | FDs: {latest.open_fds}",
+                f"GC: {gen0}/{gen1}/{gen2}",
+            ]
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ค่าล่าสุดสำหรับ metrics"""
+        latest = self.latest
+        if latest is None:
+            return {}
+        data = latest._asdict()
+        data["rss_mb"] = round(data["rss_mb"], 2)
+        data["peak_rss_mb"] = round(max(s.rss_mb for s in self._samples), 2)
+        return data
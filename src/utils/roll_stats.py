@@ -0,0 +1,360 @@
+# utils/roll_stats.py
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.utils.dice import DiceTerm, RollResult
+from src.utils.ranking import RankedSet
+
+logger = logging.getLogger(__name__)
+
+# ชื่อ leaderboard ที่รองรับ
+METRICS = ("rolls", "max_rolls", "luck")
+# ต้องทอยอย่างน้อยเท่านี้ครั้งจึงติดอันดับดวง (กันคนทอยครั้งเดียวแล้วติดอันดับ 1)
+MIN_LUCK_ROLLS = 10
+FILE_VERSION = 1
+
+
+def luck_of(result: RollResult) -> Optional[float]:
+    """
+    คะแนนดวงของการทอยหนึ่งครั้ง เป็น z-score ของผลรวมหน้าลูกเต๋า (ก่อน keep/drop)
+    เทียบกับค่าคาดหวัง ค่าบวกคือทอยได้สูงกว่าค่าเฉลี่ย
+
+    ไม่นับลูกเต๋าระเบิดและลูกเต๋าหน้าเดียว
+
+    Returns:
+        Optional[float]: z-score หรือ None ถ้าไม่มีลูกเต๋าที่นับได้
+    """
+    deviation = 0.0
+    variance = 0.0
+    for term_result in result.terms:
+        term = term_result.term
+        if (
+            not isinstance(term, DiceTerm)
+            or term.explode
+            or term.sides < 2
+            or term_result.stats is None
+        ):
+            continue
+        deviation += term_result.stats.total - term.count * (term.sides + 1) / 2
+        variance += term.count * (term.sides * term.sides - 1) / 12
+    if variance == 0:
+        return None
+    return deviation / math.sqrt(variance)
+
+
+@dataclass
+class UserRollStats:
+    """สถิติการทอยของผู้ใช้หนึ่งคนในหนึ่ง guild"""
+
+    rolls: int = 0
+    max_rolls: int = 0
+    luck_total: float = 0.0
+    luck_rolls: int = 0
+
+    @property
+    def luck(self) -> Optional[float]:
+        """z-score เฉลี่ยของทุกการทอย"""
+        return self.luck_total / self.luck_rolls if self.luck_rolls else None
+
+    def score(self, metric: str) -> Optional[float]:
+        """ค่าที่ใช้จัดอันดับ (None = ยังไม่ติดอันดับ)"""
+        if metric == "luck":
+            return self.luck if self.luck_rolls >= MIN_LUCK_ROLLS else None
+        return getattr(self, metric) or None
+
+
+class GuildRollStats:
+    """สถิติการทอยของหนึ่ง guild พร้อม leaderboard ที่อัพเดททีละการทอย"""
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.users: Dict[int, UserRollStats] = {}
+        self._boards: Dict[str, RankedSet[int]] = {metric: RankedSet() for metric in METRICS}
+
+    def record(self, user_id: int, is_max: bool, luck: Optional[float]) -> UserRollStats:
+        """
+        บันทึกการทอยหนึ่งครั้งและปรับอันดับ (O(log n) ต่อ leaderboard)
+
+        Args:
+            user_id: ID ของผู้ทอย
+            is_max: ทอยได้ผลรวมสูงสุดหรือไม่
+            luck: คะแนนดวงจาก luck_of
+
+        Returns:
+            UserRollStats: สถิติของผู้ใช้หลังบันทึก
+        """
+        stats = self.users.get(user_id)
+        if stats is None:
+            stats = self.users[user_id] = UserRollStats()
+
+        stats.rolls += 1
+        if is_max:
+            stats.max_rolls += 1
+        if luck is not None:
+            stats.luck_total += luck
+            stats.luck_rolls += 1
+
+        self._update(user_id, stats)
+        return stats
+
+    def _update(self, user_id: int, stats: UserRollStats) -> None:
+        for metric, board in self._boards.items():
+            score = stats.score(metric)
+            if score is not None:
+                board.set(user_id, score)
+
+    def rank(self, metric: str, user_id: int) -> Optional[int]:
+        """อันดับของผู้ใช้ใน leaderboard (เริ่มที่ 1)"""
+        return self._boards[metric].rank(user_id)
+
+    def top(self, metric: str, count: int, start: int = 1) -> List[Tuple[int, float]]:
+        """ผู้ใช้ตามอันดับ ตั้งแต่อันดับ start ไม่เกิน count คน"""
+        return self._boards[metric].top(count, start)
+
+    def ranked(self, metric: str) -> int:
+        """จำนวนผู้ใช้ที่ติดอันดับใน leaderboard"""
+        return len(self._boards[metric])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": FILE_VERSION,
+            "guild_id": self.guild_id,
+            "users": {
+                str(user_id): [s.rolls, s.max_rolls, s.luck_total, s.luck_rolls]
+                for user_id, s in self.users.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, guild_id: int, data: Dict[str, Any]) -> "GuildRollStats":
+        stats = cls(guild_id)
+        for user_id, (rolls, max_rolls, luck_total, luck_rolls) in data.get("users", {}).items():
+            user = UserRollStats(rolls, max_rolls, luck_total, luck_rolls)
+            stats.users[int(user_id)] = user
+            stats._update(int(user_id), user)
+        return stats
+
+
+class RollStatsStore:
+    """
+    สถิติการทอยแยกตาม guild เก็บเป็นไฟล์ JSON หนึ่งไฟล์ต่อ guild
+
+    โหลดแต่ละ guild ครั้งแรกที่ถูกใช้ และเขียนแบบ write-behind:
+    การทอยเพียงแค่ทำเครื่องหมายว่า guild นั้นมีการเปลี่ยนแปลง
+    แล้ว flush ทุก flush_interval วินาทีเขียนเฉพาะ guild ที่เปลี่ยนครั้งเดียว
+    ไม่ว่าจะมีการทอยกี่ครั้งในช่วงนั้น
+
+    หลัง flush จะปล่อย guild ที่เขียนลงไฟล์แล้วและไม่ถูกใช้เกิน idle_ttl วินาที
+    หรือเกิน max_guilds (ปล่อยตัวที่ใช้ล่าสุดนานที่สุดก่อน) แล้วโหลดใหม่จากไฟล์เมื่อถูกใช้อีก
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/roll_stats",
+        flush_interval: float = 10.0,
+        executor: Optional[Executor] = None,
+        idle_ttl: float = 600.0,
+        max_guilds: int = 1000,
+    ):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.executor = executor
+        self.idle_ttl = idle_ttl
+        self.max_guilds = max_guilds
+
+        # เรียงจากใช้ล่าสุดนานที่สุดไปล่าสุด
+        self._guilds: "OrderedDict[int, GuildRollStats]" = OrderedDict()
+        self._last_used: Dict[int, float] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        self._dirty: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        self.records = 0
+        self.writes = 0
+        self.flushes = 0
+        self.evictions = 0
+        self.last_flush_ms = 0.0
+
+    def _path(self, guild_id: int) -> Path:
+        return self.directory / f"{guild_id}.json"
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    # ------------------------------------------------------------------
+    # อ่าน/เขียนไฟล์ (รันใน executor)
+    # ------------------------------------------------------------------
+
+    def _read(self, guild_id: int) -> GuildRollStats:
+        path = self._path(guild_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return GuildRollStats.from_dict(guild_id, json.load(f))
+        except FileNotFoundError:
+            return GuildRollStats(guild_id)
+        except (ValueError, TypeError) as e:
+            # เก็บไฟล์ที่เสียไว้ตรวจสอบ แล้วเริ่มนับใหม่
+            path.replace(path.with_suffix(".corrupt"))
+            logger.error(f"❌ ไฟล์สถิติการทอยของ guild {guild_id} เสีย (ย้ายไป .corrupt): {e}")
+            return GuildRollStats(guild_id)
+
+    def _write_many(self, payloads: List[Tuple[int, Dict[str, Any]]]) -> List[int]:
+        """เขียนหลาย guild แบบ atomic คืนรายการ guild ที่เขียนไม่สำเร็จ"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        failed = []
+        for guild_id, payload in payloads:
+            path = self._path(guild_id)
+            tmp = path.with_suffix(".tmp")
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.error(f"❌ เขียนสถิติการทอยของ guild {guild_id} ไม่สำเร็จ: {e}")
+                failed.append(guild_id)
+        return failed
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    async def _load(self, guild_id: int) -> GuildRollStats:
+        try:
+            stats = await self._run_blocking(self._read, guild_id)
+            self._guilds[guild_id] = stats
+            self._last_used[guild_id] = time.monotonic()
+            return stats
+        finally:
+            self._loading.pop(guild_id, None)
+
+    async def guild(self, guild_id: int) -> GuildRollStats:
+        """
+        สถิติของ guild (โหลดจากไฟล์ครั้งแรก คำขอพร้อมกันรอการโหลดเดียวกัน)
+
+        Args:
+            guild_id: ID ของ guild
+
+        Returns:
+            GuildRollStats: สถิติของ guild
+        """
+        stats = self._guilds.get(guild_id)
+        if stats is not None:
+            self._guilds.move_to_end(guild_id)
+            self._last_used[guild_id] = time.monotonic()
+            return stats
+
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = asyncio.create_task(self._load(guild_id), name=f"roll-stats-load-{guild_id}")
+            self._loading[guild_id] = task
+        return await asyncio.shield(task)
+
+    async def record(self, guild_id: int, user_id: int, result: RollResult) -> UserRollStats:
+        """
+        บันทึกผลการทอยหนึ่งครั้ง (ไม่เขียนไฟล์ทันที)
+
+        Args:
+            guild_id: ID ของ guild
+            user_id: ID ของผู้ทอย
+            result: ผลการทอย
+
+        Returns:
+            UserRollStats: สถิติของผู้ใช้หลังบันทึก
+        """
+        stats = await self.guild(guild_id)
+        user = stats.record(user_id, result.is_max, luck_of(result))
+        self._dirty.add(guild_id)
+        self.records += 1
+        return user
+
+    async def flush(self) -> int:
+        """
+        เขียน guild ที่มีการเปลี่ยนแปลงลงไฟล์ แล้วปล่อย guild ที่ไม่ได้ใช้ออกจาก memory
+
+        Returns:
+            int: จำนวน guild ที่เขียน
+        """
+        if not self._dirty:
+            self._evict()
+            return 0
+
+        started = time.perf_counter()
+        dirty, self._dirty = self._dirty, set()
+        # serialize ใน loop เพื่อให้ได้ snapshot ที่สอดคล้องกัน การเขียนไฟล์ทำใน executor
+        payloads = [(guild_id, self._guilds[guild_id].to_dict()) for guild_id in dirty]
+        failed = await self._run_blocking(self._write_many, payloads)
+        self._dirty.update(failed)
+
+        self.writes += len(payloads) - len(failed)
+        self.flushes += 1
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self._evict()
+        return len(payloads) - len(failed)
+
+    def _evict(self) -> None:
+        """ปล่อย guild ที่เขียนลงไฟล์แล้ว (ไม่อยู่ใน _dirty) ที่ idle เกิน idle_ttl หรือเกิน max_guilds"""
+        idle_before = time.monotonic() - self.idle_ttl
+        excess = len(self._guilds) - self.max_guilds
+        for guild_id in list(self._guilds):
+            idle = self._last_used.get(guild_id, 0.0) < idle_before
+            if not idle and excess <= 0:
+                # ตัวถัดไปใช้ล่าสุดกว่านี้ทั้งหมด
+                break
+            if guild_id in self._dirty:
+                continue
+            del self._guilds[guild_id]
+            self._last_used.pop(guild_id, None)
+            excess -= 1
+            self.evictions += 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ เกิดข้อผิดพลาดในการเขียนสถิติการทอย: {e}")
+
+    def start(self) -> None:
+        """เริ่ม flush เบื้องหลัง"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="roll-stats-flush")
+
+    async def stop(self) -> None:
+        """หยุด flush เบื้องหลังและเขียนข้อมูลที่ค้างอยู่"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"❌ เขียนสถิติการทอยครั้งสุดท้ายไม่สำเร็จ: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        return {
+            "guilds_loaded": len(self._guilds),
+            "users": sum(len(g.users) for g in self._guilds.values()),
+            "dirty": len(self._dirty),
+            "records": self.records,
+            "writes": self.writes,
+            "flushes": self.flushes,
+            "evictions": self.evictions,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
@@ -0,0 +1,287 @@
+# utils/stack_sampler.py
+
+import asyncio
+import logging
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_DEPTH = 128
+# ชื่อ task ที่ลงท้ายด้วยตัวเลข (Task-123, roll-stats-load-<guild>) รวมเป็นกลุ่มเดียวกัน
+_TASK_SUFFIX = re.compile(r"[-_]\d+$")
+_NO_TASK = "(loop)"
+_OVERFLOW = "(อื่นๆ)"
+
+
+class StackSampler:
+    """
+    สุ่มดู Python stack ของ event loop thread เป็นระยะ
+
+    แต่ละ sample คือ stack ของ loop ณ ขณะนั้นพร้อมชื่อ asyncio task ที่กำลังทำงาน
+    นับรวมเป็น collapsed stack ในตารางที่จำกัดขนาด (stack ใหม่ที่เกินขนาดนับรวมเป็น "อื่นๆ")
+    ใช้เป็น input ของ flamegraph ได้ทันที
+
+    ถ้า loop ทำงานใน main thread และระบบรองรับ จะใช้ SIGPROF ซึ่งนับตามเวลา CPU
+    ของทั้ง process (รวม thread ใน executor) จึงเก็บ sample เฉพาะเมื่อ loop thread
+    ใช้ CPU ไปอย่างน้อยครึ่ง interval นับจาก sample ก่อน ส่วนที่เหลือนับเป็น skipped
+    (sample จึงตรงกับที่ loop ใช้ CPU จริง) ไม่เช่นนั้นใช้ thread แยกอ่าน stack
+    ซึ่งจะได้ stack ตอนที่ loop ปล่อย GIL (เช่นตอนรอ I/O) บ่อยกว่าความเป็นจริง
+
+    วัด CPU ที่ใช้ในการเก็บ sample เทียบกับเวลาจริง ถ้าเกิน overhead_budget
+    จะยืดช่วงเวลาระหว่าง sample ออกไปเองจนกลับมาอยู่ในงบ
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.02,
+        max_stacks: int = 5000,
+        overhead_budget: float = 0.01,
+        max_interval: float = 1.0,
+        report_dir: str = "logs/profiles",
+        executor: Optional[Executor] = None,
+    ):
+        self.base_interval = interval
+        self.interval = interval
+        self.max_interval = max_interval
+        self.max_stacks = max_stacks
+        self.overhead_budget = overhead_budget
+        self.report_dir = Path(report_dir)
+        self.executor = executor
+
+        self._counts: Dict[Any, int] = {}
+        self._labels: Dict[CodeType, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._previous_handler: Any = None
+        self.mode: Optional[str] = None
+
+        self.samples = 0
+        self.dropped = 0
+        self.skipped = 0
+        self._loop_cpu = 0.0
+        self.started_at: Optional[float] = None
+        self.overhead = 0.0
+        self.sample_us = 0.0
+        self._window_started = 0.0
+        self._window_cpu = 0.0
+        self._window_samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self.mode is not None
+
+    # ------------------------------------------------------------------
+    # เก็บ sample
+    # ------------------------------------------------------------------
+
+    def _task_name(self) -> str:
+        task = asyncio.current_task(self._loop)
+        if task is None:
+            return _NO_TASK
+        return _TASK_SUFFIX.sub("", task.get_name())
+
+    def _record(self, frame: Optional[FrameType]) -> None:
+        codes = []
+        while frame is not None and len(codes) < MAX_DEPTH:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        if not codes:
+            return
+        codes.reverse()
+
+        key: Any = (self._task_name(), tuple(codes))
+        count = self._counts.get(key)
+        if count is None and len(self._counts) >= self.max_stacks:
+            key = _OVERFLOW
+            count = self._counts.get(key)
+            self.dropped += 1
+        self._counts[key] = (count or 0) + 1
+        self.samples += 1
+
+    def _account(self, cpu: float) -> bool:
+        """
+        บันทึกเวลา CPU ของ sample และปรับช่วงเวลาทุกวินาทีให้ overhead อยู่ในงบ
+
+        Returns:
+            bool: True ถ้าช่วงเวลาเปลี่ยน
+        """
+        self._window_cpu += cpu
+        self._window_samples += 1
+        elapsed = time.perf_counter() - self._window_started
+        if elapsed < 1.0:
+            return False
+
+        self.overhead = self._window_cpu / elapsed
+        self.sample_us = self._window_cpu / self._window_samples * 1e6
+        interval = self.interval
+        if self.overhead > self.overhead_budget:
+            interval = min(interval * 1.5, self.max_interval)
+        elif self.overhead < self.overhead_budget / 2 and interval > self.base_interval:
+            interval = max(interval / 1.5, self.base_interval)
+        self._window_started = time.perf_counter()
+        self._window_cpu = 0.0
+        self._window_samples = 0
+
+        changed = interval != self.interval
+        self.interval = interval
+        return changed
+
+    def _on_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        # ทำงานใน loop thread ระหว่าง bytecode จึงได้ stack ของจุดที่กำลังใช้ CPU
+        cpu_started = time.thread_time()
+        # SIGPROF นับ CPU ของทุก thread: tick ที่เกิดจากงานใน executor ขณะ loop
+        # รออยู่ใน selector ไม่ใช่เวลาของ loop จึงไม่นับ
+        if cpu_started - self._loop_cpu >= self.interval / 2:
+            self._record(frame)
+        else:
+            self.skipped += 1
+        cpu_ended = time.thread_time()
+        self._loop_cpu = cpu_ended
+        if self._account(cpu_ended - cpu_started):
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def _run_thread(self) -> None:
+        while not self._stop.wait(self.interval):
+            cpu_started = time.thread_time()
+            try:
+                self._record(sys._current_frames().get(self._thread_id))
+            except Exception as e:  # ไม่ให้ sampler ตายเงียบๆ
+                logger.error(f"❌ stack sampler ผิดพลาด: {e}")
+            self._account(time.thread_time() - cpu_started)
+
+    def start(self) -> None:
+        """เริ่ม sampler (ต้องเรียกจาก event loop thread)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self.started_at = time.time()
+        self._window_started = time.perf_counter()
+
+        if hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+            self._loop_cpu = time.thread_time()
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            self.mode = "signal"
+        else:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run_thread, name="stack-sampler", daemon=True
+            )
+            self._thread.start()
+            self.mode = "thread"
+        logger.info(f"🔥 เริ่ม stack sampler ({self.mode}) ทุก {self.interval * 1000:.0f}ms")
+
+    async def stop(self) -> None:
+        """หยุด sampler"""
+        mode, self.mode = self.mode, None
+        if mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        elif mode == "thread" and self._thread is not None:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, thread.join, 2.0)
+
+    def reset(self) -> None:
+        """ล้าง sample ที่สะสมไว้ (รวม label ที่อ้างถึง code ของ cog ที่ถูก reload ไปแล้ว)"""
+        self._counts = {}
+        self._labels = {}
+        self.samples = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # export
+    # ------------------------------------------------------------------
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            self._labels[code] = label = label.replace(";", ",")
+        return label
+
+    def collapsed(self) -> Counter:
+        """
+        sample ทั้งหมดในรูป collapsed stack
+
+        Returns:
+            Counter: "task;frame;...;frame" -> จำนวน sample
+        """
+        out: Counter = Counter()
+        for key, count in dict(self._counts).items():
+            if key == _OVERFLOW:
+                out[_OVERFLOW] += count
+                continue
+            task, codes = key
+            out[";".join([task, *map(self._label, codes)])] += count
+        return out
+
+    def top_tasks(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """task ที่พบใน sample มากที่สุด"""
+        tasks: Counter = Counter()
+        for key, count in dict(self._counts).items():
+            tasks[_OVERFLOW if key == _OVERFLOW else key[0]] += count
+        return tasks.most_common(limit)
+
+    def _write(self, stacks: Counter) -> Path:
+        """เขียน collapsed stack ลงไฟล์ (blocking, ทำงานใน executor)"""
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        path = self.report_dir / f"stacks_{stamp}.collapsed"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    async def export(self) -> Path:
+        """
+        เขียน collapsed stack ทั้งหมดลงไฟล์สำหรับ flamegraph.pl / speedscope
+
+        Returns:
+            Path: path ของไฟล์
+        """
+        stacks = self.collapsed()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._write, stacks)
+
+    def snapshot(self, top: int = 20) -> Dict[str, Any]:
+        """สรุปสถานะและ stack ที่พบบ่อยที่สุดสำหรับ metrics"""
+        return {
+            "running": self.running,
+            "mode": self.mode,
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": self.samples,
+            "stacks": len(self._counts),
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "overhead_percent": round(self.overhead * 100, 3),
+            "sample_us": round(self.sample_us, 1),
+            "top_stacks": dict(self.collapsed().most_common(top)),
+        }
+
+    def format_summary(self) -> str:
+        """สรุปสถานะเป็นข้อความสั้นๆ"""
+        if not self.running:
+            return "stack sampler: ปิดอยู่"
+        return (
+            f"{self.samples:,} samples ({self.mode}) ทุก {self.interval * 1000:.0f}ms "
+            f"({len(self._counts):,} stacks, ข้าม {self.skipped:,} ที่ loop ไม่ได้ใช้ CPU)\n"
+            f"overhead {self.overhead:.2%} ({self.sample_us:.0f}µs/sample)"
+        )
@@ -0,0 +1,145 @@
+# utils/startup_timeline.py
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """
+    บันทึกเวลาของแต่ละช่วงตอนเริ่มบอท
+
+    เวลาทั้งหมดนับจาก origin (ตอนที่ import module นี้ครั้งแรก
+    ซึ่ง run.py ทำเป็นอย่างแรก) หน่วยเป็นมิลลิวินาที
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.started_at = time.time()
+        self._phases: List[Dict[str, Any]] = []
+        self._marks: Dict[str, float] = {}
+        self._notes: Dict[str, Any] = {}
+
+    def _elapsed_ms(self, at: Optional[float] = None) -> float:
+        return ((time.perf_counter() if at is None else at) - self.origin) * 1000
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        จับเวลาช่วงการทำงาน
+
+        Args:
+            name: ชื่อช่วง เช่น "env_validation"
+        """
+        start = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(name, start, time.perf_counter(), error=error)
+
+    def record(
+        self, name: str, start: float, end: float, error: Optional[str] = None
+    ) -> None:
+        """
+        บันทึกช่วงการทำงานที่จับเวลาเอง (ค่าจาก time.perf_counter)
+
+        Args:
+            name: ชื่อช่วง
+            start: เวลาเริ่ม
+            end: เวลาสิ้นสุด
+            error: ชื่อ exception ถ้าช่วงนี้ล้มเหลว
+        """
+        entry = {
+            "name": name,
+            "start_ms": round(self._elapsed_ms(start), 2),
+            "duration_ms": round((end - start) * 1000, 2),
+        }
+        if error:
+            entry["error"] = error
+        self._phases.append(entry)
+
+    def mark(self, name: str) -> bool:
+        """
+        บันทึกเหตุการณ์ครั้งแรก (เช่น READY ครั้งแรก)
+
+        Args:
+            name: ชื่อเหตุการณ์
+
+        Returns:
+            bool: True ถ้าเป็นครั้งแรกที่บันทึกเหตุการณ์นี้
+        """
+        if name in self._marks:
+            return False
+        self._marks[name] = round(self._elapsed_ms(), 2)
+        return True
+
+    def has_mark(self, name: str) -> bool:
+        return name in self._marks
+
+    def note(self, name: str, value: Any) -> None:
+        """
+        บันทึกข้อมูลประกอบรายงาน (เช่นวิธีเชื่อมต่อ gateway)
+
+        Args:
+            name: ชื่อข้อมูล
+            value: ค่าที่ต้องแปลงเป็น JSON ได้
+        """
+        self._notes[name] = value
+
+    def report(self) -> Dict[str, Any]:
+        """สรุปผลเป็น dict"""
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "phases": list(self._phases),
+            "marks_ms": dict(self._marks),
+            "notes": dict(self._notes),
+            "slowest": sorted(
+                self._phases, key=lambda p: p["duration_ms"], reverse=True
+            )[:5],
+        }
+
+    def format_report(self) -> str:
+        """สรุปผลเป็นข้อความสำหรับ log"""
+        lines = ["⏱️ Startup timeline:"]
+        for phase in self._phases:
+            lines.append(
+                f"  {phase['start_ms']:>9.1f}ms  +{phase['duration_ms']:>8.1f}ms  {phase['name']}"
+            )
+        for name, at in self._marks.items():
+            lines.append(f"  {at:>9.1f}ms  ●           {name}")
+        for name, value in self._notes.items():
+            lines.append(f"  {name}: {value}")
+        return "\n".join(lines)
+
+    def write_report(self, log_dir: str = "logs") -> Path:
+        """
+        เขียนรายงานลงไฟล์ JSON (blocking)
+
+        Args:
+            log_dir: โฟลเดอร์สำหรับเก็บรายงาน
+
+        Returns:
+            Path: path ของไฟล์รายงาน
+        """
+        path = Path(log_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started_at).strftime("%Y-%m-%d_%H%M%S")
+        report_file = path / f"startup_{stamp}.json"
+        report_file.write_text(
+            json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return report_file
+
+
+# timeline ของ process นี้ (origin คือตอนที่ run.py import module นี้)
+timeline = StartupTimeline()
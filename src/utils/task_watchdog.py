@@ -0,0 +1,319 @@
+# utils/task_watchdog.py
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_of(obj: Any) -> Optional[FrameType]:
+    for attr in ("cr_frame", "gi_frame", "ag_frame"):
+        frame = getattr(obj, attr, None)
+        if frame is not None:
+            return frame
+    return None
+
+
+def await_chain(coro: Any) -> Tuple[List[FrameType], Any]:
+    """
+    ไล่ coroutine ที่ await ต่อกันจาก coroutine ของ task ลงไปถึงจุดที่รออยู่
+
+    Task.get_stack() ให้เพียง frame บนสุดของ coroutine
+    จึงต้องตาม cr_await / gi_yieldfrom เองเพื่อหาจุดที่รอจริง
+
+    Args:
+        coro: coroutine ของ task
+
+    Returns:
+        (frame จากนอกสุดถึงในสุด, object สุดท้ายที่ถูก await เช่น future)
+    """
+    frames: List[FrameType] = []
+    obj = coro
+    while obj is not None:
+        frame = _frame_of(obj)
+        if frame is None:
+            return frames, obj
+        frames.append(frame)
+        obj = getattr(obj, "cr_await", None) or getattr(obj, "gi_yieldfrom", None)
+    return frames, None
+
+
+# asyncio.sleep: task ที่รอ timer อยู่ไม่ได้ค้าง ไม่ว่าจะหลับนานเท่าใด
+_SLEEP_CODE = asyncio.sleep.__code__
+
+
+def _location(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+@dataclass
+class TaskInfo:
+    """สถานะของ task หนึ่งตัว ณ ตอนที่ตรวจ"""
+
+    name: str
+    coro: str
+    age: float
+    waiting: float
+    await_point: str
+    sleeping: bool
+    stuck: bool
+    task: asyncio.Task = field(repr=False)
+
+
+@dataclass
+class _Track:
+    first_seen: float
+    point: str = ""
+    # future ที่ task รออยู่ (weakref เพราะ id() ของ object ที่ถูกเก็บไปแล้วถูกใช้ซ้ำได้)
+    waiter: Optional[weakref.ref] = None
+    point_since: float = 0.0
+    reported: bool = False
+
+    def same_wait(self, point: str, waiter: Any) -> bool:
+        if point != self.point:
+            return False
+        if waiter is None or self.waiter is None:
+            return waiter is None and self.waiter is None
+        return self.waiter() is waiter
+
+
+class TaskWatchdog:
+    """
+    ตรวจ asyncio task ที่ค้างและ event loop ที่ถูกบล็อก
+
+    - ทุก interval วินาทีตรวจทุก task ว่ารออยู่ที่จุดเดิม (future เดิม) นานเกิน
+      stuck_after หรือไม่ เช่นค้างรอ REST ที่ไม่ตอบ
+      (task ที่รออยู่ใน asyncio.sleep ไม่ถูกนับว่าค้าง เพราะ timer จะปลุกเองเสมอ
+      เช่นงานเบื้องหลังที่หลับรอบละ 10 นาที)
+    - วัด lag ของ loop ถ้าเกิน lag_threshold เขียน stack ของทุก task ลง log
+    - thread แยกคอยดูว่า loop ไม่ได้ tick นานเกิน lag_threshold หรือไม่
+      ถ้าใช่เขียน stack ของ loop thread ณ ขณะที่ถูกบล็อกลง log
+      (เห็นตัวการได้ตรงๆ ซึ่ง coroutine ใน loop ทำไม่ได้เพราะไม่ได้ทำงาน)
+
+    อายุของ task นับจากที่ watchdog เห็นครั้งแรก (คลาดเคลื่อนไม่เกิน interval)
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        lag_threshold: float = 0.5,
+        stuck_after: float = 300.0,
+        dump_cooldown: float = 60.0,
+    ):
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.stuck_after = stuck_after
+        self.dump_cooldown = dump_cooldown
+
+        self._tracks: "weakref.WeakKeyDictionary[asyncio.Task, _Track]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_tick = time.monotonic()
+        self._last_dump = 0.0
+
+        self.max_lag_ms = 0.0
+        self.lag_spikes = 0
+        self.stalls = 0
+        self.stuck_reported = 0
+
+    # ------------------------------------------------------------------
+    # ตรวจ task
+    # ------------------------------------------------------------------
+
+    def scan(self) -> List[TaskInfo]:
+        """
+        ตรวจทุก task ที่ยังไม่จบ (เรียกใน event loop)
+
+        Returns:
+            List[TaskInfo]: สถานะของทุก task เรียงจากรอนานที่สุด
+        """
+        now = time.monotonic()
+        current = asyncio.current_task()
+        infos = []
+        for task in asyncio.all_tasks(self._loop):
+            track = self._tracks.get(task)
+            if track is None:
+                track = self._tracks[task] = _Track(first_seen=now, point_since=now)
+
+            coro = task.get_coro()
+            frames, leaf = await_chain(coro)
+            waiter = getattr(task, "_fut_waiter", None)
+            await_point = _location(frames[-1]) if frames else "?"
+            if waiter is not None or leaf is not None:
+                await_point += f" ← {type(waiter if waiter is not None else leaf).__name__}"
+
+            # จุดรอเดียวกัน = ตำแหน่งเดิมและ future ที่รอตัวเดิม
+            if task is current or not track.same_wait(await_point, waiter):
+                track.point = await_point
+                track.waiter = weakref.ref(waiter) if waiter is not None else None
+                track.point_since = now
+                track.reported = False
+
+            waiting = now - track.point_since
+            sleeping = bool(frames) and frames[-1].f_code is _SLEEP_CODE
+            infos.append(
+                TaskInfo(
+                    name=task.get_name(),
+                    coro=getattr(coro, "__qualname__", type(coro).__name__),
+                    age=now - track.first_seen,
+                    waiting=waiting,
+                    await_point=await_point,
+                    sleeping=sleeping,
+                    stuck=not sleeping and waiting >= self.stuck_after,
+                    task=task,
+                )
+            )
+        infos.sort(key=lambda info: info.waiting, reverse=True)
+        return infos
+
+    @staticmethod
+    def group(infos: List[TaskInfo]) -> List[Tuple[str, List[TaskInfo]]]:
+        """จัดกลุ่ม task ตามชื่อ coroutine เรียงจากกลุ่มใหญ่ที่สุด"""
+        groups: Dict[str, List[TaskInfo]] = defaultdict(list)
+        for info in infos:
+            groups[info.coro].append(info)
+        return sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)
+
+    @staticmethod
+    def format_stacks(infos: List[TaskInfo]) -> str:
+        """stack ของ task (ทุกชั้นของ await) ในรูปแบบเดียวกับ traceback"""
+        lines = []
+        for info in infos:
+            lines.append(
+                f"Task {info.name!r} {info.coro} "
+                f"(อายุ {info.age:.0f}s, รอ {info.waiting:.0f}s)"
+            )
+            frames, leaf = await_chain(info.task.get_coro())
+            for frame in frames:
+                code = frame.f_code
+                lines.append(
+                    f'  File "{code.co_filename}", line {frame.f_lineno}, in {code.co_name}'
+                )
+            waiter = getattr(info.task, "_fut_waiter", None)
+            if waiter is not None or leaf is not None:
+                lines.append(f"  awaiting {waiter if waiter is not None else leaf!r}"[:300])
+        return "\n".join(lines)
+
+    def dump(self, reason: str) -> int:
+        """
+        เขียน stack ของทุก task ลง log
+
+        Args:
+            reason: สาเหตุที่ dump
+
+        Returns:
+            int: จำนวน task
+        """
+        infos = self.scan()
+        self._last_dump = time.monotonic()
+        logger.warning(
+            f"🧵 stack ของ task ทั้งหมด {len(infos)} ตัว ({reason}):\n"
+            f"{self.format_stacks(infos)}"
+        )
+        return len(infos)
+
+    # ------------------------------------------------------------------
+    # เบื้องหลัง
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            lag = now - expected
+            self.max_lag_ms = max(self.max_lag_ms, lag * 1000)
+
+            try:
+                if lag >= self.lag_threshold:
+                    self.lag_spikes += 1
+                    if now - self._last_dump >= self.dump_cooldown:
+                        self.dump(f"loop lag {lag * 1000:.0f}ms")
+
+                for info in self.scan():
+                    track = self._tracks.get(info.task)
+                    if info.stuck and track is not None and not track.reported:
+                        track.reported = True
+                        self.stuck_reported += 1
+                        logger.warning(
+                            f"⏳ task {info.name!r} ({info.coro}) รออยู่ที่ "
+                            f"{info.await_point} นาน {info.waiting:.0f}s"
+                        )
+            except Exception as e:
+                logger.error(f"❌ task watchdog ผิดพลาด: {e}")
+
+    def _watch_loop(self) -> None:
+        """ทำงานใน thread แยก: เขียน stack ของ loop thread เมื่อ loop ไม่ tick"""
+        reported_tick = None
+        while not self._stop.wait(min(self.interval, self.lag_threshold) / 2):
+            tick = self._last_tick
+            stalled = time.monotonic() - tick - self.interval
+            if stalled < self.lag_threshold or tick == reported_tick:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported_tick = tick
+            self.stalls += 1
+            task = asyncio.current_task(self._loop)
+            logger.warning(
+                f"🧊 event loop ถูกบล็อกนาน {stalled * 1000:.0f}ms "
+                f"(task: {task.get_name() if task else '-'})\n"
+                + "".join(traceback.format_stack(frame))
+            )
+
+    def start(self) -> None:
+        """เริ่ม watchdog (ต้องเรียกจาก event loop thread)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._task = asyncio.create_task(self._run(), name="task-watchdog")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch_loop, name="task-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """หยุด watchdog"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """สรุปสถานะสำหรับ metrics"""
+        infos = self.scan() if self._loop is not None else []
+        return {
+            "tasks": len(infos),
+            "stuck": sum(info.stuck for info in infos),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "lag_spikes": self.lag_spikes,
+            "stalls": self.stalls,
+            "stuck_reported": self.stuck_reported,
+        }